@@ -0,0 +1 @@
+"""Load-testing tools for VoxEngine (not installed with the package)."""
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Stand-in for the ``piper`` executable with tunable latency and failures.
+
+Accepts Piper's command line (``--model``, ``--output_file``, ``--speaker``), reads the text from
+stdin and writes a 16-bit mono WAV of silence whose length grows with the text. Behaviour is set
+through environment variables:
+
+``FAKE_PIPER_LATENCY_MS``   fixed start-up cost per call (default 50)
+``FAKE_PIPER_MS_PER_CHAR``  extra synthesis time per character (default 2)
+``FAKE_PIPER_JITTER_MS``    uniform random jitter added to each call (default 0)
+``FAKE_PIPER_FAILURE_RATE`` probability that a call fails with exit status 1 (default 0)
+``FAKE_PIPER_CPU``          ``1`` to spin the CPU instead of sleeping, so parallel calls contend
+                            for cores like the real model does
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+import wave
+
+SAMPLE_RATE = 22050
+AUDIO_MS_PER_CHAR = 60
+
+
+def _env(name: str, default: float) -> float:
+    return float(os.environ.get(name, default))
+
+
+def _busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def write_wav(path: str, frames: int) -> None:
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(b"\x00\x00" * frames)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="piper")
+    parser.add_argument("--model", required=True)
+    parser.add_argument("--output_file", required=True)
+    parser.add_argument("--speaker")
+    args = parser.parse_args(argv)
+    text = sys.stdin.read()
+
+    delay_ms = _env("FAKE_PIPER_LATENCY_MS", 50) + _env("FAKE_PIPER_MS_PER_CHAR", 2) * len(text)
+    delay_ms += random.uniform(0, _env("FAKE_PIPER_JITTER_MS", 0))
+    (_busy if os.environ.get("FAKE_PIPER_CPU") == "1" else time.sleep)(delay_ms / 1000)
+
+    if random.random() < _env("FAKE_PIPER_FAILURE_RATE", 0):
+        print("fake piper: simulated synthesis failure", file=sys.stderr)
+        return 1
+    write_wav(args.output_file, SAMPLE_RATE * AUDIO_MS_PER_CHAR * max(len(text), 1) // 1000)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
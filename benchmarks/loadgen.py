@@ -0,0 +1,392 @@
+"""Open-loop HTTP load generator for ``POST /v1/tts/speak``.
+
+Each step offers a fixed request rate with Poisson arrivals, so a slow server does not slow the
+load down the way a closed loop of clients would. Steps run from the lowest rate to the highest,
+and each one reports its latency percentiles, error rate and achieved throughput. Together the
+rows form the latency-vs-load curve. The highest achieved throughput is the node's saturation
+point. The "knee" is the first step whose p99 exceeds the SLO or whose error rate exceeds the
+limit.
+
+By default a local server is started with ``benchmarks/fake_piper.py`` standing in for Piper::
+
+    python -m benchmarks.loadgen --rates 2,4,8,16,32 --step-s 20 --csv curve.csv
+    python -m benchmarks.loadgen --url http://gpu-node:7341 --rates 5,10,20 --backend piper
+
+Texts are made unique per request so the synthesis cache never answers for the backend.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+
+FAKE_PIPER = Path(__file__).resolve().with_name("fake_piper.py")
+
+# Character ranges for each text length class.
+TEXT_LENGTHS: Dict[str, Tuple[int, int]] = {
+    "short": (8, 40),
+    "medium": (60, 180),
+    "long": (300, 700),
+}
+DEFAULT_MIX = "short=0.6,medium=0.3,long=0.1"
+
+_WORDS = (
+    "the quick brown fox jumps over a lazy dog while distant thunder rolls across quiet hills "
+    "and every lantern in the harbor flickers as the tide comes in"
+).split()
+
+
+@dataclass
+class StepResult:
+    """Outcome of one load step."""
+
+    rate: float
+    duration_s: float
+    sent: int = 0
+    ok: int = 0
+    errors: Dict[str, int] = field(default_factory=dict)
+    latencies_ms: List[float] = field(default_factory=list)
+
+    @property
+    def error_rate(self) -> float:
+        return (self.sent - self.ok) / self.sent if self.sent else 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Successful requests per second."""
+        return self.ok / self.duration_s if self.duration_s else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rate": self.rate,
+            "sent": self.sent,
+            "ok": self.ok,
+            "error_rate": round(self.error_rate, 4),
+            "errors": dict(self.errors),
+            "throughput": round(self.throughput, 2),
+            **{f"p{p}_ms": round(percentile(self.latencies_ms, p), 1) for p in (50, 90, 99)},
+            "max_ms": round(max(self.latencies_ms, default=0.0), 1),
+        }
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile; 0 for an empty sample."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), math.ceil(pct / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def parse_mix(spec: str) -> List[Tuple[str, float]]:
+    """``"short=0.6,long=0.4"`` -> ``[("short", 0.6), ("long", 0.4)]``."""
+    mix = []
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in TEXT_LENGTHS:
+            raise ValueError(f"Unknown text length '{name}'; choose from {sorted(TEXT_LENGTHS)}.")
+        mix.append((name, float(weight or 1)))
+    return mix
+
+
+def make_text(rng: random.Random, mix: List[Tuple[str, float]], seq: int) -> str:
+    name = rng.choices([m[0] for m in mix], weights=[m[1] for m in mix])[0]
+    lo, hi = TEXT_LENGTHS[name]
+    target = rng.randint(lo, hi)
+    words: List[str] = [f"Request {seq}."]
+    length = len(words[0])
+    while length < target:
+        word = rng.choice(_WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+async def run_step(
+    client: httpx.AsyncClient,
+    rate: float,
+    duration_s: float,
+    mix: List[Tuple[str, float]],
+    payload: Dict[str, Any],
+    rng: random.Random,
+    seq_start: int = 0,
+) -> StepResult:
+    """Offer ``rate`` requests/s for ``duration_s`` and wait for every response."""
+    result = StepResult(rate=rate, duration_s=duration_s)
+
+    async def one(text: str) -> None:
+        start = time.perf_counter()
+        try:
+            resp = await client.post("/v1/tts/speak", json={**payload, "text": text})
+            kind = None if resp.status_code == 200 else f"http_{resp.status_code}"
+        except httpx.TimeoutException:
+            kind = "timeout"
+        except httpx.HTTPError as exc:
+            kind = type(exc).__name__
+        if kind is None:
+            result.ok += 1
+            result.latencies_ms.append((time.perf_counter() - start) * 1000)
+        else:
+            result.errors[kind] = result.errors.get(kind, 0) + 1
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    next_at = start
+    tasks = []
+    while next_at < start + duration_s:
+        await asyncio.sleep(max(0.0, next_at - loop.time()))
+        tasks.append(asyncio.create_task(one(make_text(rng, mix, seq_start + result.sent))))
+        result.sent += 1
+        next_at += rng.expovariate(rate)
+    await asyncio.gather(*tasks)
+    # Responses that straggle past the step still count against its throughput.
+    result.duration_s = max(duration_s, loop.time() - start)
+    return result
+
+
+def knee(results: List[StepResult], slo_ms: float, max_error_rate: float) -> Optional[float]:
+    """Offered rate of the first step that broke the SLO or the error budget."""
+    for step in results:
+        if percentile(step.latencies_ms, 99) > slo_ms or step.error_rate > max_error_rate:
+            return step.rate
+    return None
+
+
+async def run(
+    url: str,
+    rates: List[float],
+    step_s: float,
+    mix: List[Tuple[str, float]],
+    payload: Dict[str, Any],
+    slo_ms: float = 2000.0,
+    max_error_rate: float = 0.01,
+    timeout_s: float = 60.0,
+    seed: int = 0,
+    keep_going: bool = False,
+    echo: bool = True,
+) -> List[StepResult]:
+    """Run each rate step in order; stops after the first step past the knee unless told not to."""
+    rng = random.Random(seed)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=256)
+    results: List[StepResult] = []
+    async with httpx.AsyncClient(base_url=url, timeout=timeout_s, limits=limits) as client:
+        for rate in rates:
+            step = await run_step(
+                client, rate, step_s, mix, payload, rng, seq_start=sum(r.sent for r in results)
+            )
+            results.append(step)
+            if echo:
+                print(_row(step.to_dict()), flush=True)
+            if not keep_going and knee([step], slo_ms, max_error_rate) is not None:
+                break
+    return results
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def local_server(
+    fake_piper: Optional[Dict[str, str]] = None,
+    env: Optional[Dict[str, str]] = None,
+    startup_timeout_s: float = 30.0,
+) -> Iterator[str]:
+    """Start ``voxengine.api.server`` on a free port with the fake Piper on ``PATH``.
+
+    ``fake_piper`` holds ``FAKE_PIPER_*`` settings; ``env`` adds server settings such as
+    ``VOXENGINE_MAX_CONCURRENCY``. Yields the base URL.
+    """
+    with tempfile.TemporaryDirectory(prefix="voxengine-load-") as tmp:
+        root = Path(tmp)
+        (root / "bin").mkdir()
+        shim = root / "bin" / "piper"
+        shim.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_PIPER}" "$@"\n')
+        shim.chmod(0o755)
+        (root / "models").mkdir()
+        (root / "models" / "fake.onnx").write_bytes(b"")
+        port = _free_port()
+        server_env = {
+            **os.environ,
+            "PATH": f"{root / 'bin'}{os.pathsep}{os.environ.get('PATH', '')}",
+            "VOXENGINE_CACHE_DIR": str(root / "cache"),
+            "VOXENGINE_MODELS_DIR": str(root / "models"),
+            **(fake_piper or {}),
+            **(env or {}),
+        }
+        cmd = [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "voxengine.api.server:create_app",
+            "--factory",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ]
+        proc = subprocess.Popen(cmd, env=server_env)
+        url = f"http://127.0.0.1:{port}"
+        try:
+            deadline = time.monotonic() + startup_timeout_s
+            while True:
+                if proc.poll() is not None:
+                    raise RuntimeError(f"Server exited with status {proc.returncode}")
+                try:
+                    if httpx.get(f"{url}/health", timeout=1.0).status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise RuntimeError("Server did not start in time")
+                time.sleep(0.1)
+            yield url
+        finally:
+            proc.terminate()
+            try:
+                proc.wait(10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+_COLUMNS = (
+    "rate",
+    "sent",
+    "ok",
+    "error_rate",
+    "throughput",
+    "p50_ms",
+    "p90_ms",
+    "p99_ms",
+    "max_ms",
+)
+
+
+def _header() -> str:
+    return "  ".join(f"{c:>10}" for c in _COLUMNS)
+
+
+def _row(data: Dict[str, Any]) -> str:
+    return "  ".join(f"{data[c]:>10}" for c in _COLUMNS)
+
+
+def summarize(results: List[StepResult], slo_ms: float, max_error_rate: float) -> Dict[str, Any]:
+    return {
+        "steps": [r.to_dict() for r in results],
+        "saturation_throughput": round(max((r.throughput for r in results), default=0.0), 2),
+        "knee_rate": knee(results, slo_ms, max_error_rate),
+        "slo_p99_ms": slo_ms,
+        "max_error_rate": max_error_rate,
+    }
+
+
+def write_csv(path: Path, results: List[StepResult]) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.DictWriter(fh, fieldnames=list(_COLUMNS), extrasaction="ignore")
+        writer.writeheader()
+        for step in results:
+            writer.writerow(step.to_dict())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="Target server; by default a local one is started.")
+    parser.add_argument("--rates", default="1,2,4,8,16", help="Offered requests/s per step.")
+    parser.add_argument("--step-s", type=float, default=15.0, help="Seconds per step.")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Text lengths, e.g. short=0.7,long=0.3.")
+    parser.add_argument("--backend", default="piper")
+    parser.add_argument("--profile", default=None)
+    parser.add_argument("--slo-ms", type=float, default=2000.0, help="p99 latency objective.")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--timeout-s", type=float, default=60.0, help="Per-request timeout.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep-going", action="store_true", help="Run every step past the knee.")
+    parser.add_argument("--csv", type=Path, help="Write the latency-vs-load curve here.")
+    parser.add_argument("--json", type=Path, help="Write the full summary here.")
+    fake = parser.add_argument_group("fake piper (local server only)")
+    fake.add_argument("--piper-latency-ms", type=float, default=50.0)
+    fake.add_argument("--piper-ms-per-char", type=float, default=2.0)
+    fake.add_argument("--piper-jitter-ms", type=float, default=0.0)
+    fake.add_argument("--piper-failure-rate", type=float, default=0.0)
+    fake.add_argument("--piper-cpu", action="store_true", help="Burn CPU instead of sleeping.")
+    fake.add_argument(
+        "--server-env",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Extra environment for the local server (repeatable).",
+    )
+    args = parser.parse_args(argv)
+
+    rates = [float(r) for r in args.rates.split(",")]
+    mix = parse_mix(args.mix)
+    payload: Dict[str, Any] = {"backend": args.backend}
+    if args.profile:
+        payload["profile"] = args.profile
+
+    def go(url: str) -> List[StepResult]:
+        print(_header(), flush=True)
+        return asyncio.run(
+            run(
+                url,
+                rates,
+                args.step_s,
+                mix,
+                payload,
+                slo_ms=args.slo_ms,
+                max_error_rate=args.max_error_rate,
+                timeout_s=args.timeout_s,
+                seed=args.seed,
+                keep_going=args.keep_going,
+            )
+        )
+
+    if args.url:
+        results = go(args.url)
+    else:
+        fake_env = {
+            "FAKE_PIPER_LATENCY_MS": str(args.piper_latency_ms),
+            "FAKE_PIPER_MS_PER_CHAR": str(args.piper_ms_per_char),
+            "FAKE_PIPER_JITTER_MS": str(args.piper_jitter_ms),
+            "FAKE_PIPER_FAILURE_RATE": str(args.piper_failure_rate),
+            "FAKE_PIPER_CPU": "1" if args.piper_cpu else "0",
+        }
+        server_env = dict(kv.split("=", 1) for kv in args.server_env)
+        with local_server(fake_env, server_env) as url:
+            results = go(url)
+
+    summary = summarize(results, args.slo_ms, args.max_error_rate)
+    print(
+        f"saturation throughput: {summary['saturation_throughput']} req/s; "
+        f"knee: {summary['knee_rate'] or 'not reached'}"
+    )
+    if args.csv:
+        write_csv(args.csv, results)
+    if args.json:
+        args.json.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""Microbenchmark for ``EthicsPolicy.check_tts`` as the blocked-phrase list grows.
+
+For each rule-set size it compiles a policy and times three kinds of check:
+
+* ``miss``: fresh texts, so the phrase matcher scans every one;
+* ``memo``: the same texts again, answered from the per-text memo;
+* ``clone``: a clone backend, where the consent and attestation decision is memoized per voice.
+
+``naive_us`` is a per-phrase substring scan of the same texts, for comparison: it grows with the
+rule set while the compiled matcher stays flat.
+
+::
+
+    python -m benchmarks.policy_bench --sizes 10,100,1000,10000 --budget-us 200
+
+With ``--budget-us`` the run fails if any median check is slower than the budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, List, Sequence
+
+from voxengine.ethics.attest import set_attested
+from voxengine.ethics.policy import EthicsPolicy
+
+_SYLLABLES = "ka lo mi ne su ra ti vo de ba chi gu".split()
+# Same letters, other syllables: texts walk the automaton without ever completing a phrase.
+_TEXT_SYLLABLES = "ak ol im en us ar it ov ed ab ich ug".split()
+
+
+@dataclass
+class BenchResult:
+    phrases: int
+    compile_ms: float
+    miss_us: float
+    memo_us: float
+    clone_us: float
+    naive_us: float
+
+
+def _word(rng: random.Random, syllables: Sequence[str] = _SYLLABLES) -> str:
+    return "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+
+
+def _texts(rng: random.Random, count: int, words: int = 24) -> List[str]:
+    """Clean ~200-character texts, so every ``miss`` check scans the whole text."""
+    return [
+        " ".join(_word(rng, _TEXT_SYLLABLES) for _ in range(words)) + f" {n}."
+        for n in range(count)
+    ]
+
+
+def _median_us(fn: Callable[[str], object], texts: Sequence[str]) -> float:
+    samples = []
+    for text in texts:
+        start = time.perf_counter_ns()
+        fn(text)
+        samples.append((time.perf_counter_ns() - start) / 1000)
+    return statistics.median(samples)
+
+
+def bench(size: int, checks: int = 2000, seed: int = 7) -> BenchResult:
+    rng = random.Random(seed)
+    phrases = [" ".join(_word(rng) for _ in range(rng.randint(1, 3))) for _ in range(size)]
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        cast = root / "project" / "cast" / "alice"
+        cast.mkdir(parents=True)
+        (cast / "consent.json").write_text(json.dumps({"voice_id": "alice", "consent": {}}))
+        (root / "attestation.json").write_text("{}")
+        set_attested(root / "attestation.json")
+        (root / "policy.json").write_text(
+            json.dumps(
+                {
+                    "blocked_phrases": phrases,
+                    "clone_backends": ["clone"],
+                    "attestation_file": "attestation.json",
+                    "consent_projects": ["project"],
+                }
+            )
+        )
+        start = time.perf_counter()
+        policy = EthicsPolicy.load(root / "policy.json", recheck_s=3600)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        texts = _texts(rng, checks)
+        miss = _median_us(lambda t: policy.check_tts(t, "beep", None, None), texts)
+        memo = _median_us(lambda t: policy.check_tts(t, "beep", None, None), texts)
+        clone = _median_us(lambda t: policy.check_tts(t, "clone", "alice", None), texts)
+    lowered = [p.casefold() for p in phrases]
+    naive = _median_us(lambda t: any(p in t.casefold() for p in lowered), texts[:200])
+    return BenchResult(
+        size, round(compile_ms, 2), round(miss, 2), round(memo, 2), round(clone, 2), round(naive, 2)
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="10,100,1000,10000", help="Blocked-phrase counts.")
+    parser.add_argument("--checks", type=int, default=2000, help="Checks per measurement.")
+    parser.add_argument("--budget-us", type=float, help="Fail if a median check is slower.")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args(argv)
+
+    results = [bench(int(s), args.checks) for s in args.sizes.split(",")]
+    if args.json:
+        print(json.dumps([asdict(r) for r in results], indent=2))
+    else:
+        print(
+            f"{'phrases':>8} {'compile_ms':>11} {'miss_us':>8} {'memo_us':>8} "
+            f"{'clone_us':>9} {'naive_us':>9}"
+        )
+        for r in results:
+            print(
+                f"{r.phrases:>8} {r.compile_ms:>11.2f} {r.miss_us:>8.2f} "
+                f"{r.memo_us:>8.2f} {r.clone_us:>9.2f} {r.naive_us:>9.2f}"
+            )
+    if args.budget_us is not None:
+        slow = [r for r in results if max(r.miss_us, r.memo_us, r.clone_us) > args.budget_us]
+        if slow:
+            print(f"Over budget ({args.budget_us:g} us): {[r.phrases for r in slow]}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
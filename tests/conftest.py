@@ -0,0 +1,120 @@
+import json
+import math
+import shutil
+import time
+import wave
+from pathlib import Path
+
+import pytest
+
+import voxengine.core.engine as engine_mod
+from voxengine.adapters.tts.base import TTSAudio
+from voxengine.core.errors import CancelledError
+
+EXAMPLE = Path(__file__).resolve().parents[1] / "examples" / "example_project"
+
+
+@pytest.fixture
+def make_project(tmp_path: Path):
+    """Copy the example project and give ``scene01`` ``lines`` alternating A/B lines."""
+
+    def _make(lines: int = 3, name: str = "project") -> Path:
+        project = tmp_path / name
+        shutil.copytree(EXAMPLE, project)
+        (project / "renders").mkdir(exist_ok=True)
+        scene = {
+            "id": "scene01",
+            "title": "Test",
+            "lines": [
+                {"character": "A" if i % 2 else "B", "text": f"Line number {i}."}
+                for i in range(lines)
+            ],
+        }
+        (project / "script" / "scenes.json").write_text(json.dumps({"scenes": [scene]}))
+        return project
+
+    return _make
+
+
+@pytest.fixture
+def reset_engine(monkeypatch, tmp_path: Path) -> None:
+    """Point the shared engine used by the HTTP app and CLI at this test's directories."""
+    monkeypatch.setenv("VOXENGINE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("VOXENGINE_MODELS_DIR", str(tmp_path / "models"))
+    engine_mod._engine = None
+
+
+def _wait_for(queue, job_id: str, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job.status not in {"queued", "running"}:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+@pytest.fixture
+def wait_for():
+    """``wait_for(queue, job_id)`` polls until the job leaves queued/running and returns it."""
+    return _wait_for
+
+
+def _write_wav(path: Path, frames: int, value: int, rate: int = 8000) -> Path:
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(value.to_bytes(2, "little", signed=True) * frames)
+    return path
+
+
+@pytest.fixture
+def write_wav():
+    """``write_wav(path, frames, value, rate=8000)`` writes a constant mono 16-bit WAV."""
+    return _write_wav
+
+
+class SpinBackend:
+    """Dummy CPU-bound backend: burns cycles, then returns one sample per character.
+
+    Lives at module level so hosted worker processes can unpickle it.
+    """
+
+    sample_rate = 8000
+
+    def __init__(self, model_path):
+        self.model_path = model_path
+
+    def synthesize(self, text, voice=None, profile=None):
+        if text == "boom":
+            raise RuntimeError("synthetic failure")
+        acc = 0.0
+        for i in range(20000):
+            acc += math.sin(i)
+        samples = (int(1000 * math.sin(i / 10)) for i in range(len(text) * 100))
+        return b"".join(s.to_bytes(2, "little", signed=True) for s in samples)
+
+
+@pytest.fixture
+def spin_backend():
+    """Factory for a hosted backend, to pass to ``ProcessAdapterHost``."""
+    return SpinBackend
+
+
+class WaitingAdapter:
+    """Blocks until cancelled, like a long synthesis."""
+
+    def about(self) -> dict:
+        return {"name": "waiting", "type": "tts", "available": True}
+
+    def speak(self, text, out_path, model_path=None, voice=None, profile=None, **kwargs):
+        cancel = kwargs["cancel"]
+        if not cancel.wait(5):
+            return TTSAudio(path=out_path, sample_rate=16000)
+        raise CancelledError(f"Cancelled: {cancel.reason}")
+
+
+@pytest.fixture
+def waiting_adapter():
+    return WaitingAdapter()
@@ -0,0 +1,79 @@
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from voxengine.adapters.tts.host import ProcessAdapterHost
+from voxengine.core.engine import Engine, EngineConfig
+from voxengine.core.errors import VoxEngineError
+from voxengine.core.registry import AdapterRegistry
+
+
+@pytest.fixture
+def host(spin_backend):
+    h = ProcessAdapterHost("spin", spin_backend, workers=2, max_requests=3)
+    yield h
+    h.close()
+
+
+def test_host_returns_pcm_through_shared_memory(host, tmp_path: Path):
+    audio = host.speak(text="hello", out_path=tmp_path / "a.wav")
+    assert audio.sample_rate == 8000
+    with wave.open(str(tmp_path / "a.wav")) as wav:
+        assert wav.getnframes() == 500
+        assert wav.getframerate() == 8000
+    assert audio.duration_s == pytest.approx(500 / 8000)
+
+
+def test_host_recycles_workers_and_runs_in_parallel(host, tmp_path: Path):
+    def speak(i):
+        return host.speak(text="x" * (i + 1), out_path=tmp_path / f"{i}.wav")
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(speak, range(8)))
+    expected = [pytest.approx((i + 1) * 100 / 8000) for i in range(8)]
+    assert [r.duration_s for r in results] == expected
+    assert host.recycled >= 2
+    assert host.about()["workers_running"] <= 2
+
+
+def test_host_reports_backend_errors(host, tmp_path: Path):
+    with pytest.raises(VoxEngineError, match="synthetic failure"):
+        host.speak(text="boom", out_path=tmp_path / "x.wav")
+    assert host.speak(text="ok", out_path=tmp_path / "y.wav").sample_rate == 8000
+
+
+def test_engine_uses_hosted_backend(host, tmp_path: Path):
+    cfg = EngineConfig(cache_dir=tmp_path / "cache", models_dir=tmp_path / "models")
+    eng = Engine(cfg=cfg, registry=AdapterRegistry(tts={"spin": host}))
+    result = eng.tts_speak(text="hi", backend="spin", out_path=tmp_path / "clip.wav")
+    assert result["duration_s"] == pytest.approx(200 / 8000)
+
+
+class SlowRateBackend:
+    """Synthesizes at once but is slow to report its rate: the segment exists before the reply."""
+
+    def __init__(self, model_path):
+        self.model_path = model_path
+
+    @property
+    def sample_rate(self):
+        time.sleep(5)
+        return 8000
+
+    def synthesize(self, text, voice=None, profile=None):
+        return b"\x00\x01" * len(text)
+
+
+@pytest.mark.skipif(not Path("/dev/shm").is_dir(), reason="needs /dev/shm")
+def test_killed_worker_leaves_no_shared_memory(tmp_path: Path):
+    host = ProcessAdapterHost("slow", SlowRateBackend, workers=1, timeout_s=1.0)
+    prefix = host._segment_name().rsplit("_", 1)[0] + "_"
+    try:
+        with pytest.raises(VoxEngineError, match="timed out"):
+            host.speak(text="hello", out_path=tmp_path / "a.wav")
+    finally:
+        host.close()
+    assert [p.name for p in Path("/dev/shm").iterdir() if p.name.startswith(prefix)] == []
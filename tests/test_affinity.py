@@ -0,0 +1,93 @@
+import time
+from pathlib import Path
+
+from voxengine.adapters.tts.host import ProcessAdapterHost
+from voxengine.core.affinity import affinity_order
+from voxengine.core.coordinator import RenderCoordinator
+from voxengine.core.engine import Engine, EngineConfig
+from voxengine.core.registry import AdapterRegistry
+from voxengine.core.render import RenderWorker
+
+
+def test_affinity_order_groups_voices_in_bounded_runs():
+    items = ["a1", "b1", "a2", "c1", "a3", "b2", "a4"]
+    assert affinity_order(items, key=lambda s: s[0]) == ["a1", "a2", "a3", "a4", "b1", "b2", "c1"]
+    assert affinity_order(items, key=lambda s: s[0], max_run=2) == [
+        "a1", "a2", "b1", "b2", "c1", "a3", "a4",
+    ]
+
+
+def test_scene_renders_grouped_by_voice_and_reassembled_in_order(tmp_path: Path, make_project):
+    cfg = EngineConfig(cache_dir=tmp_path / "cache", models_dir=tmp_path / "models")
+    eng = Engine(cfg=cfg, registry=AdapterRegistry.default())
+    project = make_project(lines=6)
+    order = []
+    render_line = eng.render.render_line
+
+    def spy(project_path, scene_id, index, line, *args, **kwargs):
+        order.append(index)
+        return render_line(project_path, scene_id, index, line, *args, **kwargs)
+
+    eng.render.render_line = spy
+    voice_map = {"A": "beep:#1", "B": "beep:#2"}
+    job_id = eng.render.render_scene_async(
+        str(project), "scene01", voice_map, {"backend": "beep", "assemble": False}
+    )
+    deadline = time.monotonic() + 10
+    while eng.queue.get(job_id).status != "done" and time.monotonic() < deadline:
+        time.sleep(0.02)
+    job = eng.queue.get(job_id)
+    assert job.status == "done", job.detail
+    assert order == [1, 3, 5, 2, 4, 6]  # the B lines first, then the A lines
+    assert [Path(p).name for p in job.artifacts["lines"]] == [
+        f"line_{i:03d}.wav" for i in range(1, 7)
+    ]
+
+
+def test_scene_render_resolves_each_voice_once(tmp_path: Path, make_project, wait_for):
+    cfg = EngineConfig(cache_dir=tmp_path / "cache", models_dir=tmp_path / "models")
+    cfg.models_dir.mkdir()
+    (cfg.models_dir / "narrator.onnx").write_bytes(b"")
+    eng = Engine(cfg=cfg, registry=AdapterRegistry.default())
+    project = make_project(lines=6)
+    scans = []
+    discover = eng.discover_models
+    eng.discover_models = lambda: scans.append(1) or discover()
+
+    voice_map = {"A": "beep:narrator#1", "B": "beep:narrator#2"}
+    job_id = eng.render.render_scene_async(
+        str(project), "scene01", voice_map, {"backend": "beep", "assemble": False}
+    )
+    job = wait_for(eng.queue, job_id)
+    assert job.status == "done", job.detail
+    assert len(scans) == 2  # one per voice-map entry, not one per line
+
+    eng.tts.resolve_voice("beep:narrator")
+    assert len(scans) == 3  # single requests still see models added since
+
+
+def test_workers_prefer_batches_of_their_warm_voice(tmp_path: Path):
+    coord = RenderCoordinator(tmp_path / "queue.db")
+    batches = [{"voice": v, "lines": [{"index": i}]} for i, v in enumerate("ababa", start=1)]
+    coord.submit("job", "/p", "scene01", batches)
+
+    worker = RenderWorker(render=None, coordinator=coord, worker_id="w", max_streak=2)
+    voices = [worker.lease().payload["voice"] for _ in range(5)]
+    # Two "a" batches in a row, then the streak cap hands the oldest batch ("b") over.
+    assert voices == ["a", "a", "b", "b", "a"]
+    assert coord.lease("w", prefer="a") is None
+
+
+def test_host_sends_requests_to_a_worker_warm_on_the_model(tmp_path: Path, spin_backend):
+    host = ProcessAdapterHost("spin", spin_backend, workers=2)
+    try:
+        host.speak(text="x", out_path=tmp_path / "1.wav", model_path=Path("a"))
+        first = host._idle[-1]
+        # Force a second worker into existence with model "b" by holding the first one.
+        host._idle.clear()
+        host.speak(text="x", out_path=tmp_path / "2.wav", model_path=Path("b"))
+        host._idle.insert(0, first)
+        assert host._acquire("a") is first
+        assert first.models == {"a"}
+    finally:
+        host.close()
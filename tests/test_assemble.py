@@ -0,0 +1,89 @@
+import json
+import struct
+import wave
+from pathlib import Path
+
+import pytest
+
+from voxengine.adapters.audio.wavfile import read_wav_info, wav_header
+from voxengine.core.assemble import SceneAssembler
+from voxengine.core.engine import Engine, EngineConfig
+from voxengine.core.errors import UserConfigError
+from voxengine.core.registry import AdapterRegistry
+
+BEEP = {"backend": "beep"}
+
+
+def _samples(path: Path) -> list:
+    with wave.open(str(path), "rb") as w:
+        data = w.readframes(w.getnframes())
+    return [int.from_bytes(data[i : i + 2], "little", signed=True) for i in range(0, len(data), 2)]
+
+
+def test_assemble_places_lines_and_gaps(tmp_path: Path, write_wav):
+    lines = [write_wav(tmp_path / "a.wav", 80, 100), write_wav(tmp_path / "b.wav", 40, 200)]
+    cues = SceneAssembler(gap_ms=5, chunk_frames=16).assemble(tmp_path, lines)
+
+    assert cues["frames"] == 80 + 40 + 40
+    assert [c["start_frame"] for c in cues["lines"]] == [0, 120]
+    assert cues["lines"][1]["start_ms"] == 15.0
+    assert _samples(tmp_path / "master.wav") == [100] * 80 + [0] * 40 + [200] * 40
+    assert json.loads((tmp_path / "master.cues.json").read_text()) == cues
+
+
+def test_assemble_resamples_to_common_rate(tmp_path: Path, write_wav):
+    lines = [
+        write_wav(tmp_path / "a.wav", 160, 50, 16000),
+        write_wav(tmp_path / "b.wav", 80, 70, 8000),
+    ]
+    cues = SceneAssembler(gap_ms=0).assemble(tmp_path, lines)
+
+    assert cues["sample_rate"] == 16000
+    assert cues["lines"][1]["frames"] == 159
+    assert read_wav_info(tmp_path / "master.wav").frames == 160 + 159
+    assert set(_samples(tmp_path / "master.wav")[160:]) == {70}
+
+
+def test_patch_splices_a_retake_and_shifts_later_cues(tmp_path: Path, write_wav):
+    lines = [write_wav(tmp_path / f"{n}.wav", 40, n) for n in (1, 2, 3)]
+    asm = SceneAssembler(gap_ms=1)
+    asm.assemble(tmp_path, lines)
+
+    cues = asm.patch(tmp_path, 2, write_wav(tmp_path / "2.wav", 64, 9))
+    assert [c["start_frame"] for c in cues["lines"]] == [0, 48, 120]
+    assert _samples(tmp_path / "master.wav") == [1] * 40 + [0] * 8 + [9] * 64 + [0] * 8 + [3] * 40
+
+    cues = asm.patch(tmp_path, 2, write_wav(tmp_path / "2.wav", 10, 5))
+    assert cues["frames"] == 40 + 8 + 10 + 8 + 40
+    assert _samples(tmp_path / "master.wav") == [1] * 40 + [0] * 8 + [5] * 10 + [0] * 8 + [3] * 40
+    assert read_wav_info(tmp_path / "master.wav").frames == cues["frames"]
+
+
+def test_scene_render_assembles_master_and_rerenders_line(tmp_path: Path, make_project, wait_for):
+    cfg = EngineConfig(cache_dir=tmp_path / "cache", models_dir=tmp_path / "models")
+    eng = Engine(cfg=cfg, registry=AdapterRegistry.default())
+    project = make_project()
+
+    job = wait_for(eng.queue, eng.render.render_scene_async(str(project), "scene01", {}, BEEP))
+    assert job.status == "done"
+    master = Path(job.artifacts["master"])
+    cues = json.loads(Path(job.artifacts["cues"]).read_text())
+    assert [c["file"] for c in cues["lines"]] == ["line_001.wav", "line_002.wav", "line_003.wav"]
+    assert read_wav_info(master).frames == cues["frames"]
+
+    job = wait_for(eng.queue, eng.render.rerender_line_async(str(project), "scene01", 2, {}, BEEP))
+    assert job.status == "done"
+    assert job.artifacts["master"] == str(master)
+
+
+def test_read_wav_info_rejects_bad_fmt_chunks(tmp_path: Path):
+    truncated = tmp_path / "truncated.wav"
+    fmt = struct.pack("<HHI", 1, 1, 8000)
+    truncated.write_bytes(b"RIFF\0\0\0\0WAVEfmt " + struct.pack("<I", len(fmt)) + fmt)
+    with pytest.raises(UserConfigError, match="truncated"):
+        read_wav_info(truncated)
+
+    silent = tmp_path / "silent.wav"
+    silent.write_bytes(wav_header(0, 1, 2, 4) + b"\0" * 4)
+    with pytest.raises(UserConfigError, match="0 Hz"):
+        read_wav_info(silent)
@@ -0,0 +1,85 @@
+import json
+import time
+import wave
+from pathlib import Path
+
+import pytest
+
+from voxengine.adapters.audio.formats import ensure_adapter_format, get_format
+from voxengine.adapters.audio.resample import resample_pcm16
+from voxengine.core.engine import Engine, EngineConfig
+from voxengine.core.errors import UserConfigError
+from voxengine.core.registry import AdapterRegistry
+
+
+def _engine(tmp_path: Path) -> Engine:
+    cfg = EngineConfig(cache_dir=tmp_path / "cache", models_dir=tmp_path / "models")
+    return Engine(cfg=cfg, registry=AdapterRegistry.default())
+
+
+def test_adapters_reject_non_native_formats():
+    ensure_adapter_format("WAV", "Beep")
+    with pytest.raises(UserConfigError):
+        ensure_adapter_format("flac", "Beep")
+    with pytest.raises(UserConfigError):
+        get_format("mp3")
+
+
+@pytest.mark.parametrize("name, rate", [("flac", 16000), ("ogg", 16000), ("opus", 16000)])
+def test_engine_encodes_compressed_formats(tmp_path: Path, name: str, rate: int):
+    sf = pytest.importorskip("soundfile")
+    eng = _engine(tmp_path)
+
+    result = eng.tts_speak(text="hi", backend="beep", out_path=tmp_path / "clip", out_format=name)
+
+    audio_path = Path(result["audio_path"])
+    assert audio_path.suffix == f".{name}"
+    assert result["sample_rate"] == rate
+    info = sf.info(str(audio_path))
+    assert info.samplerate == rate
+    assert info.duration == pytest.approx(0.5, abs=0.05)
+    assert json.loads(Path(result["meta_path"]).read_text())["format"] == name
+    assert {p.name for p in tmp_path.iterdir() if p.is_file()} == {"clip.json", f"clip.{name}"}
+
+
+def test_opus_resamples_to_supported_rate(tmp_path: Path):
+    sf = pytest.importorskip("soundfile")
+    pytest.importorskip("numpy")
+    from voxengine.adapters.audio.encode import encode_wav
+
+    src = tmp_path / "in.wav"
+    with wave.open(str(src), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(22050)
+        wav.writeframes(b"\x00\x10" * 22050)
+
+    rate = encode_wav(src, tmp_path / "out.opus", get_format("opus"), block_frames=1000)
+    assert rate == 24000
+    assert sf.info(str(tmp_path / "out.opus")).duration == pytest.approx(1.0, abs=0.05)
+
+
+def test_resample_preserves_duration():
+    pytest.importorskip("numpy")
+    pcm = b"\x01\x00" * 22050
+    out = resample_pcm16(pcm, 22050, 48000)
+    assert abs(len(out) // 2 - 48000) <= 3
+
+
+def test_deferred_encode_returns_before_the_file_is_encoded(tmp_path: Path):
+    sf = pytest.importorskip("soundfile")
+    eng = _engine(tmp_path)
+
+    result = eng.tts_speak(
+        text="hi", backend="beep", out_path=tmp_path / "clip", out_format="flac", defer_encode=True
+    )
+
+    assert "encode" not in result["timings_ms"]
+    job = eng.queue.get(result["encode_job_id"])
+    deadline = time.monotonic() + 10
+    while job.status != "done" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert job.status == "done"
+    assert job.artifacts["audio_path"] == result["audio_path"]
+    assert sf.info(result["audio_path"]).samplerate == result["sample_rate"] == 16000
+    assert {p.name for p in tmp_path.iterdir() if p.is_file()} == {"clip.json", "clip.flac"}
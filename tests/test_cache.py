@@ -0,0 +1,95 @@
+import json
+import os
+import time
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from voxengine.cli import app
+from voxengine.core.cache import CacheManager
+from voxengine.core.engine import Engine, EngineConfig
+from voxengine.core.registry import AdapterRegistry
+import voxengine.core.engine as engine_mod
+
+
+def _write(root: Path, name: str, size: int, age_s: float) -> Path:
+    path = root / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    stamp = time.time() - age_s
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_gc_evicts_least_recently_used_until_under_quota(tmp_path: Path):
+    old = _write(tmp_path, "tts_old.wav", 4000, age_s=3 * 3600)
+    mid = _write(tmp_path, "tts_mid.wav", 4000, age_s=2 * 3600)
+    new = _write(tmp_path, "sub/tts_new.wav", 4000, age_s=60)
+    cache = CacheManager(tmp_path, max_bytes=9000, batch_size=1)
+
+    result = cache.gc()
+
+    assert result["removed"] == 1
+    assert not old.exists()
+    assert mid.exists() and new.exists()
+    assert cache.stats()["bytes"] == 8000
+
+
+def test_gc_respects_max_age_and_touch(tmp_path: Path):
+    stale = _write(tmp_path, "tts_a.wav", 10, age_s=10 * 86400)
+    sidecar = _write(tmp_path, "tts_a.json", 10, age_s=10 * 86400)
+    kept = _write(tmp_path, "tts_b.wav", 10, age_s=10 * 86400)
+    in_flight = _write(tmp_path, ".tts_c.wav.part", 10, age_s=60)
+    cache = CacheManager(tmp_path, max_age_s=86400)
+
+    cache.touch(kept)
+    cache.gc()
+
+    assert not stale.exists() and not sidecar.exists()
+    assert kept.exists()
+    assert in_flight.exists()
+
+
+def test_touch_ignores_files_outside_the_cache(tmp_path: Path):
+    cache = CacheManager(tmp_path / "cache")
+    render = _write(tmp_path / "project", "line_001.wav", 10, age_s=3600)
+    before = render.stat().st_mtime_ns
+    cache.touch(render)
+    cache.touch(tmp_path / "cache" / ".." / "project" / "line_001.wav")
+    assert render.stat().st_mtime_ns == before
+
+
+def test_note_write_triggers_background_collection(tmp_path: Path):
+    cfg = EngineConfig(
+        cache_dir=tmp_path / "cache", models_dir=tmp_path / "models", cache_max_bytes=20000
+    )
+    eng = Engine(cfg=cfg, registry=AdapterRegistry.default())
+    for _ in range(4):
+        eng.tts_speak(text="hi", backend="beep")  # ~16 KB each
+
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        if eng.cache.stats()["bytes"] is not None and eng.cache.stats()["bytes"] <= 20000:
+            break
+        time.sleep(0.01)
+    assert eng.cache.stats(refresh=True)["bytes"] <= 20000
+    assert "cache" in eng.doctor()
+
+
+def test_cache_cli_commands(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("VOXENGINE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("VOXENGINE_MODELS_DIR", str(tmp_path / "models"))
+    engine_mod._engine = None
+    _write(tmp_path / "cache", "tts_x.wav", 100, age_s=30 * 86400)
+    runner = CliRunner()
+
+    stats = json.loads(runner.invoke(app, ["cache", "stats", "--json"]).output)
+    assert stats["files"] == 1 and stats["bytes"] == 100
+
+    result = runner.invoke(app, ["cache", "gc", "--max-age-days", "7"])
+    assert result.exit_code == 0
+    assert "Removed 1 files" in result.output
+
+    _write(tmp_path / "cache", "tts_y.wav", 100, age_s=0)
+    assert runner.invoke(app, ["cache", "clear", "--yes"]).exit_code == 0
+    assert not any((tmp_path / "cache").glob("tts_*"))
@@ -0,0 +1,70 @@
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from voxengine.adapters.tts.piper import PiperTTSAdapter
+from voxengine.api.server import create_app
+from voxengine.core.cancel import CancelToken, SpeechSessions
+from voxengine.core.engine import get_engine
+from voxengine.core.errors import CancelledError
+
+
+def test_session_latest_utterance_wins():
+    sessions = SpeechSessions()
+    first = sessions.begin("s")
+    second = sessions.begin("s")
+    assert first.cancelled and first.reason == "superseded by a newer utterance"
+    assert not second.cancelled
+    with pytest.raises(CancelledError):
+        first.raise_if_cancelled()
+
+    fired = []
+    second.on_cancel(lambda: fired.append(True))
+    assert sessions.flush("s") is True
+    assert fired == [True]
+    assert sessions.flush("s") is False
+
+
+def test_piper_process_is_killed_on_cancel(monkeypatch, tmp_path: Path):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    fake = bin_dir / "piper"
+    fake.write_text("#!/bin/sh\nexec sleep 30\n")
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    model = tmp_path / "voice.onnx"
+    model.write_bytes(b"")
+
+    cancel = CancelToken()
+    threading.Timer(0.2, cancel.cancel, args=("flushed",)).start()
+    start = time.monotonic()
+    with pytest.raises(CancelledError, match="flushed"):
+        PiperTTSAdapter().speak("hello", tmp_path / "out.wav", model_path=model, cancel=cancel)
+    assert time.monotonic() - start < 5
+
+
+def test_flush_aborts_in_flight_request(monkeypatch, waiting_adapter, reset_engine):
+    client = TestClient(create_app())
+    monkeypatch.setitem(get_engine().registry.tts, "waiting", waiting_adapter)
+    assert client.post("/v1/tts/flush", json={"session_id": "s"}).json()["cancelled"] is False
+
+    results = {}
+
+    def speak():
+        results["resp"] = client.post(
+            "/v1/tts/speak", json={"text": "old", "backend": "waiting", "session_id": "s"}
+        )
+
+    t = threading.Thread(target=speak)
+    t.start()
+    deadline = time.monotonic() + 5
+    while not len(get_engine().sessions) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert client.post("/v1/tts/flush", json={"session_id": "s"}).json()["cancelled"] is True
+    t.join(5)
+    assert results["resp"].status_code == 409
+    assert "flushed" in results["resp"].json()["detail"]
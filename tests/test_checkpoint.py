@@ -0,0 +1,107 @@
+import json
+from pathlib import Path
+
+from voxengine.adapters.tts.beep import BeepTTSAdapter
+from voxengine.core.checkpoint import RenderCheckpoint
+from voxengine.core.engine import Engine, EngineConfig
+from voxengine.core.registry import AdapterRegistry
+
+BEEP = {"backend": "counting"}
+
+
+class CountingBeep(BeepTTSAdapter):
+    def __init__(self) -> None:
+        super().__init__()
+        self.texts = []
+
+    def speak(self, text, *args, **kwargs):
+        self.texts.append(text)
+        return super().speak(text, *args, **kwargs)
+
+
+def _engine(tmp_path: Path) -> Engine:
+    cfg = EngineConfig(cache_dir=tmp_path / "cache", models_dir=tmp_path / "models")
+    registry = AdapterRegistry.default()
+    registry.tts["counting"] = CountingBeep()
+    return Engine(cfg=cfg, registry=registry)
+
+
+def _journal(eng: Engine, project: Path, job_id: str, lines) -> RenderCheckpoint:
+    """Render ``lines`` of scene01 under a fresh journal, as a job would before dying."""
+    job = {"job_id": job_id, "project_path": str(project), "scene_id": "scene01"}
+    checkpoint = RenderCheckpoint.start(
+        eng.render.checkpoint_dir, dict(job, voice_map={}, options=BEEP)
+    )
+    script = eng.projects.load_scene(str(project), "scene01")["lines"]
+    for idx in lines:
+        eng.render.render_line(
+            str(project), "scene01", idx, script[idx - 1], {}, BEEP, checkpoint=checkpoint
+        )
+    return checkpoint
+
+
+def test_finished_render_leaves_no_checkpoint_or_temp_files(tmp_path: Path, make_project, wait_for):
+    eng = _engine(tmp_path)
+    project = make_project(lines=3)
+    job = wait_for(eng.queue, eng.render.render_scene_async(str(project), "scene01", {}, BEEP))
+    assert job.status == "done"
+    assert list((tmp_path / "cache" / "checkpoints").iterdir()) == []
+    scene_dir = project / "renders" / "scene01"
+    assert sorted(p.name for p in scene_dir.glob(".*")) == []
+    sidecar = json.loads((scene_dir / "line_001.json").read_text())
+    assert sidecar["audio_path"] == str(scene_dir / "line_001.wav")
+
+
+def test_interrupted_render_resumes_from_intact_lines(tmp_path: Path, make_project, wait_for):
+    project = make_project(lines=4)
+    scene_dir = project / "renders" / "scene01"
+    crashed = _engine(tmp_path)
+    checkpoint = _journal(crashed, project, "job-1", lines=(1, 2, 3))
+    # The process dies: line 3 is damaged, a temp file is left behind, the journal is torn.
+    (scene_dir / "line_003.wav").write_bytes(b"RIFF")
+    (scene_dir / ".line_004.job-1.0badf00d.wav").write_bytes(b"RIFF")
+    (scene_dir / ".line_002.job-7.0badf00d.wav").write_bytes(b"RIFF")  # another job's
+    with open(checkpoint.path, "ab") as fh:
+        fh.write(b'{"type": "line", "index": 4, "pa')
+    checkpoint.close()
+    kept_mtime = (scene_dir / "line_001.wav").stat().st_mtime_ns
+
+    restarted = _engine(tmp_path)
+    assert restarted.resume_renders() == ["job-1"]
+    done = wait_for(restarted.queue, "job-1")
+    assert done.status == "done", done.error
+    assert done.artifacts["resumed_lines"] == 2
+    assert restarted.registry.tts["counting"].texts == ["Line number 2.", "Line number 3."]
+    assert (scene_dir / "line_001.wav").stat().st_mtime_ns == kept_mtime
+    assert not (scene_dir / ".line_004.job-1.0badf00d.wav").exists()
+    assert (scene_dir / ".line_002.job-7.0badf00d.wav").exists()
+    assert Path(done.artifacts["master"]).exists()
+    assert not checkpoint.path.exists()
+    assert restarted.resume_renders() == []
+
+
+def test_journal_of_a_running_job_is_not_resumed(tmp_path: Path, make_project):
+    project = make_project(lines=2)
+    scene_dir = project / "renders" / "scene01"
+    running = _journal(_engine(tmp_path), project, "job-3", lines=(1,))
+    partial = scene_dir / ".line_002.job-3.0badf00d.wav"
+    partial.write_bytes(b"RIFF")
+
+    # Another process sharing the cache dir starts while job-3 is still rendering.
+    other = _engine(tmp_path)
+    assert other.resume_renders() == []
+    assert partial.exists() and running.path.exists()
+
+    running.discard()
+    assert other.resume_renders() == []
+    assert not running.path.exists()
+
+
+def test_changed_script_text_is_rendered_again(tmp_path: Path, make_project):
+    project = make_project(lines=2)
+    checkpoint = _journal(_engine(tmp_path), project, "job-2", lines=(1, 2))
+    state = RenderCheckpoint.load(checkpoint.path)
+    line_001 = project / "renders" / "scene01" / "line_001.wav"
+    assert state.verified(1, "Line number 0.") == str(line_001)
+    assert state.verified(1, "Edited line.") is None
+    assert state.verified(3, "Line number 2.") is None
@@ -0,0 +1,124 @@
+import os
+import threading
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from voxengine.adapters.audio.wavfile import wav_header
+from voxengine.adapters.tts.piper import PiperTTSAdapter
+from voxengine.api.server import create_app
+from voxengine.core import concurrency
+from voxengine.core.cancel import CancelToken
+from voxengine.core.concurrency import AdaptiveLimiter, ConcurrencyController
+from voxengine.core.errors import CancelledError
+
+
+def _feed(limiter: AdaptiveLimiter, samples, waited: bool = True) -> None:
+    with limiter._cond:
+        for ms in samples:
+            limiter._waited_in_window = limiter._waited_in_window or waited
+            limiter._record(ms)
+
+
+def test_limit_grows_while_queueing_and_backs_off_on_latency(monkeypatch):
+    monkeypatch.setattr(concurrency, "available_memory_mb", lambda: 4096.0)
+    limiter = AdaptiveLimiter("piper", initial=2, max_limit=4, window=2)
+
+    _feed(limiter, [1.0, 1.0])
+    _feed(limiter, [1.0, 1.1])
+    assert limiter.limit == 4
+    _feed(limiter, [1.0, 1.0])
+    assert limiter.limit == 4  # capped
+
+    _feed(limiter, [1.0, 1.0], waited=False)
+    assert limiter.limit == 4  # no queue, no reason to grow or shrink
+
+    _feed(limiter, [3.0, 3.0])
+    assert limiter.limit == 2
+    assert limiter.snapshot()["adjustments"] == 3
+
+
+def test_mixed_lengths_at_constant_load_do_not_shrink_the_limit(monkeypatch):
+    monkeypatch.setattr(concurrency, "available_memory_mb", lambda: 4096.0)
+    limiter = AdaptiveLimiter("piper", initial=2, max_limit=4, window=10)
+    lengths = [3, 1800, 12, 640, 5, 2400, 40, 90, 7, 1200]
+    with limiter._cond:
+        for _ in range(5):
+            for chars in lengths:
+                limiter._record(200.0 + 1.0 * chars, cost=chars)  # fixed cost + per char
+    assert limiter.limit == 2
+    assert limiter.snapshot()["latency_ratio"] == pytest.approx(1.0, abs=0.1)
+    assert limiter.estimate_ms(1800) == pytest.approx(2000, rel=0.1)
+
+
+def test_low_memory_backs_off(monkeypatch):
+    monkeypatch.setattr(concurrency, "available_memory_mb", lambda: 64.0)
+    limiter = AdaptiveLimiter("piper", initial=4, max_limit=4, window=2)
+    _feed(limiter, [1.0, 1.0])
+    assert limiter.limit == 2
+
+
+def test_fixed_limit_blocks_and_honours_cancel():
+    limiter = AdaptiveLimiter("beep", initial=1, max_limit=1, adaptive=False)
+    entered = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with limiter.slot():
+            entered.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    assert entered.wait(5)
+    cancel = CancelToken()
+    threading.Timer(0.1, cancel.cancel, args=("flushed",)).start()
+    with pytest.raises(CancelledError):
+        with limiter.slot(cancel=cancel):
+            pass
+    release.set()
+    holder.join(5)
+    assert limiter.snapshot()["inflight"] == 0
+
+
+def test_backend_threads(monkeypatch):
+    controller = ConcurrencyController(max_limit=2, backend_threads="auto")
+    monkeypatch.setattr(controller, "cores", 8)
+    assert controller.threads_for(2) == 4
+    assert ConcurrencyController(backend_threads="3").threads_for(2) == 3
+    assert ConcurrencyController().threads_for(2) is None
+
+
+def test_piper_receives_thread_cap(monkeypatch, tmp_path: Path):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    fake = bin_dir / "piper"
+    template = tmp_path / "template.wav"
+    template.write_bytes(wav_header(22050, 1, 2, 4410) + b"\x00" * 4410)
+    seen = tmp_path / "threads.txt"
+    fake.write_text(
+        f'#!/bin/sh\ncat > /dev/null\nprintf "%s" "$OMP_NUM_THREADS" > {seen}\n'
+        f'cp {template} "$4"\n'
+    )
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    model = tmp_path / "voice.onnx"
+    model.write_bytes(b"")
+
+    audio = PiperTTSAdapter().speak("hello", tmp_path / "out.wav", model_path=model, threads=2)
+    assert seen.read_text() == "2"
+    assert audio.duration_s == 0.1
+
+
+def test_api_reports_concurrency(monkeypatch, reset_engine):
+    monkeypatch.setenv("VOXENGINE_MAX_CONCURRENCY", "1")
+    client = TestClient(create_app())
+    assert client.post("/v1/tts/speak", json={"text": "hi", "backend": "beep"}).status_code == 200
+
+    data = client.get("/v1/concurrency").json()
+    assert data["max_limit"] == 1
+    (beep,) = data["backends"]
+    assert beep["backend"] == "beep"
+    assert beep["limit"] == 1
+    assert beep["inflight"] == 0
@@ -0,0 +1,92 @@
+import threading
+import time
+from pathlib import Path
+
+from voxengine.core.coordinator import RenderCoordinator
+from voxengine.core.engine import Engine, EngineConfig
+from voxengine.core.registry import AdapterRegistry
+from voxengine.core.render import RenderWorker
+
+
+def _engine(tmp_path: Path, name: str, coordinator: Path | None = None) -> Engine:
+    cfg = EngineConfig(
+        cache_dir=tmp_path / name / "cache",
+        models_dir=tmp_path / name / "models",
+        coordinator_path=coordinator,
+        coordinator_lease_s=2.0,
+    )
+    return Engine(cfg=cfg, registry=AdapterRegistry.default())
+
+
+def test_expired_lease_is_reclaimed(tmp_path: Path):
+    coord = RenderCoordinator(tmp_path / "queue.db", lease_s=0.05)
+    coord.submit("job", "/p", "scene01", [{"lines": [{"index": 1}]}])
+
+    first = coord.lease("dead-worker")
+    assert first is not None
+    assert coord.lease("other") is None
+    time.sleep(0.1)
+
+    second = coord.lease("other")
+    assert second is not None and second.task_id == first.task_id
+    assert second.attempts == 2
+    assert not coord.heartbeat(first.task_id, "dead-worker")
+    assert not coord.complete(first.task_id, "dead-worker", {"lines": []})
+    assert coord.complete(second.task_id, "other", {"lines": [{"index": 1, "path": "x"}]})
+    assert coord.job_status("job")["finished"]
+
+
+def test_cancel_job_revokes_leases(tmp_path: Path):
+    coord = RenderCoordinator(tmp_path / "queue.db")
+    coord.submit("job", "/p", "scene01", [{"lines": [{"index": 1}]}, {"lines": [{"index": 2}]}])
+    task = coord.lease("w")
+
+    assert coord.cancel_job("job") == 2
+    assert not coord.heartbeat(task.task_id, "w")
+    assert coord.lease("w") is None
+    status = coord.job_status("job")
+    assert status["finished"] and status["tasks"]["cancelled"] == 2
+
+
+def test_failed_batches_are_retried_then_reported(tmp_path: Path):
+    coord = RenderCoordinator(tmp_path / "queue.db", max_attempts=2)
+    coord.submit("job", "/p", "scene01", [{"lines": [{"index": 1}]}])
+    for _ in range(2):
+        task = coord.lease("w")
+        coord.fail(task.task_id, "w", "boom")
+    status = coord.job_status("job")
+    assert status["finished"] and status["errors"] == ["boom"]
+
+
+def test_several_workers_render_one_scene(tmp_path: Path, make_project):
+    db = tmp_path / "shared" / "queue.db"
+    api = _engine(tmp_path, "api", coordinator=db)
+    project = make_project(lines=10)
+
+    job_id = api.render.render_scene_async(
+        str(project), "scene01", {}, {"backend": "beep", "batch_size": 2, "poll_s": 0.02}
+    )
+    workers = [
+        RenderWorker(_engine(tmp_path, f"node{i}").render, RenderCoordinator(db), f"node{i}")
+        for i in range(3)
+    ]
+    threads = [
+        threading.Thread(target=w.run, kwargs={"max_idle_s": 0.5, "poll_s": 0.02})
+        for w in workers
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=20)
+
+    deadline = time.monotonic() + 5
+    while api.queue.get(job_id).status == "running" and time.monotonic() < deadline:
+        time.sleep(0.02)
+    job = api.queue.get(job_id)
+    assert job.status == "done", job.detail
+    assert [Path(p).name for p in job.artifacts["lines"]] == [
+        f"line_{i:03d}.wav" for i in range(1, 11)
+    ]
+    assert sum(w.completed for w in workers) == 5
+    scene_dir = project / "renders" / "scene01"
+    assert all((scene_dir / f"line_{i:03d}.wav").exists() for i in range(1, 11))
@@ -0,0 +1,77 @@
+import json
+import threading
+import time
+from pathlib import Path
+
+from voxengine.adapters.tts.beep import BeepTTSAdapter
+from voxengine.core.concurrency import AdaptiveLimiter
+from voxengine.core.engine import Engine, EngineConfig
+from voxengine.core.registry import AdapterRegistry
+from voxengine.core.workers import PRIORITY_INTERACTIVE
+
+
+class SlowBeep(BeepTTSAdapter):
+    def speak(self, *args, **kwargs):
+        time.sleep(0.05)
+        return super().speak(*args, **kwargs)
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+def test_interactive_requests_take_freed_slots_before_batch_work():
+    limiter = AdaptiveLimiter("beep", initial=1, max_limit=1, adaptive=False)
+    release = threading.Event()
+    order = []
+
+    def run(name, priority=10, hold=None):
+        with limiter.slot(priority=priority):
+            order.append(name)
+            if hold is not None:
+                hold.wait(5)
+
+    holder = threading.Thread(target=run, args=("render-1", 10, release))
+    holder.start()
+    _wait_for(lambda: limiter.inflight == 1)
+    batch = threading.Thread(target=run, args=("render-2",))
+    batch.start()
+    _wait_for(lambda: limiter.waiting == 1)
+    interactive = threading.Thread(target=run, args=("screenreader", PRIORITY_INTERACTIVE))
+    interactive.start()
+    _wait_for(lambda: limiter.waiting_interactive == 1)
+
+    release.set()
+    for t in (holder, batch, interactive):
+        t.join(5)
+    assert order == ["render-1", "screenreader", "render-2"]
+    assert limiter.snapshot()["interactive_overtakes"] == 1
+
+
+def test_interactive_speech_falls_back_when_over_budget(tmp_path: Path):
+    cfg = EngineConfig(
+        cache_dir=tmp_path / "cache",
+        models_dir=tmp_path / "models",
+        interactive_budget_ms=1,
+        interactive_fallback="beep:",
+    )
+    registry = AdapterRegistry.default()
+    registry.tts["slow"] = SlowBeep()
+    eng = Engine(cfg=cfg, registry=registry)
+
+    # Nothing is known about the backend yet, so the first request is not predicted to be late.
+    first = eng.tts_speak(text="hello", backend="slow", profile="screenreader")
+    assert first["backend"] == "slow" and first["warnings"] == []
+
+    narration = eng.tts_speak(text="hello", backend="slow", profile="narration")
+    assert narration["backend"] == "slow"  # only interactive profiles are degraded
+
+    second = eng.tts_speak(text="hello", backend="slow", profile="screenreader")
+    assert second["backend"] == "beep"
+    assert second["warnings"][0].startswith("degraded under load")
+    sidecar = json.loads(Path(second["meta_path"]).read_text())
+    assert sidecar["degraded"] is True and sidecar["warnings"] == second["warnings"]
+    counts = eng.doctor()["degradation"]["counts"]
+    assert counts == {"interactive": 2, "over_budget": 1, "degraded": 1}
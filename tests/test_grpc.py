@@ -0,0 +1,132 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from voxengine.adapters.audio.wavfile import read_wav_info
+from voxengine.api.grpc_server import Frame, decode_frame, encode_frame, require_grpc
+from voxengine.core.engine import Engine, EngineConfig
+from voxengine.core.errors import MissingDependencyError
+from voxengine.core.registry import AdapterRegistry
+
+
+@pytest.fixture
+def grpc_engine(tmp_path: Path):
+    pytest.importorskip("grpc")
+    from voxengine.api.grpc_server import VoxEngineClient, serve_grpc
+
+    cfg = EngineConfig(cache_dir=tmp_path / "cache", models_dir=tmp_path / "models")
+    eng = Engine(cfg=cfg, registry=AdapterRegistry.default())
+    address = f"unix:{tmp_path / 'vox.sock'}"
+    server = serve_grpc(eng, address)
+    client = VoxEngineClient(address)
+    yield eng, client
+    client.close()
+    server.stop()
+
+
+def test_frames_round_trip_raw_bytes():
+    frame = Frame({"type": "audio", "seq": 3}, b"\x00\x01" * 100)
+    assert decode_frame(encode_frame(frame)) == frame
+    assert decode_frame(encode_frame(Frame())) == Frame()
+    # The protobuf encoding of Frame: field 1 (header), field 2 (data); unknown fields skipped.
+    assert encode_frame(Frame({"type": "end"}, b"\x01")) == b'\n\x0e{"type":"end"}\x12\x01\x01'
+    assert decode_frame(b"\x18\x96\x01\x12\x02ok") == Frame({}, b"ok")
+    with pytest.raises(ValueError):
+        decode_frame(b"\x12\x05ok")
+
+
+def test_missing_grpcio_is_a_dependency_error(monkeypatch):
+    monkeypatch.setitem(sys.modules, "grpc", None)
+    with pytest.raises(MissingDependencyError, match="voxengine\\[grpc\\]"):
+        require_grpc()
+
+
+def test_speak_and_stream_pcm(grpc_engine):
+    _, client = grpc_engine
+    result = client.speak("hello there", backend="beep", inline=True)
+    assert result.header["backend"] == "beep"
+    assert result.data == Path(result.header["audio_path"]).read_bytes()
+
+    frames = list(client.speak_stream("hello there", backend="beep", chunk_ms=20))
+    fmt, *audio, end = frames
+    assert fmt.type == "format" and end.type == "end"
+    assert {f.type for f in audio} == {"audio"} and all(f.header == {} for f in audio)
+    info = read_wav_info(fmt.header["audio_path"])
+    assert len(audio) == end.header["chunks"] > 1
+    assert sum(len(f.data) for f in audio) == info.data_size
+
+
+def test_errors_map_to_status_codes(grpc_engine):
+    import grpc
+
+    _, client = grpc_engine
+    with pytest.raises(grpc.RpcError) as err:
+        client.call("JobStatus", job_id="nope")
+    assert err.value.code() == grpc.StatusCode.NOT_FOUND
+    with pytest.raises(grpc.RpcError) as err:
+        client.speak("hi", backend="beep", profile="invalid")
+    assert err.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+
+def test_session_streams_utterances_in_order_and_cancels(grpc_engine, waiting_adapter):
+    eng, client = grpc_engine
+    requests = [
+        Frame({"type": "speak", "id": "a", "text": "first", "backend": "beep"}),
+        Frame({"type": "speak", "id": "b", "text": "second", "backend": "nope"}),
+        Frame({"type": "speak", "id": "c", "text": "third", "backend": "beep"}),
+    ]
+    frames = list(client.session(requests))
+    assert [f.header["id"] for f in frames if f.type == "end"] == ["a", "c"]
+    (error,) = [f for f in frames if f.type == "error"]
+    assert error.header["id"] == "b"
+
+    # A cancel stops the blocked utterance and drops the one queued behind it.
+    eng.registry.tts["waiting"] = waiting_adapter
+
+    def interactive():
+        yield Frame({"type": "speak", "id": "w", "text": "long", "backend": "waiting"})
+        yield Frame({"type": "speak", "id": "q", "text": "queued", "backend": "beep"})
+        time.sleep(0.2)
+        yield Frame({"type": "cancel"})
+        yield Frame({"type": "speak", "id": "r", "text": "next", "backend": "beep"})
+
+    frames = [f.header for f in client.session(interactive()) if f.type != "audio"]
+    assert [(f["id"], f["type"]) for f in frames] == [
+        ("w", "cancelled"),
+        ("q", "cancelled"),
+        ("r", "format"),
+        ("r", "end"),
+    ]
+
+
+def test_render_scene_and_watch_job(grpc_engine, make_project):
+    _, client = grpc_engine
+    project = make_project(lines=2)
+    job_id = client.call(
+        "RenderScene",
+        project_path=str(project),
+        scene_id="scene01",
+        options={"backend": "beep", "assemble": False},
+    ).header["job_id"]
+    events = [f.header for f in client.watch_job(job_id)]
+    assert events[-1]["status"] == "done"
+    status = client.call("JobStatus", job_id=job_id).header
+    assert status["status"] == "done" and len(status["artifacts"]["lines"]) == 2
+
+
+def test_http_app_serves_grpc_on_the_same_engine(tmp_path: Path, reset_engine):
+    pytest.importorskip("grpc")
+    from fastapi.testclient import TestClient
+
+    from voxengine.api.grpc_server import VoxEngineClient
+    from voxengine.api.server import create_app
+
+    address = f"unix:{tmp_path / 'app.sock'}"
+    with TestClient(create_app(grpc_address=address)) as http, VoxEngineClient(address) as rpc:
+        job_id = http.post(
+            "/v1/render/scene",
+            json={"project_path": str(tmp_path), "scene_id": "missing"},
+        ).json()["job_id"]
+        assert rpc.call("JobStatus", job_id=job_id).header["job_id"] == job_id
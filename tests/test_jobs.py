@@ -0,0 +1,232 @@
+import asyncio
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from voxengine.adapters.tts.beep import BeepTTSAdapter
+from voxengine.api.server import _job_event_stream, create_app
+from voxengine.core.engine import Engine, EngineConfig
+from voxengine.core.queue import JobQueue
+from voxengine.core.registry import AdapterRegistry
+import voxengine.core.engine as engine_mod
+
+
+def test_render_scene_writes_lines_and_publishes_progress(tmp_path: Path, make_project, wait_for):
+    cfg = EngineConfig(cache_dir=tmp_path / "cache", models_dir=tmp_path / "models")
+    eng = Engine(cfg=cfg, registry=AdapterRegistry.default())
+    project = make_project()
+
+    job_id = eng.render.render_scene_async(str(project), "scene01", {}, {"backend": "beep"})
+    job = wait_for(eng.queue, job_id)
+
+    assert job.status == "done"
+    assert [Path(p).name for p in job.artifacts["lines"]] == [
+        "line_001.wav",
+        "line_002.wav",
+        "line_003.wav",
+    ]
+    events = eng.queue.events_since(0, job_id=job_id)
+    assert [e.type for e in events] == ["created", "running"] + ["progress"] * 3 + ["done"]
+    assert [e.seq for e in events] == sorted(e.seq for e in events)
+    assert eng.queue.events_since(0, project=project)[-1].type == "done"
+
+
+def test_events_resume_from_sequence():
+    queue = JobQueue(history=4)
+    job = queue.create()
+    for i in range(5):
+        queue.set_progress(job.id, i / 5)
+    assert [e.seq for e in queue.events_since(4)] == [5, 6]
+    assert queue.oldest_seq() == 3
+    assert queue.snapshot(job_id=job.id)[0]["progress"] == 0.8
+
+
+def test_sse_stream_is_woken_by_events_published_while_sending(tmp_path: Path, wait_for):
+    cfg = EngineConfig(cache_dir=tmp_path / "cache", models_dir=tmp_path / "models")
+    eng = Engine(cfg=cfg, registry=AdapterRegistry.default())
+    job = eng.queue.create()
+
+    async def consume():
+        stream = _job_event_stream(eng, 0, job.id, None)
+        first = await stream.__anext__()
+        # Published while the first event is being sent, before the stream waits again.
+        eng.queue.set_progress(job.id, 0.5)
+        await asyncio.sleep(0)
+        second = await asyncio.wait_for(stream.__anext__(), timeout=2)
+        await stream.aclose()
+        return first, second
+
+    first, second = asyncio.run(consume())
+    assert "event: created" in first and "event: progress" in second
+
+
+def test_sse_stream_replays_and_closes_when_job_finishes(
+    monkeypatch, tmp_path: Path, make_project
+):
+    monkeypatch.setenv("VOXENGINE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("VOXENGINE_MODELS_DIR", str(tmp_path / "models"))
+    engine_mod._engine = None
+    project = make_project()
+    client = TestClient(create_app())
+
+    resp = client.post(
+        "/v1/render/scene",
+        json={"project_path": str(project), "scene_id": "scene01", "options": {"backend": "beep"}},
+    )
+    job_id = resp.json()["job_id"]
+
+    with client.stream("GET", f"/v1/jobs/{job_id}/events") as stream:
+        assert stream.headers["content-type"].startswith("text/event-stream")
+        body = "".join(stream.iter_text())
+
+    events = [line[len("event: "):] for line in body.splitlines() if line.startswith("event: ")]
+    assert events[0] == "created"
+    assert events[-1] == "done"
+    assert events.count("progress") == 3
+
+    last_id = [line for line in body.splitlines() if line.startswith("id: ")][-2][4:]
+    with client.stream(
+        "GET", f"/v1/jobs/{job_id}/events", headers={"Last-Event-ID": last_id}
+    ) as stream:
+        resumed = "".join(stream.iter_text())
+    assert [line for line in resumed.splitlines() if line.startswith("event: ")] == ["event: done"]
+
+
+def test_finished_jobs_are_evicted_by_count_and_ttl(monkeypatch):
+    queue = JobQueue(max_finished=2, finished_ttl_s=60)
+    jobs = [queue.create() for _ in range(4)]
+    for job in jobs[:3]:
+        queue.set_done(job.id, {"audio_path": "x"})
+    assert len(queue) == 3
+    assert queue.list(status="done")[0] == [queue.get(jobs[2].id), queue.get(jobs[1].id)]
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    assert queue.prune() == 2
+    assert [j.id for j in queue.list()[0]] == [jobs[3].id]
+    assert not hasattr(jobs[3], "__dict__")
+
+
+def test_job_listing_filters_and_paginates(tmp_path: Path):
+    queue = JobQueue()
+    a = [queue.create(project=tmp_path / "a") for _ in range(5)]
+    b = [queue.create(project=tmp_path / "b") for _ in range(3)]
+    queue.set_running(a[1].id)
+
+    page, cursor = queue.list(project=tmp_path / "a", limit=2)
+    assert [j.id for j in page] == [a[4].id, a[3].id]
+    page, cursor = queue.list(project=tmp_path / "a", limit=2, cursor=cursor)
+    assert [j.id for j in page] == [a[2].id, a[1].id]
+    page, cursor = queue.list(project=tmp_path / "a", limit=2, cursor=cursor)
+    assert [j.id for j in page] == [a[0].id]
+    assert cursor is None
+
+    assert [j.id for j in queue.list(status="running")[0]] == [a[1].id]
+    assert len(queue.list(status="queued", project=tmp_path / "b")[0]) == len(b)
+    assert queue.list(created_after=time.time() + 10) == ([], None)
+
+
+def test_jobs_endpoint_lists_with_cursor(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("VOXENGINE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("VOXENGINE_MODELS_DIR", str(tmp_path / "models"))
+    engine_mod._engine = None
+    client = TestClient(create_app())
+    eng = engine_mod.get_engine()
+    ids = [eng.queue.create(project=tmp_path).id for _ in range(3)]
+
+    first = client.get("/v1/jobs", params={"project": str(tmp_path), "limit": 2}).json()
+    assert [j["job_id"] for j in first["jobs"]] == ids[::-1][:2]
+    second = client.get("/v1/jobs", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+    assert [j["job_id"] for j in second["jobs"]] == [ids[0]]
+    assert second["next_cursor"] is None
+
+
+class SlowAdapter:
+    """Takes a while per line unless cancelled."""
+
+    def about(self) -> dict:
+        return {"name": "slow", "type": "tts", "available": True}
+
+    def speak(self, text, out_path, model_path=None, voice=None, profile=None, **kwargs):
+        cancel = kwargs["cancel"]
+        if cancel.wait(0.2):
+            cancel.raise_if_cancelled()
+        return BeepTTSAdapter(duration_s=0.01).speak(text, out_path)
+
+
+def test_cancel_running_render_keeps_partial_results(tmp_path: Path, make_project, wait_for):
+    cfg = EngineConfig(cache_dir=tmp_path / "cache", models_dir=tmp_path / "models")
+    registry = AdapterRegistry.default()
+    registry.tts["slow"] = SlowAdapter()
+    eng = Engine(cfg=cfg, registry=registry)
+    project = make_project(lines=20)
+
+    job_id = eng.render.render_scene_async(str(project), "scene01", {}, {"backend": "slow"})
+    deadline = time.monotonic() + 5
+    while eng.queue.get(job_id).progress == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert eng.queue.cancel(job_id)
+    job = wait_for(eng.queue, job_id)
+
+    assert job.status == "cancelled"
+    assert job.artifacts["partial"] is True
+    assert 1 <= len(job.artifacts["lines"]) < 20
+    assert not eng.queue.cancel(job_id)
+    assert eng.queue.events_since(0, job_id=job_id)[-1].type == "cancelled"
+
+
+def test_line_previews_do_not_wait_behind_scene_renders(tmp_path: Path, make_project, wait_for):
+    cfg = EngineConfig(
+        cache_dir=tmp_path / "cache",
+        models_dir=tmp_path / "models",
+        background_workers=1,
+        render_workers=1,
+    )
+    registry = AdapterRegistry.default()
+    registry.tts["slow"] = SlowAdapter()
+    eng = Engine(cfg=cfg, registry=registry)
+    project = make_project(lines=20)
+
+    scenes = [
+        eng.render.render_scene_async(str(project), "scene01", {}, {"backend": "slow"})
+        for _ in range(2)
+    ]
+    line_id = eng.render.rerender_line_async(
+        str(project), "scene01", 1, {}, {"backend": "beep", "lookahead": 0}
+    )
+    line = wait_for(eng.queue, line_id, timeout=2)
+    assert line.status == "done"
+    assert eng.queue.get(scenes[0]).status == "running"
+    for job_id in scenes:
+        eng.queue.cancel(job_id)
+        wait_for(eng.queue, job_id)
+
+
+def test_render_deadline_fails_job(tmp_path: Path, make_project, wait_for):
+    cfg = EngineConfig(cache_dir=tmp_path / "cache", models_dir=tmp_path / "models")
+    registry = AdapterRegistry.default()
+    registry.tts["slow"] = SlowAdapter()
+    eng = Engine(cfg=cfg, registry=registry)
+    project = make_project(lines=20)
+
+    job_id = eng.render.render_scene_async(
+        str(project), "scene01", {}, {"backend": "slow", "timeout_s": 0.3}
+    )
+    job = wait_for(eng.queue, job_id)
+    assert job.status == "error"
+    assert job.detail.startswith("Deadline exceeded")
+    assert job.artifacts["partial"] is True
+
+
+def test_cancel_endpoint(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("VOXENGINE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("VOXENGINE_MODELS_DIR", str(tmp_path / "models"))
+    engine_mod._engine = None
+    client = TestClient(create_app())
+    job = engine_mod.get_engine().queue.create()
+
+    resp = client.post(f"/v1/jobs/{job.id}/cancel")
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "cancelled"
+    assert client.post("/v1/jobs/nope/cancel").status_code == 404
@@ -0,0 +1,63 @@
+import asyncio
+import random
+import subprocess
+import sys
+import wave
+from pathlib import Path
+
+from benchmarks.loadgen import (
+    FAKE_PIPER,
+    StepResult,
+    knee,
+    local_server,
+    make_text,
+    parse_mix,
+    percentile,
+    run,
+)
+
+
+def test_percentile_and_knee():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 99) == 0.0
+
+    fast = StepResult(rate=1, duration_s=1, sent=10, ok=10, latencies_ms=[10.0] * 10)
+    slow = StepResult(rate=2, duration_s=1, sent=10, ok=10, latencies_ms=[10.0] * 9 + [900.0])
+    failing = StepResult(rate=4, duration_s=1, sent=10, ok=8, latencies_ms=[10.0] * 8)
+    assert knee([fast, slow], slo_ms=500, max_error_rate=0.1) == 2
+    assert knee([fast, failing], slo_ms=500, max_error_rate=0.1) == 4
+    assert knee([fast], slo_ms=500, max_error_rate=0.1) is None
+
+
+def test_texts_follow_the_mix_and_are_unique():
+    rng = random.Random(1)
+    mix = parse_mix("short=1")
+    texts = [make_text(rng, mix, n) for n in range(20)]
+    assert len(set(texts)) == 20
+    assert all(len(t) <= 60 for t in texts)
+
+
+def test_fake_piper_writes_wav_and_fails_on_request(tmp_path: Path):
+    out = tmp_path / "out.wav"
+    cmd = [sys.executable, str(FAKE_PIPER), "--model", "m.onnx", "--output_file", str(out)]
+    env = {"FAKE_PIPER_LATENCY_MS": "0", "FAKE_PIPER_MS_PER_CHAR": "0"}
+    subprocess.run(cmd, input=b"hello", env=env, check=True)
+    with wave.open(str(out)) as wav:
+        assert wav.getnframes() > 0
+
+    env["FAKE_PIPER_FAILURE_RATE"] = "1"
+    assert subprocess.run(cmd, input=b"hello", env=env, capture_output=True).returncode == 1
+
+
+def test_load_run_against_local_server():
+    fake = {"FAKE_PIPER_LATENCY_MS": "0", "FAKE_PIPER_MS_PER_CHAR": "0"}
+    with local_server(fake) as url:
+        results = asyncio.run(
+            run(url, [4], 0.5, parse_mix("short=1"), {"backend": "piper"}, echo=False)
+        )
+    (step,) = results
+    assert step.sent >= 1
+    assert step.ok == step.sent, step.errors
+    assert step.to_dict()["p50_ms"] > 0
@@ -0,0 +1,105 @@
+import io
+import json
+import logging
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from voxengine.api.server import create_app
+from voxengine.core import logging as vlog
+from voxengine.core.workers import WorkerPool
+
+
+class SlowStream(io.StringIO):
+    """A log sink that takes ``delay_s`` per write, like a stalled terminal or collector."""
+
+    def __init__(self, delay_s: float = 0.0) -> None:
+        super().__init__()
+        self.delay_s = delay_s
+
+    def write(self, s: str) -> int:
+        time.sleep(self.delay_s)
+        return super().write(s)
+
+
+@pytest.fixture
+def configure():
+    def _configure(stream, **kwargs):
+        vlog.configure_logging(stream=stream, force=True, **kwargs)
+        return logging.getLogger("voxengine.test")
+
+    yield _configure
+    vlog.shutdown_logging()
+
+
+def _lines(stream) -> list:
+    vlog.shutdown_logging()  # drains the queue
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_json_lines_carry_request_and_job_ids(configure):
+    stream = io.StringIO()
+    log = configure(stream, fmt="json")
+    done = threading.Event()
+    pool = WorkerPool(1)
+    with vlog.log_context(request_id="req-1"):
+        log.info("speaking %d chars", 5)
+        with vlog.log_context(job_id="job-9"):
+            pool.submit(lambda: (log.info("in the background"), done.set()))
+    done.wait(5)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        log.exception("failed")
+
+    first, background, failed = _lines(stream)
+    assert first["message"] == "speaking 5 chars" and first["request_id"] == "req-1"
+    assert "job_id" not in first
+    assert background["request_id"] == "req-1" and background["job_id"] == "job-9"
+    assert failed["level"] == "ERROR" and "request_id" not in failed
+    assert failed["message"] == "failed" and "ValueError: boom" in failed["exc_info"]
+
+
+def test_repeated_warnings_are_rate_limited(configure):
+    stream = io.StringIO()
+    log = configure(stream, fmt="json", rate_limit_s=0.2)
+    for _ in range(5):
+        log.warning("backend %s is slow", "piper-0")
+    log.warning("backend %s is slow", "piper-1")  # same template, different message
+    log.info("info is never limited")
+    log.info("info is never limited")
+    log.error("errors are never limited")
+    log.error("errors are never limited")
+    time.sleep(0.25)
+    log.warning("backend %s is slow", "piper-0")
+
+    messages = [(line["message"], line.get("suppressed")) for line in _lines(stream)]
+    assert messages == [
+        ("backend piper-0 is slow", None),
+        ("backend piper-1 is slow", None),
+        ("info is never limited", None),
+        ("info is never limited", None),
+        ("errors are never limited", None),
+        ("errors are never limited", None),
+        ("backend piper-0 is slow", 4),
+    ]
+
+
+def test_slow_sink_does_not_block_the_logging_thread(monkeypatch, configure):
+    monkeypatch.setenv("VOXENGINE_LOG_QUEUE", "5")
+    log = configure(SlowStream(delay_s=0.05), rate_limit_s=0)
+    start = time.perf_counter()
+    for n in range(50):
+        log.warning("line %d", n)
+    assert time.perf_counter() - start < 0.05 * 5  # far less than writing even 5 records
+    stats = vlog.logging_stats()
+    assert stats["dropped"] >= 40
+
+
+def test_http_requests_get_an_id(reset_engine):
+    client = TestClient(create_app())
+    assert len(client.get("/health").headers["x-request-id"]) == 16
+    echoed = client.get("/health", headers={"X-Request-ID": "editor-42"})
+    assert echoed.headers["x-request-id"] == "editor-42"
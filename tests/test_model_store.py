@@ -0,0 +1,78 @@
+import os
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from voxengine.cli import app
+from voxengine.core import model_store
+from voxengine.core.engine import Engine, EngineConfig
+from voxengine.core.errors import UserConfigError
+from voxengine.core.model_store import ModelStore, hash_file
+from voxengine.core.registry import AdapterRegistry
+
+
+def _model(path: Path, data: bytes) -> Path:
+    path.write_bytes(data)
+    return path
+
+
+def test_same_content_under_two_names_is_stored_once(tmp_path: Path):
+    store = ModelStore(tmp_path / "models")
+    src = _model(tmp_path / "voice.onnx", b"weights")
+    _model(tmp_path / "voice.onnx.json", b"{}")
+
+    first = store.add(src)
+    second = store.add(src, name="alias")
+    assert first.digest == second.digest == hash_file(src)
+    assert second.method == "existing"
+    assert (tmp_path / "models" / "alias.onnx").read_bytes() == b"weights"
+    assert (tmp_path / "models" / "voice.onnx.json").read_bytes() == b"{}"
+    assert len(list(store._blobs())) == 2  # model + its config
+
+    assert store.add(src).method == "existing"  # re-import is a no-op
+    with pytest.raises(UserConfigError, match="already exists"):
+        store.add(_model(tmp_path / "other.onnx", b"different"), name="voice")
+
+
+def test_import_falls_back_from_reflink_to_hardlink_to_copy(monkeypatch, tmp_path: Path):
+    monkeypatch.setattr(model_store, "_reflink", lambda src, dst: False)
+    store = ModelStore(tmp_path / "models")
+    src = _model(tmp_path / "a.onnx", b"a" * 1000)
+    entry = store.add(src)
+    assert entry.method == "hardlink"
+    assert os.stat(store.blob_path(entry.digest)).st_ino == os.stat(src).st_ino
+
+    copied = store.add(_model(tmp_path / "b.onnx", b"b" * 1000), link=False)
+    assert copied.method == "copy"
+
+
+def test_verify_and_gc(tmp_path: Path):
+    store = ModelStore(tmp_path / "models")
+    a = store.add(_model(tmp_path / "a.onnx", b"aaaa"), link=False)
+    b = store.add(_model(tmp_path / "b.onnx", b"bbbb"), link=False)
+    assert store.verify() == []
+
+    store.blob_path(a.digest).write_bytes(b"tampered")
+    assert [item["expected"] for item in store.verify()] == [a.digest]
+
+    (tmp_path / "models" / "b.onnx").unlink()
+    assert store.gc(dry_run=True) == {"removed": 1, "freed_bytes": 4}
+    assert store.blob_path(b.digest).exists()
+    assert store.gc()["removed"] == 1
+    assert not store.blob_path(b.digest).exists()
+    assert store.blob_path(a.digest).exists()
+
+
+def test_engine_discovers_aliases_and_cli_gc(tmp_path: Path, reset_engine):
+    cfg = EngineConfig(cache_dir=tmp_path / "cache", models_dir=tmp_path / "models")
+    eng = Engine(cfg=cfg, registry=AdapterRegistry.default())
+    paths = [_model(tmp_path / f"{n}.onnx", n.encode()) for n in ("x", "y")]
+    entries = eng.add_models(paths)
+    assert [e.name for e in entries] == ["x.onnx", "y.onnx"]
+    assert [m["name"] for m in eng.discover_models()] == ["x", "y"]
+
+    (tmp_path / "models" / "x.onnx").unlink()
+    result = CliRunner().invoke(app, ["models", "gc"])
+    assert result.exit_code == 0, result.output
+    assert "Removed 1 blobs" in result.output
@@ -0,0 +1,46 @@
+import wave
+from pathlib import Path
+
+from voxengine.core.engine import Engine, EngineConfig
+from voxengine.core.phrasebook import PhrasebookWriter, normalize_phrase
+from voxengine.core.registry import AdapterRegistry
+
+
+def _clip(path: Path, frames: int, value: int) -> Path:
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(1000)
+        w.writeframes(value.to_bytes(2, "little", signed=True) * frames)
+    return path
+
+
+def test_phrasebook_serves_exact_and_concatenated_phrases(tmp_path: Path):
+    writer = PhrasebookWriter(tmp_path / "book", join_ms=2)
+    writer.add("Button", _clip(tmp_path / "a.wav", 3, 1))
+    writer.add("check box", _clip(tmp_path / "b.wav", 4, 2))
+    writer.add("checked", _clip(tmp_path / "c.wav", 2, 3))
+    book = writer.commit()
+
+    assert normalize_phrase("  Check   BOX, ") == "check box"
+    assert book.lookup("button") == b"\x01\x00" * 3
+    assert book.lookup("Check box checked!") == b"\x02\x00" * 4 + b"\x00\x00" * 2 + b"\x03\x00" * 2
+    assert book.lookup("check button") is None
+
+
+def test_screenreader_speak_uses_phrasebook(tmp_path: Path):
+    cfg = EngineConfig(cache_dir=tmp_path / "cache", models_dir=tmp_path / "models")
+    eng = Engine(cfg=cfg, registry=AdapterRegistry.default())
+    built = eng.build_phrasebook(["link", "heading level", "two"], backend="beep")
+    assert built["phrases"] == 3
+
+    def speak(text: str, profile: str = "screenreader"):
+        return eng.tts_speak(text, backend="beep", profile=profile, out_path=tmp_path / "o.wav")
+
+    hit = speak("Heading level two")
+    assert hit["source"] == "phrasebook"
+    with wave.open(hit["audio_path"], "rb") as w:
+        assert w.getnframes() > 0
+
+    assert speak("Heading level three")["source"] == "synthesis"
+    assert speak("link", profile="narration")["source"] == "synthesis"
@@ -0,0 +1,125 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from benchmarks.policy_bench import bench
+from voxengine.core.engine import Engine, EngineConfig
+from voxengine.core.errors import UserConfigError
+from voxengine.core.registry import AdapterRegistry
+from voxengine.ethics import watch
+from voxengine.ethics.attest import is_attested, set_attested
+from voxengine.ethics.matcher import PhraseMatcher
+from voxengine.ethics.policy import Attestation, EthicsPolicy
+from voxengine.project.cast import CastManager
+
+
+def test_matcher_finds_whole_word_phrases_in_one_pass():
+    matcher = PhraseMatcher(["he", "she", "his", "hers", "Kill  him"])
+    assert matcher.find("Ushers") is None  # only inside words
+    assert matcher.find("is it hers?") == "hers"
+    assert matcher.find("and she said") == "she"
+    assert matcher.find("I will KILL\n him") == "kill him"
+    assert matcher.find("a skill hint") is None
+    assert PhraseMatcher(["he"], whole_words=False).find("Ushers") == "he"
+    assert PhraseMatcher([]).find("anything") is None
+
+
+def _policy_file(tmp_path: Path, **rules) -> Path:
+    path = tmp_path / "policy.json"
+    path.write_text(json.dumps(rules))
+    return path
+
+
+def test_engine_blocks_phrases_from_the_policy_file(tmp_path: Path):
+    policy = _policy_file(tmp_path, blocked_phrases=["forbidden words"])
+    cfg = EngineConfig(
+        cache_dir=tmp_path / "cache", models_dir=tmp_path / "models", policy_path=policy
+    )
+    eng = Engine(cfg=cfg, registry=AdapterRegistry.default())
+    with pytest.raises(UserConfigError, match="blocked phrase 'forbidden words'"):
+        eng.tts_speak(text="Say the Forbidden words.", backend="beep")
+    eng.tts_speak(text="Say something else.", backend="beep")
+    assert eng.doctor()["policy"]["blocked_phrases"] == 1
+
+
+def test_clone_voices_need_attestation_and_consent(tmp_path: Path):
+    project = tmp_path / "project"
+    attestation = tmp_path / "attestation.json"
+    policy = EthicsPolicy.load(
+        _policy_file(
+            tmp_path,
+            clone_backends=["clone"],
+            attestation_file="attestation.json",
+            consent_projects=["project"],
+        ),
+        recheck_s=0,
+    )
+    assert policy.check_tts("hi", "beep", "anyone", None).allowed
+    assert "attestation" in policy.check_tts("hi", "clone", "alice", None).reason
+
+    set_attested(attestation)
+    assert "no consent" in policy.check_tts("hi", "clone", "alice", None).reason
+    assert policy.check_tts("hi", "clone", "me", Attestation(is_self_voice=True)).allowed
+
+    CastManager().register_voice(str(project), "alice", "ref.wav", consent={"signed": True})
+    assert policy.check_tts("hi", "clone", "alice", None).allowed
+
+    set_attested(attestation, False)
+    assert not policy.check_tts("hi", "clone", "alice", None).allowed
+
+
+def test_bad_consent_or_attestation_file_only_affects_clone_voices(tmp_path: Path):
+    project = tmp_path / "project"
+    attestation = tmp_path / "attestation.json"
+    policy = EthicsPolicy.load(
+        _policy_file(
+            tmp_path,
+            clone_backends=["clone"],
+            attestation_file="attestation.json",
+            consent_projects=["project"],
+        ),
+        recheck_s=0,
+    )
+    set_attested(attestation)
+    CastManager().register_voice(str(project), "alice", "ref.wav", consent={"signed": True})
+    assert policy.check_tts("hi", "clone", "alice", None).allowed
+
+    bob = project / "cast" / "bob" / "consent.json"
+    bob.parent.mkdir()
+    bob.write_text('{"actor_name": "bob", ')
+    assert policy.check_tts("hi", "beep", "anyone", None).allowed
+    assert policy.check_tts("hi", "clone", "alice", None).allowed
+    assert not policy.check_tts("hi", "clone", "bob", None).allowed
+
+    # A record caught mid-write keeps what it granted before.
+    alice = project / "cast" / "alice" / "consent.json"
+    alice.write_text(alice.read_text()[:-5])
+    assert policy.check_tts("hi", "clone", "alice", None).allowed
+
+    attestation.write_text("{")
+    assert policy.check_tts("hi", "beep", "anyone", None).allowed
+    assert "disabled" in policy.check_tts("hi", "clone", "alice", None).reason
+    assert not is_attested(attestation)
+
+
+def test_files_are_reparsed_only_after_they_change(monkeypatch, tmp_path: Path):
+    path = tmp_path / "attestation.json"
+    path.write_text("{}")
+    reads = []
+    read_json = watch._read_json
+    monkeypatch.setattr(watch, "_read_json", lambda p: reads.append(p) or read_json(p))
+
+    assert not is_attested(path)
+    assert not is_attested(path)
+    assert len(reads) == 1
+    set_attested(path)
+    assert is_attested(path) and is_attested(path)
+    assert len(reads) == 2
+
+
+def test_policy_bench_stays_flat_as_rules_grow():
+    small, large = bench(10, checks=50), bench(2000, checks=50)
+    assert large.memo_us < 100
+    # The compiled matcher scans each text once however many phrases there are.
+    assert large.miss_us < max(5 * small.miss_us, 200)
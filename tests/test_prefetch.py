@@ -0,0 +1,129 @@
+import json
+import threading
+import time
+from pathlib import Path
+
+from voxengine.core.engine import Engine, EngineConfig
+from voxengine.core.prefetch import LookaheadPrefetcher
+from voxengine.core.registry import AdapterRegistry
+from voxengine.core.tts_service import VoiceSpec
+from voxengine.core.workers import WorkerPool
+
+BEEP = {"backend": "beep", "lookahead": 2}
+
+
+def _until(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+class FakeTTS:
+    """Writes a stub render after ``delay_s``, or waits for cancellation when ``block``."""
+
+    def __init__(self, delay_s: float = 0.0, block: bool = False) -> None:
+        self.delay_s = delay_s
+        self.block = block
+
+    def speak_line(self, text, out_path, voice, profile=None, out_format="wav", cancel=None):
+        if self.block:
+            cancel.wait(5)
+        time.sleep(self.delay_s)
+        cancel.raise_if_cancelled()
+        out_path.write_bytes(b"RIFF")
+        out_path.with_suffix(".json").write_text(json.dumps({"duration_s": 0.5}))
+        return {"audio_path": str(out_path)}
+
+
+def test_preview_playback_is_served_from_lookahead(tmp_path: Path, make_project, wait_for):
+    cfg = EngineConfig(
+        cache_dir=tmp_path / "cache", models_dir=tmp_path / "models", lookahead_cpu_share=1.0
+    )
+    eng = Engine(cfg=cfg, registry=AdapterRegistry.default())
+    project = make_project(lines=4)
+
+    def play(index):
+        job_id = eng.render.rerender_line_async(str(project), "scene01", index, {}, BEEP)
+        job = wait_for(eng.queue, job_id)
+        assert job.status == "done"
+        return job
+
+    play(1)
+    _until(lambda: eng.prefetch.snapshot()["pending"].get("ready") == 2)
+    job = play(2)
+    sidecar = json.loads(Path(job.artifacts["line"]).with_suffix(".json").read_text())
+    assert sidecar["audio_path"] == job.artifacts["line"]
+    assert sidecar["text"] == "Line number 1."
+    play(3)
+
+    stats = eng.prefetch.snapshot()
+    assert stats["counts"]["misses"] == 1  # only the first line is synthesized on demand
+    assert stats["counts"]["hits"] + stats["counts"]["joined"] == 2
+    assert stats["hit_rate"] == round(2 / 3, 3)
+    lines = eng.projects.renders(str(project)).lines(scene_id="scene01")
+    assert [line["index"] for line in lines] == [1, 2, 3]
+
+
+def test_jumping_elsewhere_cancels_speculation(tmp_path: Path):
+    prefetch = LookaheadPrefetcher(FakeTTS(block=True), tmp_path, WorkerPool(2), cpu_share=1.0)
+    prefetch.cores = 2
+    voice = VoiceSpec("beep")
+    prefetch.ahead("project", "scene01", [(2, "two", voice), (3, "three", voice)], {})
+    _until(lambda: prefetch.snapshot()["pending"].get("running") == 2)
+
+    prefetch.seek("project", "scene01", 2, {"lookahead": 2})  # still inside the window
+    assert prefetch.snapshot()["counts"]["cancelled"] == 0
+    prefetch.seek("project", "scene07", 1, {})
+    _until(lambda: prefetch.snapshot()["counts"]["cancelled"] == 2)
+    assert prefetch.claim("two", voice, {}, tmp_path / "out" / "line_002.wav") is None
+    assert list(tmp_path.glob("*.wav")) == []
+
+
+def test_speculation_waits_while_over_its_cpu_share(tmp_path: Path):
+    prefetch = LookaheadPrefetcher(
+        FakeTTS(delay_s=0.2), tmp_path, WorkerPool(1), cpu_share=0.1, window_s=0.5
+    )
+    prefetch.cores = 1
+    voice = VoiceSpec("beep")
+    start = time.monotonic()
+    prefetch.ahead("project", "scene01", [(2, "two", voice), (3, "three", voice)], {})
+    _until(lambda: prefetch.snapshot()["pending"].get("ready") == 2)
+
+    assert prefetch.snapshot()["counts"]["throttled"] == 1
+    assert time.monotonic() - start > 0.6  # the second render waited for the window to drain
+    out = prefetch.claim("three", voice, {}, tmp_path / "renders" / "line_003.wav")
+    assert out is not None and Path(out["audio_path"]).read_bytes() == b"RIFF"
+    assert out["duration_s"] == 0.5
+
+
+def test_running_speculation_counts_against_the_cpu_share(tmp_path: Path):
+    pool = WorkerPool(2)
+    prefetch = LookaheadPrefetcher(FakeTTS(block=True), tmp_path, pool, cpu_share=0.5)
+    prefetch.cores = 2
+    voice = VoiceSpec("beep")
+    upcoming = [(2, "two", voice), (3, "three", voice), (4, "four", voice)]
+    prefetch.ahead("project", "scene01", upcoming, {})
+    _until(lambda: prefetch.snapshot()["counts"]["throttled"] == 2)
+
+    time.sleep(0.1)
+    stats = prefetch.snapshot()
+    assert stats["pending"] == {"running": 1, "queued": 2}  # 0.5 of 2 cores is one render
+    assert stats["current_share"] > 0  # before anything has finished
+    # Throttled speculation does not sit on a worker thread: other work still gets one.
+    other = threading.Event()
+    pool.submit(other.set)
+    assert other.wait(1)
+    prefetch.seek("project", "scene07", 1, {})
+    _until(lambda: prefetch.snapshot()["counts"]["cancelled"] == 3)
+
+
+def test_failed_speculation_releases_its_running_slot(tmp_path: Path):
+    (tmp_path / "not-a-dir").write_text("")
+    prefetch = LookaheadPrefetcher(
+        FakeTTS(), tmp_path / "not-a-dir" / "lookahead", WorkerPool(1), cpu_share=1.0
+    )
+    voice = VoiceSpec("beep")
+    prefetch.ahead("project", "scene01", [(2, "two", voice)], {})
+    _until(lambda: prefetch.snapshot()["counts"]["failed"] == 1)
+    assert prefetch._running == {}
@@ -0,0 +1,70 @@
+import os
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from voxengine.api.server import create_app
+from voxengine.core.engine import Engine, EngineConfig
+from voxengine.core.registry import AdapterRegistry
+from voxengine.project.renders import RenderIndex, text_hash
+
+BEEP = {"backend": "beep"}
+
+
+def test_refresh_reads_headers_and_tracks_changes(tmp_path: Path, write_wav):
+    scene = tmp_path / "renders" / "s1"
+    scene.mkdir(parents=True)
+    write_wav(scene / "line_001.wav", 8000, 1)
+    write_wav(scene / "line_002.wav", 2000, 1)
+    (scene / "master.wav").write_bytes(b"")
+
+    index = RenderIndex(tmp_path)
+    assert index.total_ms() == 1250
+    assert index.scenes() == [{"scene_id": "s1", "lines": 2, "duration_ms": 1250}]
+    assert [r["index"] for r in index.lines(min_ms=500)] == [1]
+    assert index.refresh() == {"indexed": 0, "unchanged": 2, "removed": 0}
+
+    write_wav(scene / "line_002.wav", 4000, 1)
+    os.utime(scene / "line_002.wav", ns=(1, 1))
+    (scene / "line_001.wav").unlink()
+    assert index.refresh() == {"indexed": 1, "unchanged": 0, "removed": 1}
+    (line,) = index.lines()
+    assert line["duration_ms"] == 500
+    assert line["path"] == str(scene / "line_002.wav")
+
+
+def test_scene_render_keeps_index_current(tmp_path: Path, make_project, wait_for):
+    cfg = EngineConfig(cache_dir=tmp_path / "cache", models_dir=tmp_path / "models")
+    eng = Engine(cfg=cfg, registry=AdapterRegistry.default())
+    project = make_project()
+
+    job = wait_for(eng.queue, eng.render.render_scene_async(str(project), "scene01", {}, BEEP))
+    assert job.status == "done"
+
+    index = eng.projects.renders(str(project))
+    lines = index.lines(scene_id="scene01")
+    assert [line["index"] for line in lines] == [1, 2, 3]
+    assert {line["duration_ms"] for line in lines} == {500}
+    assert lines[0]["text_hash"] == text_hash("Line number 0.")
+    assert index.total_ms() == 1500
+
+
+def test_api_timeline(tmp_path: Path, make_project, write_wav, reset_engine):
+    client = TestClient(create_app())
+    project = make_project()
+    write_wav(project / "renders" / "line_probe.wav", 10, 0)  # not inside a scene: ignored
+    scene = project / "renders" / "scene01"
+    scene.mkdir()
+    write_wav(scene / "line_001.wav", 16000, 1)
+
+    resp = client.get("/v1/projects/timeline", params={"project_path": str(project)})
+    assert resp.json() == {
+        "total_ms": 2000,
+        "scenes": [{"scene_id": "scene01", "lines": 1, "duration_ms": 2000}],
+    }
+    resp = client.get(
+        "/v1/projects/timeline/lines", params={"project_path": str(project), "min_ms": 2000}
+    )
+    assert resp.json() == {"lines": []}
+    missing = client.get("/v1/projects/timeline", params={"project_path": str(tmp_path / "nope")})
+    assert missing.status_code == 404
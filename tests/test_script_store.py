@@ -0,0 +1,38 @@
+import json
+import os
+
+from voxengine.project.format import ProjectManager
+
+
+def test_script_store_loads_lazily_and_exports_edits(make_project):
+    project = make_project(lines=4)
+    pm = ProjectManager()
+
+    assert pm.load_line(str(project), "scene01", 3)["text"] == "Line number 2."
+    store = pm.script(str(project))
+    assert (project / "script" / "scenes.db").exists()
+    assert store.line_count("scene01") == 4
+
+    store.update_line("scene01", 2, {"character": "B", "text": "Edited."})
+    store.put_scene({"id": "scene02", "title": "Two", "lines": [{"text": "Hi."}]})
+    assert store.scene_ids() == ["scene01", "scene02"]
+    assert pm.load_scene(str(project), "scene01")["lines"][1]["text"] == "Edited."
+
+    store.export()
+    doc = json.loads((project / "script" / "scenes.json").read_text())
+    assert [s["id"] for s in doc["scenes"]] == ["scene01", "scene02"]
+    assert doc["scenes"][0]["lines"][1]["text"] == "Edited."
+    assert doc["scenes"][0]["title"] == "Test"
+
+
+def test_script_store_reimports_when_json_changes(make_project):
+    project = make_project(lines=2)
+    pm = ProjectManager()
+    assert len(pm.load_scene(str(project), "scene01")["lines"]) == 2
+
+    path = project / "script" / "scenes.json"
+    path.write_text(json.dumps({"scenes": [{"id": "intro", "lines": []}]}))
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert [s["id"] for s in pm.load_scenes(str(project))] == ["intro"]
@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from typer.testing import CliRunner
+
+from voxengine.api.server import create_app
+from voxengine.cli import app
+from voxengine.core.timing import collect, reset_stats, span, stage_stats
+
+
+def test_spans_accumulate_per_request_and_globally():
+    reset_stats()
+    with collect() as timings:
+        with span("a"):
+            pass
+        with collect() as inner:
+            with span("a"):
+                pass
+    with span("b"):
+        pass
+
+    assert inner is timings
+    assert set(timings.as_dict()) == {"a", "total"}
+    assert stage_stats()["a"]["count"] == 2
+    assert stage_stats()["b"]["count"] == 1
+    assert "a;dur=" in timings.server_timing()
+
+
+def test_api_speak_reports_server_timing_and_profiles(reset_engine):
+    client = TestClient(create_app(profiling=True))
+
+    resp = client.post(
+        "/v1/tts/speak",
+        json={"text": "hi", "backend": "beep"},
+        headers={"X-VoxEngine-Profile": "1"},
+    )
+    assert resp.status_code == 200
+    stages = resp.json()["timings_ms"]
+    assert {"policy", "synthesize_beep", "metadata", "total"} <= set(stages)
+    assert "synthesize_beep;dur=" in resp.headers["Server-Timing"]
+    assert Path(resp.headers["X-VoxEngine-Profile"]).stat().st_size > 0
+    assert client.get("/v1/timings").json()["stages"]["policy"]["count"] >= 1
+
+
+def test_cli_speak_profile_out(tmp_path: Path, reset_engine):
+    prof = tmp_path / "speak.prof"
+    result = CliRunner().invoke(
+        app,
+        [
+            "tts", "speak", "hi", "--backend", "beep", "--out", str(tmp_path / "o.wav"),
+            "--profile-out", str(prof), "--timings",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert prof.stat().st_size > 0
+    assert "synthesize_beep" in result.output
@@ -1,15 +1,18 @@
 import json
+import time
+import wave
 from pathlib import Path
 
 from fastapi.testclient import TestClient
 import pytest
 from typer.testing import CliRunner
 
+from voxengine.adapters.tts.beep import BeepTTSAdapter
 from voxengine.api.server import create_app
 from voxengine.cli import app
 from voxengine.core.engine import Engine, EngineConfig
 from voxengine.core.registry import AdapterRegistry
-from voxengine.core.errors import UserConfigError
+from voxengine.core.errors import MissingDependencyError, UserConfigError
 import voxengine.core.engine as engine_mod
 
 
@@ -107,3 +110,116 @@ def test_api_speak_beep_writes_files(monkeypatch, tmp_path: Path):
     assert meta_path.exists()
     assert data["profile"] == "dialogue"
     assert data["download_url"].endswith(audio_path.name)
+
+
+def test_preview_tier_promoted_by_final_render(tmp_path: Path, wait_for):
+    cfg = EngineConfig(cache_dir=tmp_path / "cache", models_dir=tmp_path / "models")
+    reg = AdapterRegistry(
+        tts={"beep": BeepTTSAdapter(), "beep_hq": BeepTTSAdapter(sample_rate=22050)}
+    )
+    eng = Engine(cfg=cfg, registry=reg)
+
+    result = eng.tts_speak(
+        text="hello", backend="beep", out_path=tmp_path / "line.wav", final_backend="beep_hq"
+    )
+    assert result["tier"] == "preview"
+    assert result["sample_rate"] == 16000
+
+    job = wait_for(eng.queue, result["final_job_id"])
+    assert job.status == "done"
+    assert job.artifacts["tier"] == "final"
+
+    with wave.open(result["audio_path"]) as wav:
+        assert wav.getframerate() == 22050
+    metadata = json.loads(Path(result["meta_path"]).read_text())
+    assert metadata["tier"] == "final"
+    assert metadata["audio_path"] == result["audio_path"]
+    assert sorted(p.name for p in tmp_path.iterdir() if p.is_file()) == ["line.json", "line.wav"]
+
+
+def test_final_tier_failure_keeps_preview(tmp_path: Path, monkeypatch, wait_for):
+    monkeypatch.setenv("PATH", str(tmp_path))
+    cfg = EngineConfig(cache_dir=tmp_path / "cache", models_dir=tmp_path / "models")
+    eng = Engine(cfg=cfg, registry=AdapterRegistry.default())
+
+    result = eng.tts_speak(
+        text="hello", backend="beep", out_path=tmp_path / "line.wav", final_backend="piper"
+    )
+    job = wait_for(eng.queue, result["final_job_id"])
+    assert job.status == "error"
+    metadata = json.loads(Path(result["meta_path"]).read_text())
+    assert metadata["tier"] == "preview"
+
+
+class _CountingAdapter(BeepTTSAdapter):
+    def __init__(self):
+        super().__init__()
+        self.about_calls = 0
+
+    def about(self) -> dict:
+        self.about_calls += 1
+        return super().about()
+
+
+def test_backend_probe_is_cached(tmp_path: Path):
+    cfg = EngineConfig(cache_dir=tmp_path / "cache", models_dir=tmp_path / "models")
+    adapter = _CountingAdapter()
+    eng = Engine(cfg=cfg, registry=AdapterRegistry(tts={"beep": adapter}))
+
+    for _ in range(5):
+        eng.doctor()
+        eng.list_backends()
+    assert adapter.about_calls == 1
+
+    eng.refresh_probes()
+    assert adapter.about_calls == 2
+
+
+def test_add_model_invalidates_model_scan(tmp_path: Path):
+    cfg = EngineConfig(cache_dir=tmp_path / "cache", models_dir=tmp_path / "models")
+    eng = Engine(cfg=cfg, registry=AdapterRegistry.default())
+    assert eng.discover_models() == []
+
+    src = tmp_path / "voice.onnx"
+    src.write_bytes(b"onnx")
+    eng.add_model(src)
+    assert [m["name"] for m in eng.discover_models()] == ["voice"]
+    assert [m["name"] for m in eng.doctor()["models"]] == ["voice"]
+
+
+def test_model_selection_sees_models_changed_by_other_processes(tmp_path: Path):
+    cfg = EngineConfig(
+        cache_dir=tmp_path / "cache", models_dir=tmp_path / "models", probe_ttl_s=3600
+    )
+    eng = Engine(cfg=cfg, registry=AdapterRegistry.default())
+    assert eng.doctor()["models"] == []
+
+    (cfg.models_dir / "late.onnx").write_bytes(b"onnx")
+    assert eng._select_piper_model() == cfg.models_dir / "late.onnx"
+    (cfg.models_dir / "late.onnx").unlink()
+    with pytest.raises(MissingDependencyError):
+        eng._select_piper_model()
+
+
+def test_warmup_reports_readiness(tmp_path: Path):
+    cfg = EngineConfig(cache_dir=tmp_path / "cache", models_dir=tmp_path / "models")
+    eng = Engine(cfg=cfg, registry=AdapterRegistry(tts={"beep": BeepTTSAdapter()}))
+
+    state = eng.warmup()
+    assert state["ready"] is True
+    assert state["warmed"] is True
+    assert [c["backend"] for c in state["checks"]] == ["beep"]
+    assert not any((tmp_path / "cache" / "warmup").iterdir())
+
+
+def test_ready_endpoint_after_warmup(monkeypatch, tmp_path: Path):
+    _reset_engine(monkeypatch, tmp_path)
+    with TestClient(create_app(warmup=True)) as client:
+        assert client.get("/health").status_code == 200
+        deadline = time.monotonic() + 5
+        resp = client.get("/ready")
+        while resp.status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.01)
+            resp = client.get("/ready")
+        assert resp.status_code == 200
+        assert resp.json()["warmed"] is True
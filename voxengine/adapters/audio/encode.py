@@ -0,0 +1,127 @@
+"""Encoder stage: stream WAV renders into compressed containers on a worker pool."""
+
+from __future__ import annotations
+
+import os
+import threading
+import wave
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+from voxengine.adapters.audio.formats import AudioFormat, require_encoder
+from voxengine.adapters.audio.resample import LinearResampler
+from voxengine.core.errors import UserConfigError
+
+BLOCK_FRAMES = 16384
+
+
+def output_rate(fmt: AudioFormat, rate: int) -> int:
+    """Sample rate :func:`encode_wav` produces for ``rate`` input in ``fmt``."""
+    if not fmt.sample_rates or rate in fmt.sample_rates:
+        return rate
+    higher = [r for r in fmt.sample_rates if r >= rate]
+    return min(higher) if higher else max(fmt.sample_rates)
+
+
+def encode_wav(src: Path, dest: Path, fmt: AudioFormat, block_frames: int = BLOCK_FRAMES) -> int:
+    """Encode a 16-bit WAV file into ``fmt`` block by block and return the output sample rate.
+
+    Memory use is bounded by ``block_frames`` regardless of the input length. ``dest`` only
+    appears once encoding has finished.
+    """
+    require_encoder(fmt)
+    import soundfile as sf
+
+    tmp = dest.with_name(f".{dest.name}.part")
+    with wave.open(str(src), "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise UserConfigError(f"Encoder expects 16-bit PCM input: {src}")
+        channels = wav.getnchannels()
+        rate = wav.getframerate()
+        out_rate = output_rate(fmt, rate)
+        resampler = LinearResampler(rate, out_rate, channels) if out_rate != rate else None
+        try:
+            with sf.SoundFile(
+                str(tmp),
+                "w",
+                samplerate=out_rate,
+                channels=channels,
+                format=fmt.sf_format,
+                subtype=fmt.sf_subtype,
+            ) as out:
+                while True:
+                    block = wav.readframes(block_frames)
+                    if not block:
+                        break
+                    if resampler is not None:
+                        block = resampler.process(block)
+                    if block:
+                        out.buffer_write(block, dtype="int16")
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+    os.replace(tmp, dest)
+    return out_rate
+
+
+class EncoderPool:
+    """Bounded pool that runs :func:`encode_wav` off the synthesis path.
+
+    libsndfile releases the GIL while encoding, so a few threads keep up with several
+    synthesis workers. Encodes are tracked by destination until they finish, so a reader
+    that gets a path before its file exists can :meth:`wait` for it.
+    """
+
+    def __init__(self, max_workers: int = 2) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending: Dict[str, "Future[int]"] = {}
+
+    def submit(
+        self, src: Path, dest: Path, fmt: AudioFormat, remove_source: bool = True
+    ) -> "Future[int]":
+        """Queue an encode; the future resolves to the output sample rate."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="voxengine-encoder"
+            )
+        future = self._executor.submit(self._encode, src, dest, fmt, remove_source)
+        key = str(Path(dest).resolve())
+        with self._lock:
+            self._pending[key] = future
+        future.add_done_callback(lambda f: self._forget(key, f))
+        return future
+
+    def pending(self, dest: str | Path) -> Optional["Future[int]"]:
+        """The unfinished encode writing ``dest``, if there is one."""
+        with self._lock:
+            return self._pending.get(str(Path(dest).resolve()))
+
+    def wait(self, dest: str | Path, timeout: Optional[float] = None) -> None:
+        """Block until a pending encode of ``dest`` is done; errors are left to its owner."""
+        future = self.pending(dest)
+        if future is not None:
+            try:
+                future.result(timeout)
+            except Exception:  # noqa: BLE001
+                pass
+
+    def _forget(self, key: str, future: "Future[int]") -> None:
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    @staticmethod
+    def _encode(src: Path, dest: Path, fmt: AudioFormat, remove_source: bool) -> int:
+        try:
+            return encode_wav(src, dest, fmt)
+        finally:
+            if remove_source:
+                src.unlink(missing_ok=True)
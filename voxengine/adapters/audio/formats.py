@@ -0,0 +1,99 @@
+"""Output audio formats shared by adapters, the engine and the HTTP API.
+
+Adapters always synthesize WAV. Every other format is produced by the encoder stage in
+:mod:`voxengine.adapters.audio.encode`, which needs the optional ``audio`` extra.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from voxengine.core.errors import MissingDependencyError, UserConfigError
+
+NATIVE_FORMAT = "wav"
+
+
+@dataclass(frozen=True)
+class AudioFormat:
+    """An output container/codec pair."""
+
+    name: str
+    suffix: str
+    media_type: str
+    sf_format: Optional[str] = None
+    sf_subtype: Optional[str] = None
+    sample_rates: Optional[Tuple[int, ...]] = None
+
+    @property
+    def needs_encoder(self) -> bool:
+        return self.sf_format is not None
+
+
+FORMATS: Dict[str, AudioFormat] = {
+    "wav": AudioFormat("wav", ".wav", "audio/wav"),
+    "flac": AudioFormat("flac", ".flac", "audio/flac", "FLAC", "PCM_16"),
+    "ogg": AudioFormat("ogg", ".ogg", "audio/ogg", "OGG", "VORBIS"),
+    # Opus only runs at these rates; the encoder resamples anything else.
+    "opus": AudioFormat(
+        "opus", ".opus", "audio/ogg", "OGG", "OPUS", (8000, 12000, 16000, 24000, 48000)
+    ),
+}
+
+
+def get_format(name: str) -> AudioFormat:
+    """Return the format called ``name`` (case-insensitive) or raise ``UserConfigError``."""
+    fmt = FORMATS.get(name.lower())
+    if fmt is None:
+        allowed = ", ".join(sorted(FORMATS))
+        raise UserConfigError(f"Unsupported audio format '{name}'. Supported: {allowed}.")
+    return fmt
+
+
+def format_for_path(path: str | Path) -> AudioFormat:
+    """Guess the format of an existing file from its suffix (defaults to WAV)."""
+    suffix = Path(path).suffix.lower()
+    for fmt in FORMATS.values():
+        if fmt.suffix == suffix:
+            return fmt
+    return FORMATS[NATIVE_FORMAT]
+
+
+def encoder_available() -> bool:
+    return importlib.util.find_spec("soundfile") is not None
+
+
+def require_encoder(fmt: AudioFormat) -> None:
+    """Fail early when ``fmt`` needs the optional encoder and it is not installed."""
+    if fmt.needs_encoder and not encoder_available():
+        raise MissingDependencyError(
+            f"Output format '{fmt.name}' needs the optional encoder. "
+            "Install it with: pip install 'voxengine[audio]'"
+        )
+
+
+def ensure_adapter_format(
+    out_format: str, backend: str, supported: Sequence[str] = (NATIVE_FORMAT,)
+) -> None:
+    """Check that an adapter can write ``out_format`` itself."""
+    fmt = get_format(out_format)
+    if fmt.name not in supported:
+        allowed = ", ".join(supported)
+        raise UserConfigError(
+            f"{backend} backend only writes {allowed}; the engine encodes other formats."
+        )
+
+
+def list_formats() -> List[dict]:
+    """Describe every output format and whether it can be produced right now."""
+    has_encoder = encoder_available()
+    return [
+        {
+            "name": fmt.name,
+            "media_type": fmt.media_type,
+            "available": has_encoder or not fmt.needs_encoder,
+        }
+        for fmt in FORMATS.values()
+    ]
@@ -1 +1,61 @@
-"""Resampling helpers (placeholder)."""
+"""Resampling helpers."""
+
+from __future__ import annotations
+
+from voxengine.core.errors import MissingDependencyError
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError as exc:  # pragma: no cover - depends on optional extra
+        raise MissingDependencyError(
+            "Resampling needs numpy. Install it with: pip install 'voxengine[audio]'"
+        ) from exc
+    return np
+
+
+class LinearResampler:
+    """Streaming linear-interpolation resampler for interleaved 16-bit PCM.
+
+    Feed blocks of any size to :meth:`process`; the last input frame is carried over so block
+    boundaries do not click.
+    """
+
+    def __init__(self, src_rate: int, dst_rate: int, channels: int = 1) -> None:
+        self._np = _numpy()
+        self.src_rate = int(src_rate)
+        self.dst_rate = int(dst_rate)
+        self.channels = int(channels)
+        self._step = self.src_rate / self.dst_rate
+        self._pos = 0.0
+        self._carry = None
+
+    def process(self, pcm: bytes) -> bytes:
+        np = self._np
+        frames = np.frombuffer(pcm, dtype="<i2").reshape(-1, self.channels).astype(np.float32)
+        if self._carry is not None:
+            frames = np.concatenate([self._carry, frames])
+        n = frames.shape[0]
+        if n == 0:
+            return b""
+        if self._pos > n - 1:
+            self._carry = frames[-1:]
+            self._pos -= n - 1
+            return b""
+        count = int((n - 1 - self._pos) // self._step) + 1
+        positions = self._pos + self._step * np.arange(count)
+        left = np.floor(positions).astype(np.int64)
+        right = np.minimum(left + 1, n - 1)
+        frac = (positions - left)[:, None]
+        out = frames[left] * (1.0 - frac) + frames[right] * frac
+        self._pos = positions[-1] + self._step - (n - 1)
+        self._carry = frames[-1:]
+        return np.clip(np.rint(out), -32768, 32767).astype("<i2").tobytes()
+
+
+def resample_pcm16(pcm: bytes, src_rate: int, dst_rate: int, channels: int = 1) -> bytes:
+    """Resample a complete 16-bit PCM buffer in one call."""
+    if src_rate == dst_rate:
+        return pcm
+    return LinearResampler(src_rate, dst_rate, channels).process(pcm)
@@ -0,0 +1,93 @@
+"""Minimal RIFF/WAVE header reading and writing.
+
+Unlike :mod:`wave`, :func:`read_wav_info` reports where the PCM data starts so callers can
+memory-map it, and it never reads past the header.
+"""
+
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+
+from voxengine.core.errors import UserConfigError
+
+HEADER_SIZE = 44
+
+
+@dataclass(frozen=True)
+class WavInfo:
+    sample_rate: int
+    channels: int
+    sample_width: int
+    data_offset: int
+    data_size: int
+
+    @property
+    def frame_size(self) -> int:
+        return self.channels * self.sample_width
+
+    @property
+    def frames(self) -> int:
+        return self.data_size // self.frame_size
+
+    @property
+    def duration_s(self) -> float:
+        return self.frames / self.sample_rate
+
+
+def read_wav_info(path: str | Path) -> WavInfo:
+    """Parse the header of a PCM WAV file."""
+    with open(path, "rb") as fh:
+        riff = fh.read(12)
+        if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+            raise UserConfigError(f"Not a WAV file: {path}")
+        fmt = None
+        while True:
+            head = fh.read(8)
+            if len(head) < 8:
+                raise UserConfigError(f"WAV file has no data chunk: {path}")
+            chunk_id, size = head[:4], struct.unpack("<I", head[4:])[0]
+            if chunk_id == b"fmt ":
+                body = fh.read(size)
+                if len(body) < 16:
+                    raise UserConfigError(f"WAV fmt chunk is truncated: {path}")
+                tag, channels, rate, _, _, bits = struct.unpack("<HHIIHH", body[:16])
+                if tag not in (1, 0xFFFE):
+                    raise UserConfigError(f"Only PCM WAV files are supported: {path}")
+                if not channels or not rate or bits < 8:
+                    raise UserConfigError(
+                        f"WAV header has {channels} channels, {rate} Hz, {bits} bits: {path}"
+                    )
+                fmt = (rate, channels, bits // 8)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise UserConfigError(f"WAV data chunk precedes fmt chunk: {path}")
+                offset = fh.tell()
+                end = fh.seek(0, 2)
+                # Streaming writers may leave a placeholder size; trust the file length instead.
+                data_size = min(size, end - offset) if size else end - offset
+                return WavInfo(fmt[0], fmt[1], fmt[2], offset, data_size)
+            else:
+                fh.seek(size + (size & 1), 1)
+
+
+def wav_header(sample_rate: int, channels: int, sample_width: int, data_size: int) -> bytes:
+    """Return a canonical 44-byte PCM header."""
+    block_align = channels * sample_width
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + data_size,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,
+        channels,
+        sample_rate,
+        sample_rate * block_align,
+        block_align,
+        sample_width * 8,
+        b"data",
+        data_size,
+    )
@@ -10,8 +10,9 @@ import wave
 from pathlib import Path
 from typing import Optional
 
+from voxengine.adapters.audio.formats import ensure_adapter_format
 from voxengine.adapters.tts.base import TTSAudio
-from voxengine.core.errors import UserConfigError
+from voxengine.core.cancel import CancelToken
 
 
 class BeepTTSAdapter:
@@ -41,9 +42,11 @@ class BeepTTSAdapter:
         voice: Optional[str] = None,
         profile: Optional[str] = None,
         out_format: str = "wav",
+        cancel: Optional[CancelToken] = None,
     ) -> TTSAudio:
-        if out_format != "wav":
-            raise UserConfigError("Beep backend only supports wav output.")
+        ensure_adapter_format(out_format, "Beep")
+        if cancel is not None:
+            cancel.raise_if_cancelled()
 
         out_path.parent.mkdir(parents=True, exist_ok=True)
         num_samples = int(self.duration_s * self.sample_rate)
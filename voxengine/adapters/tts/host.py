@@ -0,0 +1,328 @@
+"""Process-pool host for in-Python TTS engines.
+
+Python-native models (CosyVoice, XTTS, ...) serialize on the GIL and inflate the API process if
+they run in-process. :class:`ProcessAdapterHost` wraps such a backend in a pool of worker
+processes instead: each worker builds its backend once per model, receives requests over a
+pipe, and hands PCM back through a shared-memory segment rather than pickled bytes. The parent
+names each segment and unlinks it, also when it kills a worker mid-request, so a cancelled or
+timed-out request never leaks a segment in ``/dev/shm``. Workers are recycled after
+``max_requests`` or when their resident memory passes ``max_rss_mb``.
+A request goes to an idle worker that has already loaded its model when there is one, so
+alternating voices do not make every worker load every model.
+
+A hosted backend is any picklable ``factory(model_path)`` returning an object with a
+``sample_rate`` attribute and ``synthesize(text, voice=None, profile=None) -> bytes`` that
+yields mono 16-bit little-endian PCM::
+
+    register_tts("cosyvoice", ProcessAdapterHost("cosyvoice", CosyVoiceBackend, workers=2))
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import sys
+import threading
+import time
+import uuid
+import wave
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Protocol, Set
+
+from voxengine.adapters.audio.formats import ensure_adapter_format
+from voxengine.adapters.tts.base import TTSAudio
+from voxengine.core.cancel import CancelToken
+from voxengine.core.errors import CancelledError, VoxEngineError
+from voxengine.core.logging import get_logger
+
+log = get_logger("voxengine.adapter_host")
+
+
+class PCMBackend(Protocol):
+    """A Python-native backend that runs inside a host worker process."""
+
+    sample_rate: int
+
+    def synthesize(
+        self, text: str, voice: Optional[str] = None, profile: Optional[str] = None
+    ) -> bytes: ...
+
+
+def _rss_mb() -> float:
+    """Current resident set size of this process in MiB."""
+    try:
+        with open("/proc/self/statm", "rb") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KiB on Linux and bytes on macOS.
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _worker_main(
+    conn: Any,
+    factory: Callable[[Optional[str]], PCMBackend],
+    max_rss_mb: Optional[float],
+    max_requests: Optional[int],
+) -> None:
+    backends: Dict[Optional[str], PCMBackend] = {}
+    served = 0
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if msg is None:
+            return
+        text, model, voice, profile, shm_name = msg
+        shm = None
+        try:
+            backend = backends.get(model)
+            if backend is None:
+                backend = backends[model] = factory(model)
+            pcm = backend.synthesize(text, voice=voice, profile=profile)
+            # The parent named the segment; it copies out and unlinks it, or unlinks it after
+            # killing this process.
+            shm = shared_memory.SharedMemory(name=shm_name, create=True, size=max(len(pcm), 1))
+            shm.buf[: len(pcm)] = pcm
+            reply: tuple = ("ok", shm.name, len(pcm), int(backend.sample_rate))
+            shm.close()
+        except Exception as exc:  # noqa: BLE001
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+            reply = ("error", f"{type(exc).__name__}: {exc}")
+        served += 1
+        recycle = bool(max_requests and served >= max_requests) or bool(
+            max_rss_mb and _rss_mb() > max_rss_mb
+        )
+        conn.send(reply + (recycle,))
+        if recycle:
+            return
+
+
+class _Worker:
+    def __init__(self, ctx: Any, factory: Callable, max_rss_mb, max_requests, name: str) -> None:
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, factory, max_rss_mb, max_requests),
+            name=name,
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.models: Set[Optional[str]] = set()  # models this worker has built a backend for
+
+    def stop(self, timeout: float = 2.0) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout)
+        self.conn.close()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class ProcessAdapterHost:
+    """TTS adapter that runs a Python-native backend in worker processes."""
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[Optional[str]], PCMBackend],
+        workers: int = 2,
+        max_rss_mb: Optional[float] = None,
+        max_requests: Optional[int] = None,
+        timeout_s: Optional[float] = None,
+        start_method: str = "spawn",
+        notes: str = "",
+    ) -> None:
+        self.name = name
+        self.factory = factory
+        self.workers = max(1, int(workers))
+        self.max_rss_mb = max_rss_mb
+        self.max_requests = max_requests
+        self.timeout_s = timeout_s
+        self.notes = notes or f"Python-native backend hosted in {self.workers} worker processes."
+        self._ctx = mp.get_context(start_method)
+        self._slots = threading.BoundedSemaphore(self.workers)
+        self._idle: List[_Worker] = []  # most recently used last; guarded by _lock
+        self._all: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._spawned = 0
+        self.recycled = 0
+        self._closed = False
+
+    def about(self) -> dict:
+        return {
+            "name": self.name,
+            "type": "tts",
+            "offline": True,
+            "needs_executable": False,
+            "executable_found": True,
+            "available": not self._closed,
+            "notes": self.notes,
+            "workers": self.workers,
+            "workers_running": len(self._all),
+            "workers_recycled": self.recycled,
+        }
+
+    def speak(
+        self,
+        text: str,
+        out_path: Path,
+        model_path: Optional[Path] = None,
+        voice: Optional[str] = None,
+        profile: Optional[str] = None,
+        out_format: str = "wav",
+        cancel: Optional[CancelToken] = None,
+    ) -> TTSAudio:
+        ensure_adapter_format(out_format, self.name)
+        if self._closed:
+            raise VoxEngineError(f"Backend '{self.name}' has been shut down.")
+        model = str(model_path) if model_path is not None else None
+        with self._slots:
+            if cancel is not None:
+                cancel.raise_if_cancelled()  # dropped while waiting for a slot
+            worker = self._acquire(model)
+            shm_name = self._segment_name()
+            try:
+                worker.conn.send((text, model, voice, profile, shm_name))
+                self._wait_reply(worker, cancel)
+                reply = worker.conn.recv()
+            except CancelledError:
+                # The worker is mid-request; killing it is the only way to stop the backend.
+                self._discard(worker, kill=True, segment=shm_name)
+                raise
+            except TimeoutError:
+                self._discard(worker, kill=True, segment=shm_name)
+                raise VoxEngineError(
+                    f"Backend '{self.name}' timed out after {self.timeout_s:g}s; worker restarted."
+                )
+            except (EOFError, OSError) as exc:
+                self._discard(worker, kill=True, segment=shm_name)
+                raise VoxEngineError(f"Backend '{self.name}' worker exited unexpectedly.") from exc
+
+            recycle = reply[-1]
+            if recycle:
+                self.recycled += 1
+                self._discard(worker)
+            else:
+                worker.models.add(model)
+                with self._lock:
+                    self._idle.append(worker)
+
+        if reply[0] == "error":
+            raise VoxEngineError(f"Backend '{self.name}' failed: {reply[1]}")
+        _, shm_name, nbytes, sample_rate, _ = reply
+        self._write_wav(out_path, shm_name, nbytes, sample_rate)
+        return TTSAudio(path=out_path, sample_rate=sample_rate, duration_s=nbytes / 2 / sample_rate)
+
+    def close(self) -> None:
+        """Stop every worker process."""
+        self._closed = True
+        with self._lock:
+            workers, self._all = self._all, []
+        for worker in workers:
+            worker.stop()
+
+    def _wait_reply(self, worker: _Worker, cancel: Optional[CancelToken]) -> None:
+        """Block until the worker replies; raise on timeout or cancellation."""
+        if cancel is None:
+            if self.timeout_s is not None and not worker.conn.poll(self.timeout_s):
+                raise TimeoutError
+            return
+        deadline = None if self.timeout_s is None else time.monotonic() + self.timeout_s
+        while not worker.conn.poll(0.02):
+            cancel.raise_if_cancelled()
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError
+
+    @staticmethod
+    def _segment_name() -> str:
+        # Short enough for macOS, which limits shared-memory names to 31 characters.
+        return f"vox_{os.getpid()}_{uuid.uuid4().hex[:12]}"
+
+    @staticmethod
+    def _unlink_segment(name: str) -> None:
+        """Remove a segment a killed worker may have created; absent ones are fine."""
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            return
+        shm.close()
+        shm.unlink()
+
+    @staticmethod
+    def _write_wav(out_path: Path, shm_name: str, nbytes: int, sample_rate: int) -> None:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        try:
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            with wave.open(str(out_path), "wb") as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(sample_rate)
+                wav.writeframes(shm.buf[:nbytes])
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def _acquire(self, model: Optional[str] = None) -> _Worker:
+        """Reuse an idle worker or start one; callers hold a slot so the pool never overfills.
+
+        Idle workers that already serve ``model`` come first, then the most recently used one.
+        """
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                warm = [i for i, w in enumerate(self._idle) if model in w.models]
+                worker = self._idle.pop(warm[-1] if warm else -1)
+            if worker.process.is_alive():
+                return worker
+            self._discard(worker, kill=True)
+        with self._lock:
+            n = self._spawned
+            self._spawned += 1
+        # Starting a process takes a while; other callers keep reusing idle workers meanwhile.
+        worker = _Worker(
+            self._ctx,
+            self.factory,
+            self.max_rss_mb,
+            self.max_requests,
+            name=f"voxengine-{self.name}-{n}",
+        )
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                self._all.append(worker)
+        if closed:  # close() ran while the process was starting and cannot see it
+            worker.stop()
+            raise VoxEngineError(f"Backend '{self.name}' has been shut down.")
+        return worker
+
+    def _discard(
+        self, worker: _Worker, kill: bool = False, segment: Optional[str] = None
+    ) -> None:
+        with self._lock:
+            if worker in self._all:
+                self._all.remove(worker)
+        if kill:
+            worker.kill()
+        else:
+            worker.stop()
+        if segment is not None:
+            self._unlink_segment(segment)  # the worker is gone, so it cannot create it later
+        log.debug("Recycled %s worker pid=%s", self.name, worker.process.pid)
@@ -1,26 +1,36 @@
 """Piper TTS adapter."""
 
 from __future__ import annotations
+import os
 import shutil
 import subprocess
 from pathlib import Path
 from typing import Optional
 
+from voxengine.adapters.audio.formats import ensure_adapter_format
+from voxengine.adapters.audio.wavfile import read_wav_info
 from voxengine.adapters.tts.base import TTSAudio
-from voxengine.core.errors import MissingDependencyError, UserConfigError, VoxEngineError
+from voxengine.core.cancel import CancelToken
+from voxengine.core.errors import (
+    CancelledError,
+    MissingDependencyError,
+    UserConfigError,
+    VoxEngineError,
+)
 
 
 class PiperTTSAdapter:
     """Lightweight wrapper around the Piper executable."""
 
     def about(self) -> dict:
+        found = shutil.which("piper") is not None
         return {
             "name": "piper",
             "type": "tts",
             "offline": True,
             "needs_executable": True,
-            "executable_found": shutil.which("piper") is not None,
-            "available": shutil.which("piper") is not None,
+            "executable_found": found,
+            "available": found,
             "notes": "Requires 'piper' on PATH plus an .onnx model file.",
         }
 
@@ -32,6 +42,8 @@ class PiperTTSAdapter:
         voice: Optional[str] = None,
         profile: Optional[str] = None,
         out_format: str = "wav",
+        cancel: Optional[CancelToken] = None,
+        threads: Optional[int] = None,
     ) -> TTSAudio:
         exe = shutil.which("piper")
         if not exe:
@@ -40,22 +52,42 @@ class PiperTTSAdapter:
             raise UserConfigError("Piper requires --model pointing to an .onnx voice model.")
         if not model_path.exists():
             raise UserConfigError(f"Model path does not exist: {model_path}")
-        if out_format != "wav":
-            raise UserConfigError("Piper currently only supports wav output.")
+        ensure_adapter_format(out_format, "Piper")
 
         out_path.parent.mkdir(parents=True, exist_ok=True)
         cmd = [exe, "--model", str(model_path), "--output_file", str(out_path)]
         if voice:
             cmd += ["--speaker", str(voice)]
 
-        proc = subprocess.run(
-            cmd, input=text.encode("utf-8"), stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        if cancel is not None:
+            cancel.raise_if_cancelled()
+        env = None
+        if threads is not None:
+            # onnxruntime sizes its thread pool from the core count by default, so parallel
+            # Piper processes oversubscribe the CPU unless each one is capped.
+            env = {**os.environ, "OMP_NUM_THREADS": str(threads)}
+        proc = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env
         )
+        # Killing the process makes communicate() return at once.
+        unregister = cancel.on_cancel(proc.kill) if cancel is not None else None
+        try:
+            out, err = proc.communicate(text.encode("utf-8"))
+        finally:
+            if unregister is not None:
+                unregister()
+        if cancel is not None and cancel.cancelled:
+            out_path.unlink(missing_ok=True)
+            raise CancelledError(f"Piper synthesis cancelled: {cancel.reason}")
         if proc.returncode != 0:
-            stderr = proc.stderr.decode("utf-8", errors="ignore").strip()
-            stdout = proc.stdout.decode("utf-8", errors="ignore").strip()
+            stderr = err.decode("utf-8", errors="ignore").strip()
+            stdout = out.decode("utf-8", errors="ignore").strip()
             detail = stderr or stdout or "unknown error"
             raise VoxEngineError(
                 f"Piper failed to synthesize audio. Details: {detail}", exit_code=2
             )
-        return TTSAudio(path=out_path, sample_rate=22050)
+        try:
+            info = read_wav_info(out_path)
+        except (OSError, UserConfigError) as exc:
+            raise VoxEngineError(f"Piper did not write a readable WAV file: {exc}", exit_code=2)
+        return TTSAudio(path=out_path, sample_rate=info.sample_rate, duration_s=info.duration_s)
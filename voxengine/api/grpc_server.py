@@ -0,0 +1,496 @@
+"""gRPC service mirroring the HTTP API, for native clients that want raw PCM.
+
+The service runs next to the FastAPI app (``voxengine serve --grpc ADDRESS``) on the same
+:class:`~voxengine.core.engine.Engine`. ``ADDRESS`` is ``host:port`` or ``unix:/path/to/socket``.
+
+Every message is the protobuf ``voxengine.v1.Frame`` from ``proto/voxengine/v1/voxengine.proto``:
+a JSON header (the HTTP API's request and response objects) and raw bytes (PCM or file
+contents). Audio chunks have an empty header, so streamed PCM carries a few bytes of framing per
+chunk and no JSON. :func:`encode_frame` and :func:`decode_frame` implement the two fields by hand,
+so the protobuf runtime is not needed; native clients generate stubs from the ``.proto``. The
+messages are specified in ``docs/api.md`` and are fixed for the ``v1`` service; an incompatible
+change gets a new service name. :class:`VoxEngineClient` implements the client side. Methods of
+``voxengine.v1.VoxEngine``:
+
+* ``Speak`` (unary): the ``/v1/tts/speak`` request and response; ``"inline": true`` puts the
+  audio file in the response data.
+* ``SpeakStream`` (server streaming): synthesize, then stream a ``format`` frame, audio frames
+  of PCM and an ``end`` frame. Streaming starts once synthesis has finished; the chunks are cut
+  from the finished file, because adapters only hand back whole files.
+* ``Session`` (bidirectional): send ``speak`` frames, which are synthesized in order and
+  streamed back like ``SpeakStream``, with every frame tagged with the utterance ``id``. A
+  ``cancel`` frame stops the current utterance and drops the queued ones.
+* ``RenderScene``, ``RenderLine``, ``JobStatus``, ``CancelJob`` (unary) and ``WatchJob``
+  (server streaming of job events until the job finishes).
+
+``grpcio`` is optional: ``pip install 'voxengine[grpc]'``.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import queue
+import threading
+from concurrent import futures
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from pydantic import ValidationError
+
+from voxengine.adapters.audio.wavfile import read_wav_info
+from voxengine.api.schemas import (
+    JobStatusResponse,
+    RenderLineRequest,
+    RenderSceneRequest,
+    SpeakRequest,
+)
+from voxengine.core.cancel import CancelToken
+from voxengine.core.engine import Engine
+from voxengine.core.errors import (
+    CancelledError,
+    MissingDependencyError,
+    UserConfigError,
+)
+from voxengine.core.logging import get_logger, log_context, new_request_id
+from voxengine.core.queue import TERMINAL_STATUSES
+
+log = get_logger("voxengine.grpc")
+
+SERVICE = "voxengine.v1.VoxEngine"
+DEFAULT_CHUNK_MS = 100
+WATCH_POLL_S = 15.0
+# Protobuf keys of Frame.header (field 1) and Frame.data (field 2), both length-delimited.
+_HEADER_KEY = b"\x0a"
+_DATA_KEY = b"\x12"
+
+
+def require_grpc():
+    try:
+        import grpc
+    except ImportError as exc:
+        raise MissingDependencyError(
+            "gRPC support needs grpcio. Install it with: pip install 'voxengine[grpc]'"
+        ) from exc
+    return grpc
+
+
+@dataclass
+class Frame:
+    """One gRPC message: a JSON header plus optional raw bytes."""
+
+    header: Dict[str, Any] = field(default_factory=dict)
+    data: bytes = b""
+
+    @property
+    def type(self) -> str:
+        """The header's ``type``; a frame with an empty header is an audio chunk."""
+        return self.header.get("type", "audio")
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _read_varint(raw: bytes, pos: int) -> tuple[int, int]:
+    value = shift = 0
+    while pos < len(raw) and shift < 64:
+        byte = raw[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+    raise ValueError("Frame has a truncated varint.")
+
+
+def encode_frame(frame: Frame) -> bytes:
+    """Serialize ``frame`` as a ``voxengine.v1.Frame`` protobuf; empty fields are omitted."""
+    parts = []
+    if frame.header:
+        head = json.dumps(frame.header, separators=(",", ":")).encode()
+        parts += [_HEADER_KEY, _varint(len(head)), head]
+    if frame.data:
+        parts += [_DATA_KEY, _varint(len(frame.data)), frame.data]
+    return b"".join(parts)
+
+
+def decode_frame(raw: bytes) -> Frame:
+    """Parse a ``voxengine.v1.Frame`` protobuf, skipping fields this version does not know."""
+    head: bytes = b""
+    data: bytes = b""
+    pos = 0
+    while pos < len(raw):
+        key, pos = _read_varint(raw, pos)
+        wire = key & 7
+        if wire == 0:
+            _, pos = _read_varint(raw, pos)
+        elif wire == 1:
+            pos += 8
+        elif wire == 5:
+            pos += 4
+        elif wire == 2:
+            size, pos = _read_varint(raw, pos)
+            value, pos = raw[pos : pos + size], pos + size
+            if key >> 3 == 1:
+                head = value
+            elif key >> 3 == 2:
+                data = value
+        else:
+            raise ValueError(f"Frame has an unsupported protobuf wire type {wire}.")
+        if pos > len(raw):
+            raise ValueError("Frame field runs past the end of the message.")
+    return Frame(json.loads(head) if head else {}, bytes(data))
+
+
+def _status_for(exc: BaseException):
+    codes = require_grpc().StatusCode
+    if isinstance(exc, (UserConfigError, ValidationError, ValueError)):
+        return codes.INVALID_ARGUMENT
+    if isinstance(exc, MissingDependencyError):
+        return codes.UNAVAILABLE
+    if isinstance(exc, CancelledError):
+        return codes.CANCELLED
+    if isinstance(exc, KeyError):
+        return codes.NOT_FOUND
+    return codes.INTERNAL
+
+
+def _message(exc: BaseException) -> str:
+    if isinstance(exc, KeyError):
+        return f"Unknown job '{exc.args[0]}'." if exc.args else "Not found."
+    return str(exc)
+
+
+def _job_dict(job) -> Dict[str, Any]:
+    return JobStatusResponse.from_job(job).model_dump()
+
+
+class VoxEngineServicer:
+    """RPC handlers; each one runs on a server thread and calls the engine directly."""
+
+    def __init__(self, engine: Engine, chunk_ms: int = DEFAULT_CHUNK_MS) -> None:
+        self.engine = engine
+        self.chunk_ms = chunk_ms
+
+    # -- synthesis ----------------------------------------------------------------------------
+
+    def speak(self, frame: Frame, context) -> Frame:
+        req = SpeakRequest(**_fields(frame.header, SpeakRequest))
+        with _SessionToken(self.engine, req.session_id, context) as cancel:
+            result = self.engine.tts_speak(
+                text=req.text,
+                backend=req.backend,
+                model_path=req.model_path,
+                voice=req.voice,
+                profile=req.profile,
+                out_format=req.out_format,
+                final_backend=req.final_backend,
+                final_model_path=req.final_model_path,
+                final_voice=req.final_voice,
+                cancel=cancel,
+            )
+        data = Path(result["audio_path"]).read_bytes() if frame.header.get("inline") else b""
+        return Frame(result, data)
+
+    def speak_stream(self, frame: Frame, context) -> Iterator[Frame]:
+        req = SpeakRequest(**_fields(frame.header, SpeakRequest))
+        with _SessionToken(self.engine, req.session_id, context) as cancel:
+            yield from self._pcm_frames(req, cancel, frame.header.get("chunk_ms"), {})
+
+    def session(self, frames: Iterable[Frame], context) -> Iterator[Frame]:
+        pending: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        current = [CancelToken()]  # fired by a cancel frame; queued utterances share it
+        context.add_callback(lambda: current[0].cancel("client disconnected"))
+        ids = itertools.count(1)
+
+        def read() -> None:
+            try:
+                for frame in frames:
+                    if frame.header.get("type") == "cancel":
+                        token, current[0] = current[0], CancelToken()
+                        token.cancel("cancelled by client")
+                    else:
+                        pending.put((frame, current[0]))
+            except Exception:  # noqa: BLE001 - the client went away; stop like a half-close
+                pass
+            finally:
+                pending.put(None)
+
+        threading.Thread(target=read, name="voxengine-grpc-session", daemon=True).start()
+        while (item := pending.get()) is not None:
+            frame, cancel = item
+            tag = {"id": frame.header.get("id", next(ids))}
+            try:
+                cancel.raise_if_cancelled()
+                req = SpeakRequest(**_fields(frame.header, SpeakRequest))
+                yield from self._pcm_frames(req, cancel, frame.header.get("chunk_ms"), tag)
+            except CancelledError:
+                yield Frame({"type": "cancelled", **tag})
+            except Exception as exc:  # noqa: BLE001 - reported in-band; the session continues
+                code = _status_for(exc).name
+                yield Frame({"type": "error", "code": code, "message": _message(exc), **tag})
+
+    def _pcm_frames(
+        self,
+        req: SpeakRequest,
+        cancel: CancelToken,
+        chunk_ms: Optional[int],
+        tag: Dict[str, Any],
+    ) -> Iterator[Frame]:
+        result = self.engine.tts_speak(
+            text=req.text,
+            backend=req.backend,
+            model_path=req.model_path,
+            voice=req.voice,
+            profile=req.profile,
+            out_format="wav",
+            cancel=cancel,
+        )
+        info = read_wav_info(result["audio_path"])
+        yield Frame(
+            {
+                "type": "format",
+                "sample_rate": info.sample_rate,
+                "channels": info.channels,
+                "sample_width": info.sample_width,
+                "duration_s": info.duration_s,
+                "audio_path": result["audio_path"],
+                "source": result["source"],
+                **tag,
+            }
+        )
+        frames = max(1, info.sample_rate * int(chunk_ms or self.chunk_ms) // 1000)
+        chunk = frames * info.frame_size
+        with open(result["audio_path"], "rb") as fh:
+            fh.seek(info.data_offset)
+            remaining = info.data_size
+            seq = 0
+            while remaining > 0:
+                cancel.raise_if_cancelled()
+                data = fh.read(min(chunk, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                yield Frame({}, data)  # belongs to the utterance of the last format frame
+                seq += 1
+        yield Frame({"type": "end", "chunks": seq, **tag})
+
+    # -- renders and jobs ---------------------------------------------------------------------
+
+    def render_scene(self, frame: Frame, context) -> Frame:
+        req = RenderSceneRequest(**frame.header)
+        job_id = self.engine.render.render_scene_async(
+            project_path=req.project_path,
+            scene_id=req.scene_id,
+            voice_map=req.voice_map,
+            options=req.options,
+        )
+        return Frame({"job_id": job_id})
+
+    def render_line(self, frame: Frame, context) -> Frame:
+        req = RenderLineRequest(**frame.header)
+        job_id = self.engine.render.rerender_line_async(
+            project_path=req.project_path,
+            scene_id=req.scene_id,
+            index=req.index,
+            voice_map=req.voice_map,
+            options=req.options,
+        )
+        return Frame({"job_id": job_id})
+
+    def job_status(self, frame: Frame, context) -> Frame:
+        return Frame(_job_dict(self.engine.queue.get(_job_id(frame))))
+
+    def cancel_job(self, frame: Frame, context) -> Frame:
+        job_id = _job_id(frame)
+        self.engine.queue.cancel(job_id)
+        return Frame(_job_dict(self.engine.queue.get(job_id)))
+
+    def watch_job(self, frame: Frame, context) -> Iterator[Frame]:
+        job_id = _job_id(frame)
+        jobs = self.engine.queue
+        jobs.get(job_id)  # unknown jobs fail before the stream starts
+        wake = threading.Event()
+
+        def listener(_event) -> None:
+            wake.set()
+
+        jobs.add_listener(listener)
+        try:
+            cursor = int(frame.header.get("since", 0))
+            while context.is_active():
+                wake.clear()
+                events = jobs.events_since(cursor, job_id=job_id)
+                for ev in events:
+                    yield Frame(ev.to_dict())
+                    cursor = ev.seq
+                    if ev.status in TERMINAL_STATUSES:
+                        return
+                if not events and jobs.get(job_id).status in TERMINAL_STATUSES:
+                    yield Frame({"type": "snapshot", **_job_dict(jobs.get(job_id))})
+                    return
+                wake.wait(WATCH_POLL_S)
+        finally:
+            jobs.remove_listener(listener)
+
+
+class _SessionToken:
+    """Cancel token for one call: shared with ``session_id`` and fired if the client leaves."""
+
+    def __init__(self, engine: Engine, session_id: Optional[str], context) -> None:
+        self.engine = engine
+        self.session_id = session_id
+        self.token = engine.sessions.begin(session_id) if session_id else CancelToken()
+        context.add_callback(lambda: self.token.cancel("client disconnected"))
+
+    def __enter__(self) -> CancelToken:
+        return self.token
+
+    def __exit__(self, *exc) -> None:
+        if self.session_id:
+            self.engine.sessions.end(self.session_id, self.token)
+
+
+def _fields(header: Dict[str, Any], model) -> Dict[str, Any]:
+    """Header entries that belong to ``model``; transport keys like ``id`` are dropped."""
+    return {k: v for k, v in header.items() if k in model.model_fields}
+
+
+def _job_id(frame: Frame) -> str:
+    job_id = frame.header.get("job_id")
+    if not job_id:
+        raise UserConfigError("job_id is required.")
+    return str(job_id)
+
+
+def _request_id(context) -> str:
+    """The caller's ``x-request-id`` metadata, or a fresh ID."""
+    for key, value in context.invocation_metadata() or ():
+        if key == "x-request-id" and value:
+            return str(value)[:64]
+    return new_request_id()
+
+
+def _unary(fn: Callable[[Frame, Any], Frame]):
+    def handler(frame: Frame, context) -> Frame:
+        with log_context(request_id=_request_id(context)):
+            try:
+                return fn(frame, context)
+            except Exception as exc:  # noqa: BLE001
+                context.abort(_status_for(exc), _message(exc))
+
+    return handler
+
+
+def _streaming(fn: Callable[..., Iterator[Frame]]):
+    def handler(request, context) -> Iterator[Frame]:
+        with log_context(request_id=_request_id(context)):
+            try:
+                yield from fn(request, context)
+            except Exception as exc:  # noqa: BLE001
+                context.abort(_status_for(exc), _message(exc))
+
+    return handler
+
+
+def _handlers(servicer: VoxEngineServicer):
+    grpc = require_grpc()
+    opts = {"request_deserializer": decode_frame, "response_serializer": encode_frame}
+    unary = {
+        "Speak": servicer.speak,
+        "RenderScene": servicer.render_scene,
+        "RenderLine": servicer.render_line,
+        "JobStatus": servicer.job_status,
+        "CancelJob": servicer.cancel_job,
+    }
+    methods = {
+        name: grpc.unary_unary_rpc_method_handler(_unary(fn), **opts)
+        for name, fn in unary.items()
+    }
+    methods["SpeakStream"] = grpc.unary_stream_rpc_method_handler(
+        _streaming(servicer.speak_stream), **opts
+    )
+    methods["WatchJob"] = grpc.unary_stream_rpc_method_handler(
+        _streaming(servicer.watch_job), **opts
+    )
+    methods["Session"] = grpc.stream_stream_rpc_method_handler(
+        _streaming(servicer.session), **opts
+    )
+    return grpc.method_handlers_generic_handler(SERVICE, methods)
+
+
+class GrpcServer:
+    """A started gRPC server bound to one address; :attr:`port` is 0 for Unix sockets."""
+
+    def __init__(self, engine: Engine, address: str, max_workers: int = 16) -> None:
+        grpc = require_grpc()
+        self.address = address
+        self._server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+        self._server.add_generic_rpc_handlers((_handlers(VoxEngineServicer(engine)),))
+        try:
+            self.port = self._server.add_insecure_port(address)
+        except RuntimeError as exc:
+            raise UserConfigError(f"Cannot bind gRPC address '{address}': {exc}") from exc
+        if not address.startswith("unix:") and self.port == 0:
+            raise UserConfigError(f"Cannot bind gRPC address '{address}'.")
+
+    def start(self) -> "GrpcServer":
+        self._server.start()
+        log.info("gRPC service listening on %s", self.address)
+        return self
+
+    def stop(self, grace_s: float = 2.0) -> None:
+        self._server.stop(grace_s).wait()
+
+
+class VoxEngineClient:
+    """Minimal Python client; other languages use stubs generated from the ``.proto``."""
+
+    def __init__(self, address: str) -> None:
+        grpc = require_grpc()
+        self.channel = grpc.insecure_channel(address)
+        opts = {"request_serializer": encode_frame, "response_deserializer": decode_frame}
+        path = f"/{SERVICE}/"
+        self._unary = {
+            name: self.channel.unary_unary(path + name, **opts)
+            for name in ("Speak", "RenderScene", "RenderLine", "JobStatus", "CancelJob")
+        }
+        self._speak_stream = self.channel.unary_stream(path + "SpeakStream", **opts)
+        self._watch_job = self.channel.unary_stream(path + "WatchJob", **opts)
+        self._session = self.channel.stream_stream(path + "Session", **opts)
+
+    def call(self, method: str, **header: Any) -> Frame:
+        return self._unary[method](Frame(header))
+
+    def speak(self, text: str, **options: Any) -> Frame:
+        return self.call("Speak", text=text, **options)
+
+    def speak_stream(self, text: str, **options: Any) -> Iterator[Frame]:
+        return self._speak_stream(Frame({"text": text, **options}))
+
+    def session(self, frames: Iterable[Frame]) -> Iterator[Frame]:
+        return self._session(iter(frames))
+
+    def watch_job(self, job_id: str, since: int = 0) -> Iterator[Frame]:
+        return self._watch_job(Frame({"job_id": job_id, "since": since}))
+
+    def close(self) -> None:
+        self.channel.close()
+
+    def __enter__(self) -> "VoxEngineClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def serve_grpc(engine: Engine, address: str, max_workers: int = 16) -> GrpcServer:
+    """Bind ``address`` and start serving ``engine``; call ``stop()`` on the result to shut down."""
+    return GrpcServer(engine, address, max_workers=max_workers).start()
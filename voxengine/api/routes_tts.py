@@ -19,6 +19,7 @@ def tts_speak(req: SpeakRequest):
             voice=req.voice,
             profile=req.profile,
             out_format=req.out_format,
+            defer_encode=True,
         )
     except UserConfigError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
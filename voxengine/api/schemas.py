@@ -47,6 +47,14 @@ class SpeakRequest(BaseModel):
     voice: Optional[str] = None
     profile: Optional[str] = None
     out_format: str = "wav"
+    final_backend: Optional[str] = Field(
+        default=None, description="Queue a background final-tier render with this backend."
+    )
+    final_model_path: Optional[Path] = None
+    final_voice: Optional[str] = None
+    session_id: Optional[str] = Field(
+        default=None, description="Newer requests in the same session cancel older ones."
+    )
 
 
 class SpeakResponse(BaseModel):
@@ -59,6 +67,20 @@ class SpeakResponse(BaseModel):
     sample_rate: int
     warnings: List[str] = Field(default_factory=list)
     download_url: Optional[str] = None
+    tier: Optional[str] = None
+    final_job_id: Optional[str] = None
+    encode_job_id: Optional[str] = None  # set while a compressed format is still encoding
+    timings_ms: Dict[str, float] = Field(default_factory=dict)
+    source: Optional[str] = None  # "synthesis" or "phrasebook"
+
+
+class FlushRequest(BaseModel):
+    session_id: str
+
+
+class FlushResponse(BaseModel):
+    session_id: str
+    cancelled: bool
 
 
 class RenderSceneRequest(BaseModel):
@@ -72,9 +94,38 @@ class RenderSceneResponse(BaseModel):
     job_id: str
 
 
+class RenderLineRequest(BaseModel):
+    project_path: str
+    scene_id: str
+    index: int = Field(ge=1)  # 1-based line number within the scene
+    voice_map: Dict[str, str] = Field(default_factory=dict)
+    options: Dict[str, Any] = Field(default_factory=dict)
+
+
 class JobStatusResponse(BaseModel):
     job_id: str
     status: str
     progress: float = 0.0
     detail: Optional[str] = None
     artifacts: Dict[str, Any] = Field(default_factory=dict)
+    project: Optional[str] = None
+    created_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @classmethod
+    def from_job(cls, job: Any) -> "JobStatusResponse":
+        return cls(
+            job_id=job.id,
+            status=job.status,
+            progress=job.progress,
+            detail=job.detail,
+            artifacts=job.artifacts,
+            project=job.project,
+            created_at=job.created_at,
+            finished_at=job.finished_at,
+        )
+
+
+class JobListResponse(BaseModel):
+    jobs: List[JobStatusResponse]
+    next_cursor: Optional[str] = None
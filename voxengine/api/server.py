@@ -2,51 +2,237 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
+import os
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
 import uvicorn
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from voxengine.adapters.audio.formats import format_for_path
+from voxengine.api.schemas import (
+    FlushRequest,
+    FlushResponse,
+    JobListResponse,
+    JobStatusResponse,
+    RenderLineRequest,
+    RenderSceneRequest,
+    RenderSceneResponse,
+    SpeakRequest,
+    SpeakResponse,
+)
+from voxengine.core.engine import Engine, EngineConfig, get_engine
+from voxengine.core.cancel import CancelToken
+from voxengine.core.errors import (
+    CancelledError,
+    MissingDependencyError,
+    UserConfigError,
+    VoxEngineError,
+)
+from voxengine.core.logging import configure_logging, log_context, new_request_id
+from voxengine.core.queue import TERMINAL_STATUSES, Job
+from voxengine.core.timing import collect, profile_to, stage_stats
+
+SSE_KEEPALIVE_S = 15.0
+
+
+def _job_response(job: Job) -> JobStatusResponse:
+    return JobStatusResponse.from_job(job)
+
+
+def _sse(event_id: int, event: str, data: dict) -> str:
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _job_event_stream(
+    eng: Engine, since: int, job_id: Optional[str], project: Optional[str]
+) -> AsyncIterator[str]:
+    """Yield job events as Server-Sent Events, woken by queue listeners rather than polling."""
+    loop = asyncio.get_running_loop()
+    wake = asyncio.Event()
+
+    def listener(_event) -> None:
+        loop.call_soon_threadsafe(wake.set)
+
+    eng.queue.add_listener(listener)
+    try:
+        cursor = since
+        if cursor + 1 < eng.queue.oldest_seq():
+            # The resume point fell out of the buffer: send current state, then continue live.
+            cursor = eng.queue.last_seq
+            for state in eng.queue.snapshot(job_id=job_id, project=project):
+                yield _sse(cursor, "snapshot", state)
+        while True:
+            # Clear before fetching: an event published from here on wakes the wait below.
+            wake.clear()
+            events = eng.queue.events_since(cursor, job_id=job_id, project=project)
+            for ev in events:
+                yield _sse(ev.seq, ev.type, ev.to_dict())
+                cursor = ev.seq
+                if job_id is not None and ev.status in TERMINAL_STATUSES:
+                    return
+            if job_id is not None and not events:
+                try:
+                    if eng.queue.get(job_id).status in TERMINAL_STATUSES:
+                        return
+                except KeyError:
+                    return
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=SSE_KEEPALIVE_S)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+    finally:
+        eng.queue.remove_listener(listener)
+
 
-from voxengine.api.schemas import SpeakRequest, SpeakResponse
-from voxengine.core.engine import EngineConfig, get_engine
-from voxengine.core.errors import MissingDependencyError, UserConfigError, VoxEngineError
-from voxengine.core.logging import configure_logging
+async def _cancel_on_disconnect(request: Request, cancel: CancelToken, poll_s: float = 0.05):
+    """Fire ``cancel`` if the client goes away while its request is still being served."""
+    while not cancel.cancelled:
+        if await request.is_disconnected():
+            cancel.cancel("client disconnected")
+            return
+        await asyncio.sleep(poll_s)
 
 
-def create_app() -> FastAPI:
-    """Create a FastAPI app with health, doctor, and TTS routes."""
+class RequestIdMiddleware:
+    """Bind each HTTP request's ID (``X-Request-ID``, or a fresh one) for logging and echo it."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or ())
+        request_id = headers.get(b"x-request-id", b"").decode("latin-1")[:64] or new_request_id()
+
+        async def send_with_id(message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-request-id", request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        with log_context(request_id=request_id):
+            await self.app(scope, receive, send_with_id)
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").lower() in {"1", "true", "yes", "on"}
+
+
+def create_app(
+    warmup: Optional[bool] = None,
+    profiling: Optional[bool] = None,
+    grpc_address: Optional[str] = None,
+) -> FastAPI:
+    """Create a FastAPI app with health, doctor, and TTS routes.
+
+    With ``warmup`` (default: ``VOXENGINE_WARMUP``) the engine runs a tiny synthesis per backend
+    and model on startup; ``/ready`` reports 503 until it finishes while ``/health`` stays up.
+    With ``profiling`` (default: ``VOXENGINE_PROFILING``) a speak request carrying
+    ``X-VoxEngine-Profile: 1`` is run under cProfile.
+    With ``grpc_address`` (default: ``VOXENGINE_GRPC``) the gRPC service is served on the same
+    engine for as long as the app runs.
+    """
     configure_logging()
     cfg = EngineConfig.load()
     eng = get_engine()
+    if warmup is None:
+        warmup = _env_flag("VOXENGINE_WARMUP")
+    if profiling is None:
+        profiling = _env_flag("VOXENGINE_PROFILING")
+    if grpc_address is None:
+        grpc_address = os.getenv("VOXENGINE_GRPC") or None
+    if grpc_address:
+        from voxengine.api.grpc_server import require_grpc
+
+        require_grpc()  # fail at startup, not on first use, when grpcio is missing
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI):
+        eng.resume_renders()
+        if warmup:
+            eng.warmup_async()
+        if eng.cache.max_bytes is not None or eng.cache.max_age_s is not None:
+            eng.cache.start()
+        grpc_server = None
+        if grpc_address:
+            from voxengine.api.grpc_server import serve_grpc
+
+            grpc_server = serve_grpc(eng, grpc_address)
+        yield
+        if grpc_server is not None:
+            grpc_server.stop()
+        eng.cache.stop()
+
     app = FastAPI(
         title="VoxEngine",
         version=cfg.version,
         description="Offline-first studio backend for local LLM + TTS with cast libraries.",
+        lifespan=lifespan,
     )
+    app.add_middleware(RequestIdMiddleware)
 
     @app.get("/health")
     def health():
         return {"status": "ok", "version": cfg.version}
 
+    @app.get("/ready")
+    def ready():
+        state = eng.readiness()
+        return JSONResponse(state, status_code=200 if state["ready"] else 503)
+
     @app.get("/doctor")
     def doctor():
         return eng.doctor()
 
     @app.get("/v1/backends")
     def list_backends():
-        return {"tts": eng.doctor().get("tts_backends", [])}
+        return {"tts": eng.list_backends()}
 
     @app.post("/tts/speak", response_model=SpeakResponse)
     @app.post("/v1/tts/speak", response_model=SpeakResponse)
-    def tts_speak(req: SpeakRequest):
+    async def tts_speak(
+        req: SpeakRequest,
+        request: Request,
+        response: Response,
+        x_voxengine_profile: Optional[str] = Header(default=None),
+    ):
+        profile_path = None
+        if profiling and x_voxengine_profile and x_voxengine_profile.lower() in {"1", "true"}:
+            profile_path = eng.cfg.cache_dir / "profiles" / f"speak-{uuid.uuid4().hex}.prof"
+        # A new utterance in the same session supersedes the previous one.
+        cancel = eng.sessions.begin(req.session_id) if req.session_id else CancelToken()
+
+        def _speak():
+            with collect() as timings, profile_to(profile_path):
+                result = eng.tts_speak(
+                    text=req.text,
+                    backend=req.backend,
+                    model_path=req.model_path,
+                    voice=req.voice,
+                    profile=req.profile,
+                    out_format=req.out_format,
+                    final_backend=req.final_backend,
+                    final_model_path=req.final_model_path,
+                    final_voice=req.final_voice,
+                    cancel=cancel,
+                    defer_encode=True,
+                )
+            return result, timings
+
+        watcher = asyncio.create_task(_cancel_on_disconnect(request, cancel))
         try:
-            result = eng.tts_speak(
-                text=req.text,
-                backend=req.backend,
-                model_path=req.model_path,
-                voice=req.voice,
-                profile=req.profile,
-                out_format=req.out_format,
-            )
+            result, timings = await run_in_threadpool(_speak)
+        except CancelledError as exc:
+            raise HTTPException(status_code=409, detail=str(exc)) from exc
         except UserConfigError as exc:
             raise HTTPException(status_code=400, detail=str(exc)) from exc
         except MissingDependencyError as exc:
@@ -55,17 +241,174 @@ def create_app() -> FastAPI:
             raise HTTPException(status_code=500, detail=str(exc)) from exc
         except Exception as exc:  # noqa: BLE001
             raise HTTPException(status_code=500, detail=str(exc)) from exc
+        finally:
+            watcher.cancel()
+            if req.session_id:
+                eng.sessions.end(req.session_id, cancel)
+        response.headers["Server-Timing"] = timings.server_timing()
+        if profile_path is not None:
+            response.headers["X-VoxEngine-Profile"] = str(profile_path)
         return SpeakResponse(**result, download_url=f"/tts/file?path={result['audio_path']}")
 
+    @app.post("/v1/tts/flush", response_model=FlushResponse)
+    def tts_flush(req: FlushRequest):
+        """Abort whatever the session is still synthesizing."""
+        cancelled = eng.sessions.flush(req.session_id)
+        return FlushResponse(session_id=req.session_id, cancelled=cancelled)
+
+    @app.get("/v1/timings")
+    def timings():
+        """Per-stage timing aggregates since the server started."""
+        return {"stages": stage_stats()}
+
+    @app.get("/v1/concurrency")
+    def concurrency():
+        """Current per-backend synthesis limits and the measurements behind them."""
+        return eng.concurrency.snapshot()
+
+    @app.get("/v1/degradation")
+    def degradation():
+        """Interactive latency budget, fallback voice and how often it was used."""
+        return eng.degradation.snapshot()
+
+    @app.get("/v1/lookahead")
+    def lookahead():
+        """Speculative line rendering for preview playback and its hit rate."""
+        return eng.prefetch.snapshot()
+
+    @app.post("/v1/render/scene", response_model=RenderSceneResponse)
+    def render_scene(req: RenderSceneRequest):
+        job_id = eng.render.render_scene_async(
+            project_path=req.project_path,
+            scene_id=req.scene_id,
+            voice_map=req.voice_map,
+            options=req.options,
+        )
+        return RenderSceneResponse(job_id=job_id)
+
+    @app.post("/v1/render/line", response_model=RenderSceneResponse)
+    def render_line(req: RenderLineRequest):
+        job_id = eng.render.rerender_line_async(
+            project_path=req.project_path,
+            scene_id=req.scene_id,
+            index=req.index,
+            voice_map=req.voice_map,
+            options=req.options,
+        )
+        return RenderSceneResponse(job_id=job_id)
+
+    def _render_index(project_path: str):
+        try:
+            eng.projects.validate(project_path)
+        except (FileNotFoundError, ValueError) as exc:
+            raise HTTPException(status_code=404, detail=str(exc)) from exc
+        return eng.projects.renders(project_path)
+
+    @app.get("/v1/projects/timeline")
+    def project_timeline(project_path: str, refresh: bool = False):
+        """Total and per-scene runtime of a project's renders, from the render index."""
+        index = _render_index(project_path)
+        if refresh:
+            index.refresh()
+        return {"total_ms": index.total_ms(), "scenes": index.scenes()}
+
+    @app.get("/v1/projects/timeline/lines")
+    def project_timeline_lines(
+        project_path: str, scene_id: Optional[str] = None, min_ms: Optional[int] = None
+    ):
+        """Indexed lines, optionally of one scene or only those longer than ``min_ms``."""
+        return {"lines": _render_index(project_path).lines(scene_id=scene_id, min_ms=min_ms)}
+
+    def _event_response(
+        since: Optional[int],
+        last_event_id: Optional[str],
+        job_id: Optional[str],
+        project: Optional[str],
+    ) -> StreamingResponse:
+        if since is None:
+            since = int(last_event_id) if last_event_id and last_event_id.isdigit() else 0
+        return StreamingResponse(
+            _job_event_stream(eng, since, job_id, project),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @app.get("/v1/jobs", response_model=JobListResponse)
+    def list_jobs(
+        status: Optional[str] = None,
+        project: Optional[str] = None,
+        created_after: Optional[float] = None,
+        created_before: Optional[float] = None,
+        limit: int = Query(50, ge=1, le=1000),
+        cursor: Optional[str] = None,
+    ):
+        if cursor is not None and not cursor.isdigit():
+            raise HTTPException(status_code=400, detail="Invalid cursor.")
+        jobs, next_cursor = eng.queue.list(
+            status=status,
+            project=project,
+            created_after=created_after,
+            created_before=created_before,
+            limit=limit,
+            cursor=cursor,
+        )
+        return JobListResponse(jobs=[_job_response(j) for j in jobs], next_cursor=next_cursor)
+
+    @app.get("/v1/jobs/events")
+    def job_events(
+        project: Optional[str] = None,
+        since: Optional[int] = None,
+        last_event_id: Optional[str] = Header(default=None),
+    ):
+        return _event_response(since, last_event_id, None, project)
+
+    @app.get("/v1/jobs/{job_id}/events")
+    def job_events_for(
+        job_id: str,
+        since: Optional[int] = None,
+        last_event_id: Optional[str] = Header(default=None),
+    ):
+        try:
+            eng.queue.get(job_id)
+        except KeyError as exc:
+            raise HTTPException(status_code=404, detail=f"Unknown job '{job_id}'.") from exc
+        return _event_response(since, last_event_id, job_id, None)
+
+    @app.get("/v1/jobs/{job_id}", response_model=JobStatusResponse)
+    def job_status(job_id: str):
+        try:
+            job = eng.queue.get(job_id)
+        except KeyError as exc:
+            raise HTTPException(status_code=404, detail=f"Unknown job '{job_id}'.") from exc
+        return _job_response(job)
+
+    @app.post("/v1/jobs/{job_id}/cancel", response_model=JobStatusResponse)
+    def cancel_job(job_id: str):
+        """Stop a queued or running job; finished jobs are returned unchanged."""
+        try:
+            eng.queue.cancel(job_id)
+            job = eng.queue.get(job_id)
+        except KeyError as exc:
+            raise HTTPException(status_code=404, detail=f"Unknown job '{job_id}'.") from exc
+        return _job_response(job)
+
     @app.get("/tts/file")
     def tts_file(path: str):
-        return FileResponse(path, media_type="audio/wav", filename="speech.wav")
+        fmt = format_for_path(path)
+        eng.encoder.wait(path, timeout=eng.cfg.job_timeout_s)  # a deferred encode may be running
+        eng.cache.touch(path)
+        return FileResponse(path, media_type=fmt.media_type, filename=f"speech{fmt.suffix}")
 
     return app
 
 
-def run(host: str = "127.0.0.1", port: int = 7341) -> None:
-    uvicorn.run(create_app(), host=host, port=port)
+def run(
+    host: str = "127.0.0.1",
+    port: int = 7341,
+    warmup: Optional[bool] = None,
+    grpc_address: Optional[str] = None,
+) -> None:
+    uvicorn.run(create_app(warmup=warmup, grpc_address=grpc_address), host=host, port=port)
 
 
 app = create_app()
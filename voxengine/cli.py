@@ -4,24 +4,36 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import typer
 from rich import print
 
 from voxengine.api.server import run as serve_app
+from voxengine.core.coordinator import RenderCoordinator
 from voxengine.core.engine import Engine, get_engine
-from voxengine.core.errors import MissingDependencyError, VoxEngineError
+from voxengine.core.errors import MissingDependencyError, UserConfigError, VoxEngineError
 from voxengine.core.logging import configure_logging
+from voxengine.core.phrasebook import read_phrase_list
+from voxengine.core.render import RenderWorker
+from voxengine.core.timing import profile_to
 
 app = typer.Typer(add_completion=False, help="VoxEngine CLI.")
 tts_app = typer.Typer(help="Text-to-speech commands.")
 models_app = typer.Typer(help="Manage voice models.")
 backends_app = typer.Typer(help="Inspect available backends.")
+cache_app = typer.Typer(help="Inspect and clean the synthesis cache.")
+script_app = typer.Typer(help="Import and export project scripts.")
+phrasebook_app = typer.Typer(help="Pre-render phrasebooks for the screenreader profile.")
+renders_app = typer.Typer(help="Inspect a project's rendered audio.")
 
 app.add_typer(tts_app, name="tts")
 app.add_typer(models_app, name="models")
 app.add_typer(backends_app, name="backends")
+app.add_typer(cache_app, name="cache")
+app.add_typer(script_app, name="script")
+app.add_typer(phrasebook_app, name="phrasebook")
+app.add_typer(renders_app, name="renders")
 
 
 def _engine() -> Engine:
@@ -48,12 +60,53 @@ def _safe_execute(action: Callable[[], None], *, debug: bool) -> None:
 def serve(
     host: str = typer.Option("127.0.0.1", help="Host to bind the API server."),
     port: int = typer.Option(7341, help="Port to bind the API server."),
+    warmup: bool = typer.Option(
+        False, "--warmup", help="Synthesize a short clip per backend/model before reporting ready."
+    ),
+    grpc: Optional[str] = typer.Option(
+        None,
+        "--grpc",
+        help="Also serve gRPC on host:port or unix:/path (defaults to VOXENGINE_GRPC).",
+    ),
     debug: bool = typer.Option(False, "--debug", help="Show tracebacks for troubleshooting."),
 ):
     """Start the FastAPI server."""
 
     def _run() -> None:
-        serve_app(host=host, port=port)
+        serve_app(host=host, port=port, warmup=warmup or None, grpc_address=grpc)
+
+    _safe_execute(_run, debug=debug)
+
+
+@app.command()
+def worker(
+    coordinator: Optional[Path] = typer.Option(
+        None,
+        "--coordinator",
+        help="Shared coordinator database (defaults to VOXENGINE_COORDINATOR).",
+    ),
+    worker_id: Optional[str] = typer.Option(None, "--id", help="Worker name shown in leases."),
+    lease: float = typer.Option(60.0, "--lease", help="Lease duration in seconds."),
+    max_idle: Optional[float] = typer.Option(
+        None, "--max-idle", help="Exit after this many idle seconds (default: run forever)."
+    ),
+    debug: bool = typer.Option(False, "--debug", help="Show tracebacks for troubleshooting."),
+):
+    """Render line batches leased from a shared coordinator."""
+
+    def _run() -> None:
+        eng = _engine()
+        path = coordinator or eng.cfg.coordinator_path
+        if path is None:
+            raise UserConfigError(
+                "No coordinator configured. Pass --coordinator or set VOXENGINE_COORDINATOR."
+            )
+        render_worker = RenderWorker(
+            eng.render, RenderCoordinator(path, lease_s=lease), worker_id=worker_id
+        )
+        print(f"[cyan]Worker {render_worker.worker_id} polling {path}[/cyan]")
+        done = render_worker.run(max_idle_s=max_idle)
+        print(f"[green]Completed {done} batches.[/green]")
 
     _safe_execute(_run, debug=debug)
 
@@ -112,8 +165,7 @@ def list_backends(
     """List available runtime backends."""
 
     def _run() -> None:
-        data = _engine().doctor()
-        for backend in data.get("tts_backends", []):
+        for backend in _engine().list_backends():
             status = "available" if backend.get("available") else "unavailable"
             print(f"{backend.get('name')}: {status}")
 
@@ -139,17 +191,256 @@ def list_models(
 
 @models_app.command("add")
 def add_model(
-    path: Path = typer.Option(
-        ..., "--path", exists=True, readable=True, help="Path to a model file."
+    paths: List[Path] = typer.Option(
+        ..., "--path", exists=True, readable=True, help="Model file (repeat to add several)."
     ),
     name: Optional[str] = typer.Option(None, "--name", help="Optional name for the model."),
+    copy: bool = typer.Option(
+        False, "--copy", help="Always copy instead of reflinking or hardlinking the source."
+    ),
+    debug: bool = typer.Option(False, "--debug", help="Show tracebacks for troubleshooting."),
+):
+    """Import model files into the content-addressed model store."""
+
+    def _run() -> None:
+        engine = _engine()
+        if name is not None:
+            if len(paths) > 1:
+                raise UserConfigError("--name can only be used with a single --path.")
+            dest = engine.add_model(paths[0], name=name, link=not copy)
+            print(f"[green]Added model:[/green] {dest}")
+            return
+        for entry in engine.add_models(paths, link=not copy):
+            print(f"[green]Added model:[/green] {entry.path} ({entry.digest[:12]}, {entry.method})")
+
+    _safe_execute(_run, debug=debug)
+
+
+@models_app.command("verify")
+def verify_models(
+    debug: bool = typer.Option(False, "--debug", help="Show tracebacks for troubleshooting."),
+):
+    """Re-hash every stored model and report any whose content changed."""
+
+    def _run() -> None:
+        bad = _engine().models.verify()
+        if not bad:
+            print("[green]All model blobs match their hashes.[/green]")
+            return
+        for item in bad:
+            print(f"[red]Corrupt:[/red] {item['blob']} (now {item['actual'][:12]})")
+        raise VoxEngineError(f"{len(bad)} model blob(s) failed verification.", exit_code=1)
+
+    _safe_execute(_run, debug=debug)
+
+
+@models_app.command("gc")
+def models_gc(
+    dry_run: bool = typer.Option(False, "--dry-run", help="Report without deleting."),
     debug: bool = typer.Option(False, "--debug", help="Show tracebacks for troubleshooting."),
 ):
-    """Copy a model file into the VoxEngine models directory."""
+    """Delete stored model blobs that no model name refers to."""
 
     def _run() -> None:
-        dest = _engine().add_model(path, name=name)
-        print(f"[green]Added model:[/green] {dest}")
+        result = _engine().models.gc(dry_run=dry_run)
+        verb = "Would remove" if dry_run else "Removed"
+        print(
+            f"[green]{verb} {result['removed']} blobs[/green] "
+            f"({_format_bytes(result['freed_bytes'])})."
+        )
+
+    _safe_execute(_run, debug=debug)
+
+
+def _format_bytes(value: Optional[int]) -> str:
+    if value is None:
+        return "unknown"
+    if value < 1024:
+        return f"{value} B"
+    size = value / 1024
+    for unit in ("KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            break
+        size /= 1024
+    return f"{size:.1f} {unit}"
+
+
+@cache_app.command("stats")
+def cache_stats(
+    json_output: bool = typer.Option(False, "--json", help="Emit machine-readable JSON."),
+    debug: bool = typer.Option(False, "--debug", help="Show tracebacks for troubleshooting."),
+):
+    """Scan the cache directory and report its usage."""
+
+    def _run() -> None:
+        data = _engine().cache.stats(refresh=True)
+        if json_output:
+            typer.echo(json.dumps(data, indent=2))
+            return
+        print(f"[cyan]Cache dir:[/cyan] {data['path']}")
+        print(f"[cyan]Files:[/cyan] {data['files']}")
+        print(f"[cyan]Size:[/cyan] {_format_bytes(data['bytes'])}")
+        quota = data["max_bytes"]
+        print(f"[cyan]Quota:[/cyan] {_format_bytes(quota) if quota else 'none'}")
+        max_age = data["max_age_s"]
+        print(f"[cyan]Max age:[/cyan] {f'{max_age / 86400:g} days' if max_age else 'none'}")
+
+    _safe_execute(_run, debug=debug)
+
+
+@cache_app.command("gc")
+def cache_gc(
+    max_mb: Optional[float] = typer.Option(None, "--max-mb", help="Override the size quota."),
+    max_age_days: Optional[float] = typer.Option(
+        None, "--max-age-days", help="Override the maximum entry age."
+    ),
+    debug: bool = typer.Option(False, "--debug", help="Show tracebacks for troubleshooting."),
+):
+    """Evict expired and least recently used cache entries."""
+
+    def _run() -> None:
+        result = _engine().cache.gc(
+            max_bytes=int(max_mb * 1024 * 1024) if max_mb is not None else None,
+            max_age_s=max_age_days * 86400 if max_age_days is not None else None,
+        )
+        print(
+            f"[green]Removed {result['removed']} files[/green] "
+            f"({_format_bytes(result['freed_bytes'])}); {_format_bytes(result['bytes'])} remain."
+        )
+
+    _safe_execute(_run, debug=debug)
+
+
+@cache_app.command("clear")
+def cache_clear(
+    yes: bool = typer.Option(False, "--yes", "-y", help="Do not ask for confirmation."),
+    debug: bool = typer.Option(False, "--debug", help="Show tracebacks for troubleshooting."),
+):
+    """Delete every file in the cache directory."""
+
+    eng = _engine()
+    if not yes:
+        typer.confirm(f"Delete everything in {eng.cfg.cache_dir}?", abort=True)
+
+    def _run() -> None:
+        result = eng.cache.clear()
+        print(
+            f"[green]Removed {result['removed']} files[/green] "
+            f"({_format_bytes(result['freed_bytes'])})."
+        )
+
+    _safe_execute(_run, debug=debug)
+
+
+@script_app.command("import")
+def script_import(
+    project: Path = typer.Argument(..., exists=True, file_okay=False, help="Project directory."),
+    source: Optional[Path] = typer.Option(
+        None, "--from", exists=True, dir_okay=False, help="Import this file instead of scenes.json."
+    ),
+    debug: bool = typer.Option(False, "--debug", help="Show tracebacks for troubleshooting."),
+):
+    """Rebuild the project's script index from scenes.json."""
+
+    def _run() -> None:
+        count = _engine().projects.script(str(project)).import_json(source)
+        print(f"[green]Indexed {count} scenes.[/green]")
+
+    _safe_execute(_run, debug=debug)
+
+
+@script_app.command("export")
+def script_export(
+    project: Path = typer.Argument(..., exists=True, file_okay=False, help="Project directory."),
+    dest: Optional[Path] = typer.Option(
+        None, "--to", help="Write here instead of the project's scenes.json."
+    ),
+    debug: bool = typer.Option(False, "--debug", help="Show tracebacks for troubleshooting."),
+):
+    """Write indexed script edits back to scenes.json."""
+
+    def _run() -> None:
+        path = _engine().projects.script(str(project)).export(dest)
+        print(f"[green]Exported script:[/green] {path}")
+
+    _safe_execute(_run, debug=debug)
+
+
+@phrasebook_app.command("build")
+def phrasebook_build(
+    words: Path = typer.Option(
+        ..., "--words", exists=True, dir_okay=False, help="Word/phrase list, one per line."
+    ),
+    backend: str = typer.Option("piper", "--backend", help="TTS backend name."),
+    model: Optional[Path] = typer.Option(None, "--model", help="Path to Piper .onnx model"),
+    voice: Optional[str] = typer.Option(None, "--voice", help="Voice/speaker id for the backend"),
+    debug: bool = typer.Option(False, "--debug", help="Show tracebacks for troubleshooting."),
+):
+    """Render a word list into a packed phrasebook for one backend/model/voice."""
+
+    def _run() -> None:
+        phrases = read_phrase_list(words.read_text(encoding="utf-8").splitlines())
+        res = _engine().build_phrasebook(phrases, backend=backend, model_path=model, voice=voice)
+        print(f"[green]Built phrasebook:[/green] {res['path']} ({res['phrases']} phrases)")
+
+    _safe_execute(_run, debug=debug)
+
+
+@phrasebook_app.command("list")
+def phrasebook_list(
+    debug: bool = typer.Option(False, "--debug", help="Show tracebacks for troubleshooting."),
+):
+    """List built phrasebooks."""
+
+    def _run() -> None:
+        books = _engine().phrasebooks.list()
+        if not books:
+            print("No phrasebooks. Build one with 'voxengine phrasebook build --words words.txt'")
+            return
+        for book in books:
+            label = book["model"] or book["backend"]
+            print(f"{book['backend']} {label} voice={book['voice']}: {book['phrases']} phrases")
+
+    _safe_execute(_run, debug=debug)
+
+
+def _format_ms(ms: Optional[int]) -> str:
+    if ms is None:
+        return "?"
+    minutes, seconds = divmod(ms / 1000, 60)
+    return f"{int(minutes)}:{seconds:06.3f}"
+
+
+@renders_app.command("timeline")
+def renders_timeline(
+    project: Path = typer.Argument(..., exists=True, file_okay=False, help="Project directory."),
+    longer_than: Optional[int] = typer.Option(
+        None, "--longer-than", help="List lines longer than this many milliseconds."
+    ),
+    refresh: bool = typer.Option(
+        False, "--refresh", help="Re-scan renders/ for files changed outside VoxEngine."
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print JSON output."),
+    debug: bool = typer.Option(False, "--debug", help="Show tracebacks for troubleshooting."),
+):
+    """Show per-scene and total runtime from the project's render index."""
+
+    def _run() -> None:
+        index = _engine().projects.renders(str(project))
+        if refresh:
+            index.refresh()
+        data: Dict[str, Any] = {"total_ms": index.total_ms(), "scenes": index.scenes()}
+        if longer_than is not None:
+            data["lines"] = index.lines(min_ms=longer_than)
+        if as_json:
+            print(json.dumps(data, indent=2))
+            return
+        for scene in data["scenes"]:
+            runtime = _format_ms(scene["duration_ms"])
+            print(f"{scene['scene_id']}: {scene['lines']} lines, {runtime}")
+        print(f"[bold]Total:[/bold] {_format_ms(data['total_ms'])}")
+        for line in data.get("lines", []):
+            print(f"  {line['scene_id']} #{line['index']}: {_format_ms(line['duration_ms'])}")
 
     _safe_execute(_run, debug=debug)
 
@@ -162,8 +453,7 @@ def list_voices(
     """List voices known to a backend (placeholder)."""
 
     def _run() -> None:
-        data = _engine().doctor()
-        names = [b.get("name") for b in data.get("tts_backends", [])]
+        names = [b.get("name") for b in _engine().list_backends()]
         if backend not in names:
             raise MissingDependencyError(f"Backend '{backend}' is not registered.")
         print(
@@ -187,7 +477,11 @@ def speak(
         help="Accessibility profile: screenreader, narration, dialogue.",
         case_sensitive=False,
     ),
-    out_format: str = typer.Option("wav", "--format", help="Audio format (wav)."),
+    out_format: str = typer.Option("wav", "--format", help="Audio format (wav, flac, ogg, opus)."),
+    timings: bool = typer.Option(False, "--timings", help="Print per-stage timings."),
+    profile_out: Optional[Path] = typer.Option(
+        None, "--profile-out", help="Write a cProfile dump of the synthesis to this file."
+    ),
     debug: bool = typer.Option(False, "--debug", help="Show tracebacks for troubleshooting."),
 ):
     """Synthesize speech to a file via the engine."""
@@ -195,17 +489,24 @@ def speak(
     def _run() -> None:
         normalized_profile = profile.lower() if profile else None
         normalized_format = out_format.lower()
-        res = _engine().tts_speak(
-            text=text,
-            out_path=out,
-            backend=backend,
-            model_path=model,
-            voice=voice,
-            profile=normalized_profile,
-            out_format=normalized_format,
-        )
+        eng = _engine()
+        with profile_to(profile_out):
+            res = eng.tts_speak(
+                text=text,
+                out_path=out,
+                backend=backend,
+                model_path=model,
+                voice=voice,
+                profile=normalized_profile,
+                out_format=normalized_format,
+            )
         print(f"[green]Wrote audio:[/green] {res['audio_path']}")
         print(f"[green]Wrote metadata:[/green] {res['meta_path']}")
+        if timings:
+            for stage, ms in res["timings_ms"].items():
+                print(f"[cyan]{stage}:[/cyan] {ms:.1f} ms")
+        if profile_out is not None:
+            print(f"[green]Wrote profile:[/green] {profile_out}")
         if res.get("warnings"):
             print("Warnings:")
             for w in res["warnings"]:
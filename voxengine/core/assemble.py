@@ -0,0 +1,182 @@
+"""Scene master assembly: stream rendered lines into one WAV with a cue index."""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from voxengine.adapters.audio.resample import LinearResampler
+from voxengine.adapters.audio.wavfile import HEADER_SIZE, WavInfo, read_wav_info, wav_header
+from voxengine.core.cache import write_text_atomic
+from voxengine.core.errors import UserConfigError
+
+MASTER_NAME = "master.wav"
+CUES_NAME = "master.cues.json"
+SAMPLE_WIDTH = 2
+
+
+def _out_frames(frames: int, src_rate: int, dst_rate: int) -> int:
+    """Frame count after resampling, matching :class:`LinearResampler`."""
+    if src_rate == dst_rate or frames == 0:
+        return frames
+    return ((frames - 1) * dst_rate) // src_rate + 1
+
+
+def _ms(frames: int, rate: int) -> float:
+    return round(frames * 1000.0 / rate, 3)
+
+
+@dataclass
+class SceneAssembler:
+    """Build ``renders/<scene>/master.wav`` from line renders in constant memory.
+
+    Lines are copied chunk by chunk from memory-mapped inputs into a preallocated,
+    memory-mapped output, separated by ``gap_ms`` of silence. Lines at other sample rates are
+    resampled to ``sample_rate`` (default: the highest rate among the lines). The cue index in
+    ``master.cues.json`` records where every line starts and ends.
+    """
+
+    gap_ms: float = 300.0
+    sample_rate: Optional[int] = None
+    chunk_frames: int = 1 << 16
+
+    def assemble(self, scene_dir: Path, line_paths: Sequence[Path]) -> Dict[str, Any]:
+        if not line_paths:
+            raise UserConfigError(f"No rendered lines to assemble in {scene_dir}.")
+        infos = [read_wav_info(p) for p in line_paths]
+        channels = infos[0].channels
+        for path, info in zip(line_paths, infos):
+            self._check(path, info, channels)
+        rate = self.sample_rate or max(i.sample_rate for i in infos)
+        gap_frames = int(round(self.gap_ms * rate / 1000))
+
+        entries = []
+        cursor = 0
+        for n, (path, info) in enumerate(zip(line_paths, infos)):
+            frames = _out_frames(info.frames, info.sample_rate, rate)
+            entries.append(self._entry(n + 1, Path(path), info, cursor, frames, rate))
+            cursor += frames + (gap_frames if n + 1 < len(infos) else 0)
+
+        frame_size = channels * SAMPLE_WIDTH
+        data_size = cursor * frame_size
+        master = scene_dir / MASTER_NAME
+        tmp = scene_dir / f".{MASTER_NAME}.part"
+        scene_dir.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w+b") as fh:
+            fh.write(wav_header(rate, channels, SAMPLE_WIDTH, data_size))
+            fh.truncate(HEADER_SIZE + data_size)  # sparse preallocation; gaps stay zero
+            if data_size:
+                with mmap.mmap(fh.fileno(), 0) as out:
+                    for entry, path, info in zip(entries, line_paths, infos):
+                        offset = HEADER_SIZE + entry["start_frame"] * frame_size
+                        self._copy(out, offset, Path(path), info, rate, entry["frames"])
+        os.replace(tmp, master)
+
+        cues = {
+            "master": MASTER_NAME,
+            "sample_rate": rate,
+            "channels": channels,
+            "gap_ms": self.gap_ms,
+            "frames": cursor,
+            "duration_ms": _ms(cursor, rate),
+            "lines": entries,
+        }
+        write_text_atomic(scene_dir / CUES_NAME, json.dumps(cues, indent=2))
+        return cues
+
+    def patch(self, scene_dir: Path, index: int, line_path: Path) -> Dict[str, Any]:
+        """Splice a re-rendered line into an existing master in place.
+
+        Only the line's region and the audio after it are touched; when the new take has a
+        different length the tail is shifted inside the mapped file and later cues move with it.
+        """
+        cues_path = scene_dir / CUES_NAME
+        cues = json.loads(cues_path.read_text(encoding="utf-8"))
+        pos = next((i for i, e in enumerate(cues["lines"]) if e["index"] == index), None)
+        if pos is None:
+            raise UserConfigError(f"Line {index} is not part of {scene_dir / MASTER_NAME}.")
+        entry = cues["lines"][pos]
+        rate, channels = cues["sample_rate"], cues["channels"]
+        info = read_wav_info(line_path)
+        self._check(line_path, info, channels)
+        new_frames = _out_frames(info.frames, info.sample_rate, rate)
+        delta_frames = new_frames - entry["frames"]
+        frame_size = channels * SAMPLE_WIDTH
+        delta = delta_frames * frame_size
+
+        with open(scene_dir / MASTER_NAME, "r+b") as fh:
+            size = fh.seek(0, os.SEEK_END)
+            region = HEADER_SIZE + entry["start_frame"] * frame_size
+            tail = region + entry["frames"] * frame_size
+            if delta > 0:
+                fh.truncate(size + delta)
+            with mmap.mmap(fh.fileno(), 0) as mm:
+                if delta and size > tail:
+                    mm.move(tail + delta, tail, size - tail)
+                if new_frames:
+                    self._copy(mm, region, line_path, info, rate, new_frames)
+                data_size = size + delta - HEADER_SIZE
+                mm[:HEADER_SIZE] = wav_header(rate, channels, SAMPLE_WIDTH, data_size)
+            if delta < 0:
+                fh.truncate(size + delta)
+
+        cues["lines"][pos] = self._entry(
+            index, line_path, info, entry["start_frame"], new_frames, rate
+        )
+        for later in cues["lines"][pos + 1 :]:
+            later["start_frame"] += delta_frames
+            later["start_ms"] = _ms(later["start_frame"], rate)
+            later["end_ms"] = _ms(later["start_frame"] + later["frames"], rate)
+        cues["frames"] += delta_frames
+        cues["duration_ms"] = _ms(cues["frames"], rate)
+        write_text_atomic(cues_path, json.dumps(cues, indent=2))
+        return cues
+
+    @staticmethod
+    def _check(path: Path, info: WavInfo, channels: int) -> None:
+        if info.sample_width != SAMPLE_WIDTH:
+            raise UserConfigError(f"Scene assembly needs 16-bit PCM lines: {path}")
+        if info.channels != channels:
+            raise UserConfigError(f"Line has {info.channels} channels, expected {channels}: {path}")
+
+    @staticmethod
+    def _entry(
+        index: int, path: Path, info: WavInfo, start: int, frames: int, rate: int
+    ) -> Dict[str, Any]:
+        return {
+            "index": index,
+            "file": path.name,
+            "start_frame": start,
+            "frames": frames,
+            "start_ms": _ms(start, rate),
+            "end_ms": _ms(start + frames, rate),
+            "source_rate": info.sample_rate,
+        }
+
+    def _copy(
+        self, out: mmap.mmap, offset: int, path: Path, info: WavInfo, rate: int, frames: int
+    ) -> None:
+        frame_size = info.frame_size
+        limit = frames * frame_size
+        data_len = info.frames * frame_size
+        if data_len == 0:
+            return
+        step = self.chunk_frames * frame_size
+        with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as src:
+            start = info.data_offset
+            if info.sample_rate == rate:
+                for pos in range(0, min(limit, data_len), step):
+                    n = min(step, limit - pos, data_len - pos)
+                    out[offset + pos : offset + pos + n] = src[start + pos : start + pos + n]
+                return
+            resampler = LinearResampler(info.sample_rate, rate, info.channels)
+            written = 0
+            for pos in range(0, data_len, step):
+                block = resampler.process(src[start + pos : start + min(pos + step, data_len)])
+                block = block[: limit - written]
+                out[offset + written : offset + written + len(block)] = block
+                written += len(block)
@@ -1,8 +1,21 @@
-"""Caching helpers (starter)."""
+"""Caching helpers and the cache directory garbage collector."""
 
 from __future__ import annotations
+import errno
 import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from voxengine.core.logging import get_logger
+
+log = get_logger("voxengine.cache")
 
 def cache_key(*parts: str) -> str:
     h = hashlib.sha256()
@@ -15,3 +28,290 @@ def ensure_dir(path: str | Path) -> Path:
     p = Path(path)
     p.mkdir(parents=True, exist_ok=True)
     return p
+
+def write_text_atomic(path: str | Path, text: str) -> Path:
+    """Write ``text`` to a sibling temp file and rename it over ``path``."""
+    p = Path(path)
+    tmp = p.with_name(f".{p.name}.{uuid.uuid4().hex[:8]}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, p)
+    return p
+
+
+def move_atomic(src: str | Path, dest: str | Path) -> Path:
+    """Rename ``src`` over ``dest``; across filesystems, copy to a sibling temp file first."""
+    src, dest = Path(src), Path(dest)
+    try:
+        os.replace(src, dest)
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+        tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex[:8]}.tmp")
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dest)
+        src.unlink()
+    return dest
+
+
+def move_render(src: str | Path, dest: str | Path) -> Dict[str, Any]:
+    """Move a rendered audio file and its JSON sidecar to ``dest``; returns the sidecar.
+
+    The sidecar's paths are rewritten to the new location. It lands before the audio, so
+    ``dest`` only ever appears complete.
+    """
+    src, dest = Path(src), Path(dest)
+    src_meta, meta_path = src.with_suffix(".json"), dest.with_suffix(".json")
+    metadata = json.loads(src_meta.read_text(encoding="utf-8"))
+    metadata.update(audio_path=str(dest), meta_path=str(meta_path))
+    write_text_atomic(meta_path, json.dumps(metadata, indent=2))
+    move_atomic(src, dest)
+    src_meta.unlink(missing_ok=True)
+    return metadata
+
+
+# Hidden files younger than this are treated as in-flight temp files and left alone.
+TEMP_GRACE_S = 3600.0
+# Access-time histogram resolution used to pick an LRU cutoff without holding every entry.
+BUCKET_S = 60.0
+
+
+@dataclass
+class CacheScan:
+    files: int = 0
+    bytes: int = 0
+    oldest_access: Optional[float] = None
+    histogram: Dict[int, int] = field(default_factory=dict)
+
+
+class CacheManager:
+    """Keep a cache directory within a size quota and maximum age, evicting LRU files first.
+
+    Scans walk the tree with ``os.scandir`` in batches of ``batch_size`` entries, pausing
+    ``pause_s`` between batches, and keep only a coarse access-time histogram in memory, so a
+    collection over millions of files runs in constant memory without monopolizing the disk.
+    Between scans the manager tracks usage from :meth:`note_write` and starts a background
+    collection as soon as the quota is exceeded.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        max_bytes: Optional[int] = None,
+        max_age_s: Optional[float] = None,
+        low_water: float = 0.9,
+        batch_size: int = 2000,
+        pause_s: float = 0.002,
+        exclude: Iterable[str] = (),
+    ) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self.low_water = low_water
+        self.batch_size = max(1, batch_size)
+        self.pause_s = pause_s
+        self.exclude = set(exclude)
+        self._lock = threading.Lock()
+        self._gc_running = threading.Lock()
+        self._bytes: Optional[int] = None
+        self._files: Optional[int] = None
+        self._last_scan_at: Optional[float] = None
+        self._last_gc: Optional[Dict[str, Any]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -- accounting -------------------------------------------------------------------------
+
+    def note_write(self, *paths: str | Path) -> None:
+        """Account for newly written files and trigger a collection when over quota."""
+        added = 0
+        for p in paths:
+            try:
+                added += os.stat(p).st_size
+            except OSError:
+                continue
+        with self._lock:
+            if self._bytes is not None:
+                self._bytes += added
+                self._files = (self._files or 0) + len(paths)
+            over = self.max_bytes is not None and (
+                self._bytes is None or self._bytes > self.max_bytes
+            )
+        if over:
+            self.gc_async()
+
+    def touch(self, path: str | Path) -> None:
+        """Record an access so LRU eviction keeps recently used entries (and their sidecars).
+
+        Paths outside the cache are left alone: their mtimes belong to their owners, such as
+        project renders whose index re-hashes files that look modified.
+        """
+        p = Path(path).resolve()
+        if not p.is_relative_to(self.root.resolve()):
+            return
+        for candidate in (p, p.with_suffix(".json")):
+            try:
+                os.utime(candidate)
+            except OSError:
+                pass
+
+    def stats(self, refresh: bool = False) -> Dict[str, Any]:
+        """Cache usage; ``refresh`` rescans the directory, otherwise tracked totals are used."""
+        oldest = None
+        if refresh:
+            scan = self._scan(time.time())
+            oldest = scan.oldest_access
+        with self._lock:
+            return {
+                "path": str(self.root),
+                "bytes": self._bytes,
+                "files": self._files,
+                "max_bytes": self.max_bytes,
+                "max_age_s": self.max_age_s,
+                "oldest_access": oldest,
+                "last_scan_at": self._last_scan_at,
+                "last_gc": self._last_gc,
+            }
+
+    # -- collection -------------------------------------------------------------------------
+
+    def gc(
+        self, max_bytes: Optional[int] = None, max_age_s: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Delete expired entries, then least recently used ones until under the low-water mark."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        max_age_s = self.max_age_s if max_age_s is None else max_age_s
+        with self._gc_running:
+            now = time.time()
+            scan = self._scan(now)
+            cutoff = self._cutoff(scan, now, max_bytes, max_age_s)
+            removed, freed = (0, 0) if cutoff is None else self._evict_older_than(cutoff, now)
+            result = {
+                "removed": removed,
+                "freed_bytes": freed,
+                "bytes": scan.bytes - freed,
+                "files": scan.files - removed,
+                "at": now,
+            }
+            with self._lock:
+                self._bytes = scan.bytes - freed
+                self._files = scan.files - removed
+                self._last_gc = result
+            if removed:
+                log.info("Cache GC removed %d files (%d bytes) from %s", removed, freed, self.root)
+            return result
+
+    def gc_async(self) -> None:
+        """Run :meth:`gc` on a daemon thread unless one is already running."""
+        if self._gc_running.locked():
+            return
+        threading.Thread(target=self._gc_quietly, name="voxengine-cache-gc", daemon=True).start()
+
+    def clear(self) -> Dict[str, Any]:
+        """Delete every cache entry."""
+        with self._gc_running:
+            removed, freed = self._evict_older_than(float("inf"), time.time())
+            with self._lock:
+                self._bytes, self._files = 0, 0
+            return {"removed": removed, "freed_bytes": freed}
+
+    def start(self, interval_s: float = 300.0) -> None:
+        """Collect periodically on a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def loop() -> None:
+            while not self._stop.wait(interval_s):
+                self._gc_quietly()
+
+        self._thread = threading.Thread(target=loop, name="voxengine-cache-gc-loop", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    # -- internals --------------------------------------------------------------------------
+
+    def _gc_quietly(self) -> None:
+        try:
+            self.gc()
+        except Exception:  # noqa: BLE001
+            log.exception("Cache GC failed for %s", self.root)
+
+    def _cutoff(
+        self,
+        scan: CacheScan,
+        now: float,
+        max_bytes: Optional[int],
+        max_age_s: Optional[float],
+    ) -> Optional[float]:
+        cutoff = now - max_age_s if max_age_s is not None else None
+        if max_bytes is not None and scan.bytes > max_bytes:
+            target = scan.bytes - int(max_bytes * self.low_water)
+            freed = 0
+            for bucket in sorted(scan.histogram):
+                freed += scan.histogram[bucket]
+                if freed >= target:
+                    quota_cutoff = (bucket + 1) * BUCKET_S
+                    cutoff = quota_cutoff if cutoff is None else max(cutoff, quota_cutoff)
+                    break
+        return cutoff
+
+    def _iter_files(self, now: float) -> Iterator[Tuple[str, os.stat_result]]:
+        if not self.root.exists():
+            return
+        stack = [str(self.root)]
+        seen = 0
+        while stack:
+            top = stack.pop()
+            try:
+                it = os.scandir(top)
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    seen += 1
+                    if seen % self.batch_size == 0 and self.pause_s:
+                        time.sleep(self.pause_s)
+                    if entry.name in self.exclude:
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if entry.name.startswith(".") and now - st.st_mtime < TEMP_GRACE_S:
+                        continue
+                    yield entry.path, st
+
+    def _scan(self, now: float) -> CacheScan:
+        scan = CacheScan()
+        for _, st in self._iter_files(now):
+            access = max(st.st_atime, st.st_mtime)
+            scan.files += 1
+            scan.bytes += st.st_size
+            bucket = int(access // BUCKET_S)
+            scan.histogram[bucket] = scan.histogram.get(bucket, 0) + st.st_size
+            if scan.oldest_access is None or access < scan.oldest_access:
+                scan.oldest_access = access
+        with self._lock:
+            self._bytes, self._files, self._last_scan_at = scan.bytes, scan.files, now
+        return scan
+
+    def _evict_older_than(self, cutoff: float, now: float) -> Tuple[int, int]:
+        removed = freed = 0
+        for path, st in self._iter_files(now):
+            if max(st.st_atime, st.st_mtime) >= cutoff:
+                continue
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            removed += 1
+            freed += st.st_size
+        return removed, freed
@@ -0,0 +1,105 @@
+"""Cancellation tokens and per-session "latest utterance wins" tracking."""
+
+from __future__ import annotations
+
+import threading
+from typing import Callable, Dict, List, Optional
+
+from voxengine.core.errors import CancelledError
+from voxengine.core.logging import get_logger
+
+log = get_logger("voxengine.cancel")
+
+
+class CancelToken:
+    """Thread-safe, one-shot cancellation signal passed down to adapters.
+
+    Long-running work either polls :attr:`cancelled` / :meth:`raise_if_cancelled` between steps
+    or registers an :meth:`on_cancel` callback (for example to kill a subprocess).
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self.reason: Optional[str] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "cancelled") -> bool:
+        """Fire the token; returns ``False`` if it had already fired."""
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:  # noqa: BLE001
+                log.exception("Cancel callback failed")
+        return True
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Run ``callback`` when the token fires (now, if it already has).
+
+        Returns a function that unregisters the callback.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+
+                def remove() -> None:
+                    with self._lock:
+                        if callback in self._callbacks:
+                            self._callbacks.remove(callback)
+
+                return remove
+        callback()
+        return lambda: None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise CancelledError(f"Cancelled: {self.reason}")
+
+
+class SpeechSessions:
+    """Track the in-flight utterance per session so a newer one supersedes it.
+
+    :meth:`begin` cancels whatever the session was still synthesizing (or waiting to
+    synthesize) and returns a fresh token for the new request; :meth:`flush` cancels without
+    starting anything new.
+    """
+
+    def __init__(self) -> None:
+        self._current: Dict[str, CancelToken] = {}
+        self._lock = threading.Lock()
+
+    def begin(self, session_id: str) -> CancelToken:
+        token = CancelToken()
+        with self._lock:
+            previous = self._current.get(session_id)
+            self._current[session_id] = token
+        if previous is not None:
+            previous.cancel("superseded by a newer utterance")
+        return token
+
+    def end(self, session_id: str, token: CancelToken) -> None:
+        with self._lock:
+            if self._current.get(session_id) is token:
+                del self._current[session_id]
+
+    def flush(self, session_id: str) -> bool:
+        """Cancel the session's in-flight utterance; ``False`` if there was none."""
+        with self._lock:
+            token = self._current.pop(session_id, None)
+        return token is not None and token.cancel("flushed")
+
+    def __len__(self) -> int:
+        return len(self._current)
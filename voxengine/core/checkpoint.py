@@ -0,0 +1,259 @@
+"""Checkpoint journals for resumable scene renders.
+
+Every local scene render job keeps a journal in the checkpoint directory
+(``<cache_dir>/checkpoints/<job_id>.jsonl`` by default). The first entry describes the job:
+project, scene, voice map and options. Each line that is finished appends its path, size,
+content hash and text hash, flushed and fsynced before the job moves on. Appending keeps a
+checkpoint O(1) per line even for scenes with thousands of lines. A torn trailing entry, left
+by a crash mid-write, is ignored. The journal is deleted once the job finishes, whether it
+succeeded, failed or was cancelled.
+
+The process running a job holds an exclusive ``flock`` on its journal until the job ends, and
+the job entry records the owner's PID and host. A journal that is still there but not locked
+belongs to a job whose process did not live to finish it; one that is locked belongs to a job
+still running, possibly in another process sharing the directory (``uvicorn --workers``, a
+rolling deploy, the CLI). At startup :meth:`Engine.resume_renders` claims the lock of each
+unlocked journal and restarts the job under its old job ID. Lines whose file still matches the
+journal and whose script text is unchanged are kept; every other line is rendered again. Line
+files are written to a temp name that carries the job ID and renamed into place (see
+:func:`voxengine.core.cache.move_render`), so a crash never leaves a partial file under a real
+line name. Once a job is claimed, the temp files it left are removed; those of other jobs are
+not. Without ``fcntl`` a journal is claimed only when its owner was on this host and that PID
+no longer exists.
+"""
+
+from __future__ import annotations
+
+import glob
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from voxengine.adapters.audio.wavfile import read_wav_info
+from voxengine.core.errors import UserConfigError
+from voxengine.core.logging import get_logger
+from voxengine.project.renders import file_hash, text_hash
+
+try:
+    import fcntl
+except ImportError:  # not on POSIX
+    fcntl = None  # type: ignore[assignment]
+
+log = get_logger("voxengine.checkpoint")
+
+SUFFIX = ".jsonl"
+
+
+def _owner() -> Dict[str, Any]:
+    return {"pid": os.getpid(), "host": socket.gethostname()}
+
+
+def _owner_alive(owner: Optional[Dict[str, Any]]) -> bool:
+    """Whether the recorded owner may still be running; only provably dead owners are not."""
+    if not owner or owner.get("host") != socket.gethostname():
+        return True
+    try:
+        os.kill(int(owner["pid"]), 0)
+    except ProcessLookupError:
+        return False
+    except (OSError, KeyError, ValueError):
+        return True
+    return True
+
+
+def _try_lock(fd: int, owner: Optional[Dict[str, Any]]) -> bool:
+    if fcntl is None:
+        return not _owner_alive(owner)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
+
+
+@dataclass
+class CheckpointState:
+    """A journal as read back from disk."""
+
+    path: Path
+    job: Dict[str, Any]
+    lines: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+
+    @property
+    def job_id(self) -> str:
+        return self.job["job_id"]
+
+    def verified(self, index: int, text: str) -> Optional[str]:
+        """Path of line ``index`` if its file is intact and was rendered from ``text``."""
+        entry = self.lines.get(index)
+        if entry is None or entry.get("text_hash") != text_hash(text):
+            return None
+        path = Path(entry["path"])
+        try:
+            if path.stat().st_size != entry["size"] or file_hash(path) != entry["content_hash"]:
+                return None
+            if path.suffix.lower() == ".wav":
+                read_wav_info(path)
+        except (OSError, UserConfigError):
+            return None
+        return str(path)
+
+
+class RenderCheckpoint:
+    """Append-only journal for one render job, locked by the process running the job."""
+
+    def __init__(self, path: Path, fd: int) -> None:
+        self.path = Path(path)
+        self._fd: Optional[int] = fd  # open for appending; holds the journal's lock
+        self._lock = threading.Lock()
+
+    @property
+    def job_id(self) -> str:
+        return self.path.name[: -len(SUFFIX)]
+
+    @classmethod
+    def start(cls, directory: Path, job: Dict[str, Any]) -> "RenderCheckpoint":
+        """Write the job entry of a new journal and hold its lock until the job ends."""
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{job['job_id']}{SUFFIX}"
+        header = dict(job, type="job", created_at=time.time(), owner=_owner())
+        # Locked before it is renamed into place, so no other process can claim it first.
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        fd = os.open(tmp, os.O_RDWR | os.O_APPEND | os.O_CREAT | os.O_EXCL, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)  # nobody else knows the name yet
+            os.write(fd, (json.dumps(header) + "\n").encode("utf-8"))
+            os.fsync(fd)
+            os.replace(tmp, path)
+        except BaseException:
+            os.close(fd)
+            tmp.unlink(missing_ok=True)
+            raise
+        return cls(path, fd)
+
+    @classmethod
+    def claim(cls, state: CheckpointState) -> Optional["RenderCheckpoint"]:
+        """Take over an interrupted job's journal; ``None`` while its owner may be running."""
+        try:
+            fd = os.open(state.path, os.O_RDWR | os.O_APPEND)
+        except FileNotFoundError:
+            return None
+        try:
+            if not _try_lock(fd, state.job.get("owner")):
+                os.close(fd)
+                return None
+            size = os.fstat(fd).st_size
+            if os.fstat(fd).st_nlink == 0 or size == 0:
+                os.close(fd)  # the job finished and discarded it while we waited
+                return None
+            if os.pread(fd, 1, size - 1) != b"\n":
+                os.write(fd, b"\n")  # close off a torn entry before appending after it
+        except BaseException:
+            os.close(fd)
+            raise
+        checkpoint = cls(state.path, fd)
+        checkpoint._append({"type": "owner", "owner": _owner()})
+        return checkpoint
+
+    def line(self, index: int, path: str, row: Dict[str, Any]) -> None:
+        """Record finished line ``index`` at ``path``, with hashes from its render index row."""
+        self._append(
+            {
+                "type": "line",
+                "index": index,
+                "path": path,
+                "size": row["size"],
+                "content_hash": row["content_hash"],
+                "text_hash": row["text_hash"],
+            }
+        )
+
+    def discard(self) -> None:
+        """Drop the journal once the job has finished; there is nothing left to resume."""
+        self.path.unlink(missing_ok=True)  # while still locked, so nobody claims it first
+        self.close()
+
+    def close(self) -> None:
+        """Release the journal's lock but keep it, as a process that dies would."""
+        with self._lock:
+            fd, self._fd = self._fd, None
+        if fd is not None:
+            os.close(fd)
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        data = (json.dumps(entry) + "\n").encode("utf-8")
+        with self._lock:
+            if self._fd is None:
+                raise ValueError(f"Checkpoint {self.path} is closed")
+            os.write(self._fd, data)
+            os.fsync(self._fd)
+
+    @staticmethod
+    def load(path: Path) -> Optional[CheckpointState]:
+        """Read a journal; ``None`` if its job entry is missing or unreadable."""
+        try:
+            raw = Path(path).read_bytes().split(b"\n")
+        except OSError:
+            return None
+        state: Optional[CheckpointState] = None
+        for n, chunk in enumerate(raw):
+            if not chunk.strip():
+                continue
+            try:
+                entry = json.loads(chunk)
+            except ValueError:
+                if n < len(raw) - 1 and any(c.strip() for c in raw[n + 1 :]):
+                    log.warning("Skipping corrupt entry %d in %s", n + 1, path)
+                continue  # a torn last entry: the line is simply rendered again
+            kind = entry.get("type")
+            if state is None:
+                if kind != "job" or "job_id" not in entry:
+                    log.warning("Ignoring %s: it does not start with a job entry", path)
+                    return None
+                state = CheckpointState(Path(path), entry)
+            elif kind == "line":
+                state.lines[int(entry["index"])] = entry
+            elif kind == "owner":
+                state.job["owner"] = entry.get("owner")
+        return state
+
+
+def interrupted(directory: Path) -> List[CheckpointState]:
+    """Journals of unfinished jobs in ``directory``, oldest first.
+
+    Some may belong to jobs still running in other processes; :meth:`RenderCheckpoint.claim`
+    tells them apart.
+    """
+    if not directory.exists():
+        return []
+    states = [RenderCheckpoint.load(path) for path in directory.glob(f"*{SUFFIX}")]
+    found = [s for s in states if s is not None]
+    return sorted(found, key=lambda s: s.job.get("created_at", 0))
+
+
+def partial_name(out_path: Path, job_id: Optional[str] = None) -> Path:
+    """Temp name to render ``out_path`` under; it carries ``job_id`` for :func:`remove_partials`."""
+    tag = f"{job_id}." if job_id else ""
+    return out_path.with_name(f".{out_path.stem}.{tag}{uuid.uuid4().hex[:8]}{out_path.suffix}")
+
+
+def remove_partials(scene_dir: Path, job_id: str) -> int:
+    """Delete temp files a crashed job left in ``scene_dir``; returns how many.
+
+    Only call this for a job whose journal was claimed; other jobs' files are left alone.
+    """
+    removed = 0
+    for path in scene_dir.glob(f".line_*.{glob.escape(job_id)}.*"):
+        try:
+            path.unlink()
+            removed += 1
+        except OSError:
+            pass
+    return removed
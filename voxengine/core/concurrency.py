@@ -0,0 +1,294 @@
+"""Adaptive per-backend concurrency limits.
+
+Each backend gets an :class:`AdaptiveLimiter` that caps how many syntheses run at once and tunes
+the cap with AIMD: while latency per unit of work (per character of text) stays near its
+no-load baseline and requests are queueing, the limit grows by one; when latency rises well above
+the baseline, or free memory runs low, it is cut multiplicatively. The limit never exceeds the
+usable cores.
+
+Backends pay a fixed cost per call (Piper starts a process and loads its model), so a short
+text always costs more per character than a long one. Baselines are therefore kept per length
+bucket, a quarter of an octave wide, and each request is compared with requests of similar
+length only. A mix of short and long texts at constant load then reads as constant latency.
+
+Interactive requests (:data:`~voxengine.core.workers.PRIORITY_INTERACTIVE`) wait ahead of batch
+work: a freed slot goes to a waiting interactive request first, so renders are the work that
+queues when a node is saturated.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from voxengine.core.cancel import CancelToken
+from voxengine.core.logging import get_logger
+from voxengine.core.workers import PRIORITY_BATCH, PRIORITY_INTERACTIVE
+
+log = get_logger("voxengine.concurrency")
+
+BUCKETS_PER_OCTAVE = 4
+
+
+def _bucket(cost: float) -> int:
+    """Length bucket of a request: costs within a quarter octave share a baseline."""
+    return int(round(BUCKETS_PER_OCTAVE * math.log2(max(cost, 1.0))))
+
+
+def usable_cores() -> int:
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except (AttributeError, OSError):
+        return max(1, os.cpu_count() or 1)
+
+
+def available_memory_mb() -> Optional[float]:
+    """``MemAvailable`` from ``/proc/meminfo``; ``None`` where that is not available."""
+    try:
+        with open("/proc/meminfo", "rb") as fh:
+            for line in fh:
+                if line.startswith(b"MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class AdaptiveLimiter:
+    """Concurrency cap for one backend, adjusted from observed latency."""
+
+    def __init__(
+        self,
+        name: str,
+        initial: int = 2,
+        min_limit: int = 1,
+        max_limit: Optional[int] = None,
+        adaptive: bool = True,
+        window: int = 10,
+        tolerance: float = 1.5,
+        backoff: float = 0.7,
+        min_free_mb: Optional[float] = 256.0,
+    ) -> None:
+        self.name = name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit or usable_cores())
+        self.limit = min(max(initial, self.min_limit), self.max_limit)
+        self.adaptive = adaptive
+        self.window = max(1, window)
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.min_free_mb = min_free_mb
+        self.inflight = 0
+        self.waiting = 0
+        self.waiting_interactive = 0
+        self.overtakes = 0  # interactive requests granted a slot while batch work waited
+        self.adjustments = 0
+        self._baselines: Dict[int, float] = {}  # best ms per unit of work, per length bucket
+        self._samples: List[float] = []  # latency relative to the sample's bucket baseline
+        self._waited_in_window = False
+        self._completions: Deque[float] = deque(maxlen=200)
+        self._recent: Optional[float] = None  # window median of those ratios
+        self._request_ms: Optional[float] = None  # moving average of whole-request time
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(
+        self,
+        cost: float = 1.0,
+        cancel: Optional[CancelToken] = None,
+        priority: int = PRIORITY_BATCH,
+    ) -> Iterator[int]:
+        """Hold one unit of concurrency; yields the limit in force when the slot was granted."""
+        interactive = priority <= PRIORITY_INTERACTIVE
+        with self._cond:
+            if self._blocked(interactive):
+                self.waiting += 1
+                self.waiting_interactive += interactive
+                self._waited_in_window = True
+                try:
+                    while self._blocked(interactive):
+                        if cancel is not None:
+                            cancel.raise_if_cancelled()
+                        self._cond.wait(0.05 if cancel is not None else None)
+                finally:
+                    self.waiting -= 1
+                    self.waiting_interactive -= interactive
+            if interactive and self.waiting > self.waiting_interactive:
+                self.overtakes += 1
+            self.inflight += 1
+            limit = self.limit
+        start = time.perf_counter()
+        ok = False
+        try:
+            yield limit
+            ok = True
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._cond:
+                self.inflight -= 1
+                if ok:
+                    self._record(elapsed_ms, cost)
+                    prev = self._request_ms
+                    self._request_ms = elapsed_ms if prev is None else 0.8 * prev + 0.2 * elapsed_ms
+                # Waiters differ in priority, so wake them all and let the predicate decide.
+                self._cond.notify_all()
+
+    def _blocked(self, interactive: bool) -> bool:
+        if self.inflight >= self.limit:
+            return True
+        return not interactive and self.waiting_interactive > 0
+
+    def estimate_wait_ms(self, priority: int = PRIORITY_BATCH) -> float:
+        """Rough time a new request of ``priority`` would wait for a slot right now."""
+        interactive = priority <= PRIORITY_INTERACTIVE
+        with self._cond:
+            if not self._blocked(interactive) or self._request_ms is None:
+                return 0.0
+            ahead = self.waiting_interactive if interactive else self.waiting
+            return (1 + ahead // self.limit) * self._request_ms
+
+    def estimate_ms(self, cost: float) -> float:
+        """Expected synthesis time for ``cost`` units of work at current latency."""
+        if not self._baselines:
+            return 0.0
+        bucket = _bucket(cost)
+        nearest = min(self._baselines, key=lambda b: abs(b - bucket))
+        return self._baselines[nearest] * max(cost, 1.0) * (self._recent or 1.0)
+
+    def _record(self, elapsed_ms: float, cost: float = 1.0) -> None:
+        self._completions.append(time.monotonic())
+        per_unit_ms = elapsed_ms / max(cost, 1.0)
+        bucket = _bucket(cost)
+        # Each baseline tracks the best recent latency for its bucket, drifting up slowly so it
+        # can recover from an unusually fast outlier.
+        baseline = self._baselines.get(bucket)
+        if baseline is None or per_unit_ms < baseline:
+            baseline = per_unit_ms
+        else:
+            baseline *= 1.01
+        self._baselines[bucket] = baseline
+        self._samples.append(per_unit_ms / baseline if baseline > 0 else 1.0)
+        if len(self._samples) < self.window:
+            return
+        samples, self._samples = sorted(self._samples), []
+        self._recent = samples[len(samples) // 2]
+        waited, self._waited_in_window = self._waited_in_window, False
+        if not self.adaptive:
+            return
+        free = available_memory_mb()
+        low_memory = free is not None and self.min_free_mb is not None and free < self.min_free_mb
+        if low_memory or self._recent > self.tolerance:
+            new = max(self.min_limit, int(self.limit * self.backoff))
+        elif waited:
+            new = min(self.max_limit, self.limit + 1)
+        else:
+            return
+        if new != self.limit:
+            log.info(
+                "%s concurrency %d -> %d (median latency %.2fx baseline%s)",
+                self.name,
+                self.limit,
+                new,
+                self._recent,
+                ", low memory" if low_memory else "",
+            )
+            self.limit = new
+            self.adjustments += 1
+            self._cond.notify_all()
+
+    def throughput(self, horizon_s: float = 60.0) -> float:
+        """Completed syntheses per second over the last ``horizon_s`` (or fewer) seconds."""
+        now = time.monotonic()
+        recent = [t for t in list(self._completions) if now - t <= horizon_s]
+        if len(recent) < 2:
+            return 0.0
+        return round((len(recent) - 1) / max(recent[-1] - recent[0], 1e-6), 3)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "limit": self.limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "adaptive": self.adaptive,
+            "inflight": self.inflight,
+            "waiting": self.waiting,
+            "waiting_interactive": self.waiting_interactive,
+            "interactive_overtakes": self.overtakes,
+            "adjustments": self.adjustments,
+            # Keyed by the shortest text length, in characters, that falls in each bucket.
+            "baseline_ms_per_char": {
+                str(math.ceil(2 ** ((b - 0.5) / BUCKETS_PER_OCTAVE))): round(v, 3)
+                for b, v in sorted(self._baselines.items())
+            },
+            "latency_ratio": round(self._recent, 3) if self._recent else None,
+            "throughput_per_s": self.throughput(),
+        }
+
+
+class ConcurrencyController:
+    """Hands out per-backend limiters and the thread cap passed to backend processes."""
+
+    def __init__(
+        self,
+        max_limit: Optional[int] = None,
+        adaptive: bool = True,
+        initial: int = 2,
+        backend_threads: Optional[str] = None,
+    ) -> None:
+        self.cores = usable_cores()
+        self.max_limit = min(max_limit or self.cores, self.cores) if adaptive else max_limit
+        self.adaptive = adaptive
+        self.initial = initial if adaptive else (max_limit or self.cores)
+        self.backend_threads = backend_threads
+        self._limiters: Dict[str, AdaptiveLimiter] = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, backend: str) -> AdaptiveLimiter:
+        with self._lock:
+            limiter = self._limiters.get(backend)
+            if limiter is None:
+                limiter = self._limiters[backend] = AdaptiveLimiter(
+                    backend,
+                    initial=self.initial,
+                    max_limit=self.max_limit,
+                    adaptive=self.adaptive,
+                )
+            return limiter
+
+    @contextmanager
+    def slot(
+        self,
+        backend: str,
+        cost: float = 1.0,
+        cancel: Optional[CancelToken] = None,
+        priority: int = PRIORITY_BATCH,
+    ) -> Iterator[Optional[int]]:
+        """Run one synthesis under ``backend``'s limit; yields its thread cap (or ``None``)."""
+        with self.limiter(backend).slot(cost=cost, cancel=cancel, priority=priority) as limit:
+            yield self.threads_for(limit)
+
+    def threads_for(self, limit: int) -> Optional[int]:
+        """Threads each backend process may use: fixed, ``auto`` (cores / limit), or unset."""
+        if not self.backend_threads:
+            return None
+        if self.backend_threads == "auto":
+            return max(1, self.cores // max(1, limit))
+        return max(1, int(self.backend_threads))
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            limiters: List[Tuple[str, AdaptiveLimiter]] = sorted(self._limiters.items())
+        return {
+            "cores": self.cores,
+            "adaptive": self.adaptive,
+            "max_limit": self.max_limit,
+            "backend_threads": self.backend_threads,
+            "memory_available_mb": available_memory_mb(),
+            "backends": [limiter.snapshot() for _, limiter in limiters],
+        }
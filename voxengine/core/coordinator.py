@@ -0,0 +1,229 @@
+"""Shared render coordinator for multi-node rendering.
+
+The coordinator is a SQLite file that API servers and ``voxengine worker`` processes open
+together (locally or on a network mount). A scene render is split into line batches; workers
+lease a batch, renew the lease with heartbeats while rendering, and report the result. A lease
+that is not renewed expires and the batch goes back to the pool, so a dead worker only costs the
+batch it was holding.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    project_path TEXT NOT NULL,
+    scene_id TEXT NOT NULL,
+    total_lines INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    line_count INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    voice TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, task_id);
+CREATE INDEX IF NOT EXISTS tasks_job ON tasks (job_id);
+"""
+
+# Indexes on columns added after the first release; created once the columns exist.
+LATE_SCHEMA = """
+CREATE INDEX IF NOT EXISTS tasks_voice ON tasks (status, voice, task_id);
+"""
+
+
+@dataclass(frozen=True)
+class RenderTask:
+    """A leased batch of lines."""
+
+    task_id: int
+    job_id: str
+    payload: Dict[str, Any]
+    attempts: int
+
+
+class RenderCoordinator:
+    """Lease-based render task queue stored in a SQLite database file."""
+
+    def __init__(self, db_path: str | Path, lease_s: float = 60.0, max_attempts: int = 3) -> None:
+        self.db_path = Path(db_path)
+        self.lease_s = float(lease_s)
+        self.max_attempts = max_attempts
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(tasks)")}
+            if "voice" not in columns:
+                conn.execute("ALTER TABLE tasks ADD COLUMN voice TEXT")
+            conn.executescript(LATE_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A short-lived connection per operation keeps this safe across threads and processes;
+        # rollback journaling (not WAL) keeps it usable on network filesystems.
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def submit(
+        self,
+        job_id: str,
+        project_path: str,
+        scene_id: str,
+        batches: List[Dict[str, Any]],
+    ) -> None:
+        """Register a job and its line batches.
+
+        Each payload must contain a ``lines`` list; an optional ``voice`` key lets workers warm
+        on that voice claim the batch first (see :meth:`lease`).
+        """
+        total = sum(len(b["lines"]) for b in batches)
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, project_path, scene_id, total_lines, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (job_id, project_path, scene_id, total, time.time()),
+            )
+            conn.executemany(
+                "INSERT INTO tasks (job_id, payload, line_count, voice) VALUES (?, ?, ?, ?)",
+                [(job_id, json.dumps(b), len(b["lines"]), b.get("voice")) for b in batches],
+            )
+
+    def lease(self, worker_id: str, prefer: Optional[str] = None) -> Optional[RenderTask]:
+        """Claim the oldest pending batch, reclaiming expired leases first.
+
+        With ``prefer`` (a voice key) the oldest batch for that voice is taken if there is one.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tasks "
+                "SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "owner = NULL, lease_expires = NULL, error = 'lease expired' "
+                "WHERE status = 'leased' AND lease_expires < ?",
+                (self.max_attempts, now),
+            )
+            row = None
+            if prefer is not None:
+                row = conn.execute(
+                    "SELECT task_id, job_id, payload, attempts FROM tasks "
+                    "WHERE status = 'pending' AND voice = ? ORDER BY task_id LIMIT 1",
+                    (prefer,),
+                ).fetchone()
+            if row is None:
+                row = conn.execute(
+                    "SELECT task_id, job_id, payload, attempts FROM tasks "
+                    "WHERE status = 'pending' ORDER BY task_id LIMIT 1"
+                ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE tasks SET status = 'leased', owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1 WHERE task_id = ?",
+                (worker_id, now + self.lease_s, row[0]),
+            )
+        return RenderTask(
+            task_id=row[0], job_id=row[1], payload=json.loads(row[2]), attempts=row[3] + 1
+        )
+
+    def heartbeat(self, task_id: int, worker_id: str) -> bool:
+        """Extend a lease; ``False`` means the lease was lost and the worker should stop."""
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "UPDATE tasks SET lease_expires = ? "
+                "WHERE task_id = ? AND owner = ? AND status = 'leased'",
+                (time.time() + self.lease_s, task_id, worker_id),
+            )
+            return cur.rowcount == 1
+
+    def complete(self, task_id: int, worker_id: str, result: Dict[str, Any]) -> bool:
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "UPDATE tasks SET status = 'done', result = ?, lease_expires = NULL "
+                "WHERE task_id = ? AND owner = ? AND status = 'leased'",
+                (json.dumps(result), task_id, worker_id),
+            )
+            return cur.rowcount == 1
+
+    def fail(self, task_id: int, worker_id: str, error: str) -> None:
+        """Release a batch after an error; it is retried until ``max_attempts`` is reached."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tasks "
+                "SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "owner = NULL, lease_expires = NULL, error = ? "
+                "WHERE task_id = ? AND owner = ? AND status = 'leased'",
+                (self.max_attempts, error, task_id, worker_id),
+            )
+
+    def cancel_job(self, job_id: str) -> int:
+        """Drop a job's unfinished batches; workers holding one fail their next heartbeat."""
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "UPDATE tasks SET status = 'cancelled', owner = NULL, lease_expires = NULL "
+                "WHERE job_id = ? AND status IN ('pending', 'leased')",
+                (job_id,),
+            )
+            return cur.rowcount
+
+    def job_status(self, job_id: str) -> Dict[str, Any]:
+        """Aggregate batch state for a job."""
+        with self._connect() as conn:
+            job = conn.execute(
+                "SELECT total_lines FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            if job is None:
+                raise KeyError(job_id)
+            rows = conn.execute(
+                "SELECT status, line_count, result, error FROM tasks WHERE job_id = ? "
+                "ORDER BY task_id",
+                (job_id,),
+            ).fetchall()
+        lines: List[Any] = []
+        errors: List[str] = []
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0, "cancelled": 0}
+        lines_done = 0
+        for status, line_count, result, error in rows:
+            counts[status] = counts.get(status, 0) + 1
+            if status == "done":
+                lines_done += line_count
+                lines.extend(json.loads(result).get("lines", []))
+            elif status == "failed" and error:
+                errors.append(error)
+        return {
+            "total_lines": job[0],
+            "lines_done": lines_done,
+            "tasks": counts,
+            "finished": counts["pending"] == 0 and counts["leased"] == 0,
+            "lines": lines,
+            "errors": errors,
+        }
@@ -0,0 +1,121 @@
+"""Load-aware degradation for interactive requests.
+
+An interactive request (``screenreader``) first gets queue priority over batch work in its
+backend's limiter (see :mod:`voxengine.core.concurrency`). That is never reported, because the
+audio does not change. If the request would still miss its latency budget, because slots are
+busy or latency per character has risen under load, it is rendered with a configured fallback
+voice, typically a smaller and lower-rate model. Each downgrade is returned as a response warning
+and counted in :meth:`DegradationPolicy.snapshot`.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from voxengine.core.concurrency import ConcurrencyController
+from voxengine.core.errors import VoxEngineError
+from voxengine.core.logging import get_logger
+from voxengine.core.workers import PRIORITY_BATCH, PRIORITY_INTERACTIVE
+
+log = get_logger("voxengine.degrade")
+
+INTERACTIVE_PROFILES = frozenset({"screenreader"})
+
+
+@dataclass
+class RenderPlan:
+    """Backend, model and voice to render with, plus any downgrade warnings."""
+
+    backend: str
+    model_path: Optional[Path]
+    voice: Optional[str]
+    priority: int = PRIORITY_BATCH
+    predicted_ms: float = 0.0
+    warnings: List[str] = field(default_factory=list)
+
+    @property
+    def degraded(self) -> bool:
+        return bool(self.warnings)
+
+
+class DegradationPolicy:
+    """Decides per request whether an interactive synthesis should use the fallback voice.
+
+    ``budget_ms`` is the predicted wait plus synthesis time an interactive request may take
+    before it is downgraded; ``None`` disables downgrades, though priority still applies.
+    ``fallback`` is a voice spec (``[backend:]model[#speaker]``) turned into a voice by
+    ``resolve``.
+    """
+
+    def __init__(
+        self,
+        concurrency: ConcurrencyController,
+        budget_ms: Optional[float] = None,
+        fallback: Optional[str] = None,
+        resolve: Optional[Callable[[str], Any]] = None,
+    ) -> None:
+        self.concurrency = concurrency
+        self.budget_ms = budget_ms
+        self.fallback = fallback
+        self.resolve = resolve
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {"interactive": 0, "degraded": 0, "over_budget": 0}
+
+    def plan(
+        self,
+        text: str,
+        backend: str,
+        model_path: Optional[Path],
+        voice: Optional[str],
+        profile: Optional[str],
+    ) -> RenderPlan:
+        if profile not in INTERACTIVE_PROFILES:
+            return RenderPlan(backend, model_path, voice)
+        plan = RenderPlan(backend, model_path, voice, priority=PRIORITY_INTERACTIVE)
+        plan.predicted_ms = self._predict(backend, len(text))
+        self._count("interactive")
+        if self.budget_ms is None or plan.predicted_ms <= self.budget_ms:
+            return plan
+        self._count("over_budget")
+        target = None
+        if self.fallback and self.resolve:
+            try:
+                target = self.resolve(self.fallback)
+            except VoxEngineError as exc:
+                log.warning("Interactive fallback %s is unusable: %s", self.fallback, exc)
+        if target is None or (
+            target.backend == backend
+            and target.model_path == model_path
+            and target.speaker == voice
+        ):
+            return plan
+        plan.backend, plan.model_path = target.backend, target.model_path
+        plan.voice = target.speaker
+        plan.warnings.append(
+            f"degraded under load: predicted {plan.predicted_ms:.0f} ms with {backend} exceeds "
+            f"the {self.budget_ms:.0f} ms interactive budget; rendered with {self.fallback}"
+        )
+        self._count("degraded")
+        log.info("Interactive request degraded to %s (%.0f ms)", self.fallback, plan.predicted_ms)
+        return plan
+
+    def _predict(self, backend: str, chars: int) -> float:
+        limiter = self.concurrency.limiter(backend)
+        return limiter.estimate_wait_ms(PRIORITY_INTERACTIVE) + limiter.estimate_ms(chars)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        return {
+            "budget_ms": self.budget_ms,
+            "fallback": self.fallback,
+            "interactive_profiles": sorted(INTERACTIVE_PROFILES),
+            "counts": counts,
+        }
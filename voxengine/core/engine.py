@@ -1,28 +1,63 @@
 """Engine orchestration."""
 
 from __future__ import annotations
+import inspect
 import os
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 import json
 import platform
-import shutil
+import threading
+import time
+from contextlib import ExitStack
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from platformdirs import user_cache_dir
 
+from voxengine.adapters.audio.encode import EncoderPool, output_rate
+from voxengine.adapters.audio.formats import (
+    FORMATS,
+    NATIVE_FORMAT,
+    get_format,
+    list_formats,
+    require_encoder,
+)
+from voxengine.adapters.audio.wavfile import wav_header
 from voxengine.adapters.tts.base import TTSAudio
-from voxengine.core.logging import get_logger
+from voxengine.core.cache import CacheManager, write_text_atomic
+from voxengine.core.cancel import CancelToken, SpeechSessions
+from voxengine.core.concurrency import ConcurrencyController
+from voxengine.core.coordinator import RenderCoordinator
+from voxengine.core.degrade import DegradationPolicy
+from voxengine.core.logging import get_logger, log_context, logging_stats
+from voxengine.core.model_store import ModelEntry, ModelStore
+from voxengine.core.phrasebook import PhrasebookStore, PhrasebookWriter
+from voxengine.core.prefetch import DEFAULT_CPU_SHARE, DEFAULT_LOOKAHEAD, LookaheadPrefetcher
+from voxengine.core.probe import CachedProbe
+from voxengine.core.queue import JobQueue
 from voxengine.core.registry import AdapterRegistry, registry as default_registry
+from voxengine.core.render import RenderService
+from voxengine.core.timing import collect, span
+from voxengine.core.tts_service import TTSService
+from voxengine.core.workers import PRIORITY_BACKGROUND, PRIORITY_BATCH, WorkerPool
 from voxengine.ethics.policy import Attestation, EthicsPolicy
-from voxengine.core.errors import MissingDependencyError, UserConfigError
+from voxengine.core.errors import CancelledError, MissingDependencyError, UserConfigError
+from voxengine.project.format import ProjectManager
 
 log = get_logger("voxengine.engine")
 
 ALLOWED_PROFILES = {"screenreader", "narration", "dialogue"}
-ALLOWED_OUTPUT_FORMATS = {"wav"}
+ALLOWED_OUTPUT_FORMATS = set(FORMATS)
+PHRASEBOOK_PROFILES = {"screenreader"}
+
+
+@lru_cache(maxsize=None)
+def _accepts(adapter_type: type, keyword: str) -> bool:
+    params = inspect.signature(adapter_type.speak).parameters.values()
+    return any(p.name == keyword or p.kind is p.VAR_KEYWORD for p in params)
 
 
 @dataclass(frozen=True)
@@ -30,6 +65,26 @@ class EngineConfig:
     version: str = "0.1.0"
     cache_dir: Path = Path(user_cache_dir("voxengine", "voxengine"))
     models_dir: Path = Path(user_cache_dir("voxengine_models", "voxengine"))
+    background_workers: int = 2
+    render_workers: int = 2  # scene renders, kept off the background pool
+    encoder_workers: int = 2
+    probe_ttl_s: float = 30.0
+    job_max_finished: int = 10000
+    job_ttl_s: float = 24 * 3600
+    job_timeout_s: Optional[float] = None
+    cache_max_bytes: Optional[int] = None
+    cache_max_age_s: Optional[float] = None
+    coordinator_path: Optional[Path] = None
+    coordinator_lease_s: float = 60.0
+    max_concurrency: Optional[int] = None
+    adaptive_concurrency: bool = True
+    backend_threads: Optional[str] = None
+    policy_path: Optional[Path] = None
+    interactive_budget_ms: Optional[float] = None
+    interactive_fallback: Optional[str] = None
+    lookahead_lines: int = DEFAULT_LOOKAHEAD
+    lookahead_cpu_share: float = DEFAULT_CPU_SHARE
+    checkpoint_dir: Optional[Path] = None  # default: <cache_dir>/checkpoints
 
     @staticmethod
     def load() -> "EngineConfig":
@@ -37,7 +92,47 @@ class EngineConfig:
         models_dir = Path(
             os.getenv("VOXENGINE_MODELS_DIR", user_cache_dir("voxengine_models", "voxengine"))
         )
-        return EngineConfig(cache_dir=cache_dir, models_dir=models_dir)
+        background_workers = int(os.getenv("VOXENGINE_BACKGROUND_WORKERS", "2"))
+        render_workers = int(os.getenv("VOXENGINE_RENDER_WORKERS", "2"))
+        encoder_workers = int(os.getenv("VOXENGINE_ENCODER_WORKERS", "2"))
+        probe_ttl_s = float(os.getenv("VOXENGINE_PROBE_TTL_S", "30"))
+        job_max_finished = int(os.getenv("VOXENGINE_JOB_MAX_FINISHED", "10000"))
+        job_ttl_s = float(os.getenv("VOXENGINE_JOB_TTL_S", str(24 * 3600)))
+        max_mb = os.getenv("VOXENGINE_CACHE_MAX_MB")
+        max_age_days = os.getenv("VOXENGINE_CACHE_MAX_AGE_DAYS")
+        coordinator = os.getenv("VOXENGINE_COORDINATOR")
+        job_timeout_s = os.getenv("VOXENGINE_JOB_TIMEOUT_S")
+        max_concurrency = os.getenv("VOXENGINE_MAX_CONCURRENCY")
+        adaptive = os.getenv("VOXENGINE_ADAPTIVE_CONCURRENCY", "1").lower()
+        policy = os.getenv("VOXENGINE_POLICY")
+        budget_ms = os.getenv("VOXENGINE_INTERACTIVE_BUDGET_MS")
+        checkpoint_dir = os.getenv("VOXENGINE_CHECKPOINT_DIR")
+        return EngineConfig(
+            cache_dir=cache_dir,
+            models_dir=models_dir,
+            background_workers=background_workers,
+            render_workers=render_workers,
+            encoder_workers=encoder_workers,
+            probe_ttl_s=probe_ttl_s,
+            job_max_finished=job_max_finished,
+            job_ttl_s=job_ttl_s,
+            job_timeout_s=float(job_timeout_s) if job_timeout_s else None,
+            cache_max_bytes=int(float(max_mb) * 1024 * 1024) if max_mb else None,
+            cache_max_age_s=float(max_age_days) * 86400 if max_age_days else None,
+            coordinator_path=Path(coordinator) if coordinator else None,
+            coordinator_lease_s=float(os.getenv("VOXENGINE_COORDINATOR_LEASE_S", "60")),
+            max_concurrency=int(max_concurrency) if max_concurrency else None,
+            adaptive_concurrency=adaptive not in ("0", "false", "no", "off"),
+            backend_threads=os.getenv("VOXENGINE_BACKEND_THREADS") or None,
+            policy_path=Path(policy) if policy else None,
+            interactive_budget_ms=float(budget_ms) if budget_ms else None,
+            interactive_fallback=os.getenv("VOXENGINE_INTERACTIVE_FALLBACK") or None,
+            lookahead_lines=int(os.getenv("VOXENGINE_LOOKAHEAD_LINES", str(DEFAULT_LOOKAHEAD))),
+            lookahead_cpu_share=float(
+                os.getenv("VOXENGINE_LOOKAHEAD_CPU_SHARE", str(DEFAULT_CPU_SHARE))
+            ),
+            checkpoint_dir=Path(checkpoint_dir) if checkpoint_dir else None,
+        )
 
 
 class Engine:
@@ -46,11 +141,71 @@ class Engine:
         self.cfg.cache_dir.mkdir(parents=True, exist_ok=True)
         self.cfg.models_dir.mkdir(parents=True, exist_ok=True)
         self.registry = registry or AdapterRegistry.default()
-        self.ethics = EthicsPolicy.default()
+        self.ethics = (
+            EthicsPolicy.load(cfg.policy_path) if cfg.policy_path else EthicsPolicy.default()
+        )
+        self.queue = JobQueue(max_finished=cfg.job_max_finished, finished_ttl_s=cfg.job_ttl_s)
+        self.workers = WorkerPool(max_workers=cfg.background_workers)
+        # Scene renders run for minutes; on their own pool they never hold up line previews,
+        # final-tier promotion or lookahead on ``workers``.
+        self.render_workers = WorkerPool(max_workers=cfg.render_workers, name="voxengine-render")
+        self.encoder = EncoderPool(max_workers=cfg.encoder_workers)
+        self.cache = CacheManager(
+            cfg.cache_dir,
+            max_bytes=cfg.cache_max_bytes,
+            max_age_s=cfg.cache_max_age_s,
+            exclude=("phrasebooks", "checkpoints"),
+        )
+        self.models = ModelStore(cfg.models_dir)
+        self.phrasebooks = PhrasebookStore(cfg.cache_dir / "phrasebooks")
+        self.sessions = SpeechSessions()
+        self.concurrency = ConcurrencyController(
+            max_limit=cfg.max_concurrency,
+            adaptive=cfg.adaptive_concurrency,
+            backend_threads=cfg.backend_threads,
+        )
+        self.projects = ProjectManager()
+        self.tts = TTSService(self, self.queue)
+        self.degradation = DegradationPolicy(
+            self.concurrency,
+            budget_ms=cfg.interactive_budget_ms,
+            fallback=cfg.interactive_fallback,
+            resolve=self.tts.resolve_voice,
+        )
+        self.coordinator = (
+            RenderCoordinator(cfg.coordinator_path, lease_s=cfg.coordinator_lease_s)
+            if cfg.coordinator_path is not None
+            else None
+        )
+        self.prefetch = LookaheadPrefetcher(
+            self.tts,
+            cfg.cache_dir / "lookahead",
+            self.workers,
+            lines=cfg.lookahead_lines,
+            cpu_share=cfg.lookahead_cpu_share,
+        )
+        self.render = RenderService(
+            self.queue,
+            self.tts,
+            self.projects,
+            workers=self.workers,
+            scene_workers=self.render_workers,
+            coordinator=self.coordinator,
+            timeout_s=cfg.job_timeout_s,
+            prefetch=self.prefetch,
+            checkpoint_dir=cfg.checkpoint_dir or cfg.cache_dir / "checkpoints",
+        )
+        self._backend_probe = CachedProbe(
+            self.registry.list_tts, ttl_s=cfg.probe_ttl_s, name="backend-probe"
+        )
+        self._model_probe = CachedProbe(
+            self._scan_models, ttl_s=cfg.probe_ttl_s, name="model-probe"
+        )
+        self._readiness: Dict[str, Any] = {"state": "ready", "warmed": False, "checks": []}
 
     def doctor(self) -> Dict[str, Any]:
-        models = self.discover_models()
-        tts_backends = self.registry.list_tts()
+        models = list(self._model_probe.get())
+        tts_backends = self.list_backends()
         available_backends = [b for b in tts_backends if b.get("available")]
 
         next_steps: List[str] = []
@@ -74,13 +229,98 @@ class Engine:
                 "platform": platform.platform(),
             },
             "cache_dir": str(self.cfg.cache_dir),
+            "cache": self.cache.stats(),
             "models_dir": str(self.cfg.models_dir),
             "models": models,
             "tts_backends": tts_backends,
+            "output_formats": list_formats(),
+            "readiness": self.readiness(),
+            "concurrency": self.concurrency.snapshot(),
+            "degradation": self.degradation.snapshot(),
+            "lookahead": self.prefetch.snapshot(),
+            "logging": logging_stats(),
+            "policy": self.ethics.about(),
             "next_steps": next_steps,
         }
 
+    def resume_renders(self) -> List[str]:
+        """Resume scene renders left unfinished by a previous process (see ``checkpoint``)."""
+        resumed = self.render.resume_interrupted()
+        if resumed:
+            log.info("Resumed %d interrupted render job(s)", len(resumed))
+        return resumed
+
+    def list_backends(self) -> List[dict]:
+        """Backend capabilities, served from a cache that refreshes in the background."""
+        return self._backend_probe.get()
+
     def discover_models(self) -> List[Dict[str, str]]:
+        """Models in ``models_dir`` right now, including ones added by another process.
+
+        :meth:`doctor` serves the cached probe instead, rescanned at most once per
+        ``probe_ttl_s``; model selection must never see a model that is gone.
+        """
+        return self._scan_models()
+
+    def refresh_probes(self) -> None:
+        """Re-probe backends and rescan models immediately."""
+        self._backend_probe.refresh()
+        self._model_probe.refresh()
+
+    def readiness(self) -> Dict[str, Any]:
+        """Whether the engine is warmed up and able to serve (distinct from liveness)."""
+        state = dict(self._readiness)
+        state["ready"] = state["state"] == "ready"
+        return state
+
+    def warmup_async(self, text: str = "ready") -> threading.Thread:
+        """Mark the engine as warming and run :meth:`warmup` on a daemon thread."""
+        self._readiness = {"state": "warming", "warmed": False, "checks": []}
+        t = threading.Thread(
+            target=self.warmup, kwargs={"text": text}, name="voxengine-warmup", daemon=True
+        )
+        t.start()
+        return t
+
+    def warmup(self, text: str = "ready") -> Dict[str, Any]:
+        """Run a tiny synthesis per available backend and model so first requests start warm."""
+        self._readiness = {"state": "warming", "warmed": False, "checks": []}
+        self.refresh_probes()
+        models = [Path(m["path"]) for m in self.discover_models()]
+        warm_dir = self.cfg.cache_dir / "warmup"
+        checks: List[Dict[str, Any]] = []
+        for about in self.list_backends():
+            if not about.get("available"):
+                continue
+            name = about["name"]
+            targets: List[Optional[Path]] = list(models) if name == "piper" else [None]
+            for model in targets:
+                checks.append(self._warm_one(name, model, text, warm_dir))
+        state = "ready" if any(c["ok"] for c in checks) else "degraded"
+        self._readiness = {"state": state, "warmed": True, "checks": checks}
+        log.info("Warm-up finished: %s (%d checks)", state, len(checks))
+        return self.readiness()
+
+    def _warm_one(
+        self, backend: str, model: Optional[Path], text: str, warm_dir: Path
+    ) -> Dict[str, Any]:
+        out_path = warm_dir / f"{backend}_{model.stem if model else 'default'}.wav"
+        check: Dict[str, Any] = {"backend": backend, "model": str(model) if model else None}
+        start = time.perf_counter()
+        try:
+            self.registry.get_tts(backend).speak(
+                text=text, out_path=out_path, model_path=model, out_format=NATIVE_FORMAT
+            )
+            check["ok"] = True
+        except Exception as exc:  # noqa: BLE001
+            check["ok"] = False
+            check["error"] = str(exc)
+        finally:
+            out_path.unlink(missing_ok=True)
+        check["ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return check
+
+    def _scan_models(self) -> List[Dict[str, str]]:
         allowed = {".onnx", ".bin", ".pt"}
         if not self.cfg.models_dir.exists():
             return []
@@ -90,18 +330,17 @@ class Engine:
                 models.append({"name": path.stem, "path": str(path)})
         return models
 
-    def add_model(self, source: Path, name: Optional[str] = None) -> Path:
-        if not source.exists() or not source.is_file():
-            raise UserConfigError(f"Model file not found: {source}")
-        dest_name = f"{name or source.stem}{source.suffix}"
-        dest_path = self.cfg.models_dir / dest_name
-        if dest_path.exists():
-            raise UserConfigError(
-                f"A model named '{dest_name}' already exists in {self.cfg.models_dir}"
-            )
-        dest_path.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(source, dest_path)
-        return dest_path
+    def add_model(self, source: Path, name: Optional[str] = None, link: bool = True) -> Path:
+        """Import a model into the content-addressed store; returns its path in ``models_dir``."""
+        entry = self.models.add(source, name=name, link=link)
+        self._model_probe.invalidate()
+        return entry.path
+
+    def add_models(self, sources: List[Path], link: bool = True) -> List[ModelEntry]:
+        """Import several models at once, hashing them in parallel."""
+        entries = self.models.add_many(sources, link=link)
+        self._model_probe.invalidate()
+        return entries
 
     def tts_speak(
         self,
@@ -113,60 +352,410 @@ class Engine:
         profile: Optional[str] = None,
         attestation: Optional[Attestation] = None,
         out_format: str = "wav",
+        final_backend: Optional[str] = None,
+        final_model_path: Optional[Path] = None,
+        final_voice: Optional[str] = None,
+        cancel: Optional[CancelToken] = None,
+        defer_encode: bool = False,
     ) -> Dict[str, Any]:
-        decision = self.ethics.check_tts(
-            text=text, backend=backend, voice=voice, attestation=attestation
-        )
-        if not decision.allowed:
-            raise UserConfigError(f"Blocked by policy: {decision.reason}")
+        """Synthesize ``text`` and write audio plus a JSON sidecar.
 
-        normalized_profile = self._normalize_profile(profile)
-        normalized_format = out_format.lower()
-        if normalized_format not in ALLOWED_OUTPUT_FORMATS:
-            allowed = ", ".join(sorted(ALLOWED_OUTPUT_FORMATS))
-            raise UserConfigError(f"Unsupported audio format '{out_format}'. Supported: {allowed}.")
+        When ``final_backend`` is given the call renders a fast preview with ``backend`` and
+        returns immediately; the final tier is queued as a background job that atomically
+        replaces the preview audio and sidecar when it completes.
+
+        With ``defer_encode`` a compressed format is encoded in the background: the call
+        returns as soon as synthesis is done, with ``encode_job_id`` to follow. The audio file
+        appears once that job is done; :meth:`EncoderPool.wait` blocks until then.
+
+        Firing ``cancel`` aborts the request at the next stage boundary and kills in-flight
+        backend work for adapters that support it; the call then raises ``CancelledError``.
+        """
+        if cancel is not None:
+            cancel.raise_if_cancelled()  # stale before it even started
+        with collect() as timings:
+            with span("policy"):
+                self._check_policy(
+                    text=text, backend=backend, voice=voice, attestation=attestation
+                )
+                if final_backend is not None:
+                    final_voice = final_voice if final_voice is not None else voice
+                    self._check_policy(
+                        text=text,
+                        backend=final_backend,
+                        voice=final_voice,
+                        attestation=attestation,
+                    )
+                    self.registry.get_tts(final_backend)
 
+            normalized_profile = self._normalize_profile(profile)
+            fmt = get_format(out_format)
+            require_encoder(fmt)
+            normalized_format = fmt.name
+
+            cached = out_path is None
+            if out_path is None:
+                out_path = self.cfg.cache_dir / f"tts_{uuid.uuid4().hex}{fmt.suffix}"
+            else:
+                out_path = out_path.with_suffix(fmt.suffix)
+
+            tier = "preview" if final_backend is not None else None
+            served = None
+            plan = None
+            encode_job = None
+            if (
+                normalized_profile in PHRASEBOOK_PROFILES
+                and final_backend is None
+                and normalized_format == NATIVE_FORMAT
+            ):
+                with span("phrasebook"):
+                    served = self._from_phrasebook(
+                        text, backend, model_path, voice, normalized_profile, out_path
+                    )
+            if served is not None:
+                result, meta_path = served
+            else:
+                with span("degrade"):
+                    plan = self.degradation.plan(
+                        text, backend, model_path, voice, normalized_profile
+                    )
+                    if plan.degraded:
+                        self._check_policy(
+                            text=text,
+                            backend=plan.backend,
+                            voice=plan.voice,
+                            attestation=attestation,
+                        )
+                        backend, model_path, voice = plan.backend, plan.model_path, plan.voice
+                if defer_encode and fmt.needs_encoder and final_backend is None:
+                    encode_job = self.queue.create(timeout_s=self.cfg.job_timeout_s)
+                try:
+                    result, meta_path = self._render(
+                        text=text,
+                        backend=backend,
+                        audio_path=out_path,
+                        meta_path=out_path.with_suffix(".json"),
+                        model_path=model_path,
+                        voice=voice,
+                        profile=normalized_profile,
+                        out_format=normalized_format,
+                        tier=tier,
+                        cancel=cancel,
+                        priority=plan.priority,
+                        notes=plan.warnings,
+                        encode_job_id=encode_job.id if encode_job else None,
+                    )
+                except CancelledError as exc:
+                    if encode_job is not None:
+                        self.queue.set_cancelled(encode_job.id, str(exc))
+                    raise
+                except Exception as exc:
+                    if encode_job is not None:
+                        self.queue.set_error(encode_job.id, str(exc))
+                    raise
+            if cached:
+                encoding = self.encoder.pending(out_path) if encode_job else None
+                if encoding is not None:
+                    encoding.add_done_callback(
+                        lambda _f: self.cache.note_write(out_path, meta_path)
+                    )
+                else:
+                    self.cache.note_write(out_path, meta_path)
+
+            response: Dict[str, Any] = {
+                "backend": backend,
+                "voice_id": voice,
+                "profile": normalized_profile,
+                "audio_path": str(out_path),
+                "meta_path": str(meta_path),
+                "sample_rate": result.sample_rate,
+                "duration_s": result.duration_s,
+                "warnings": (plan.warnings if plan else []) + result.warnings,
+                "source": "phrasebook" if served is not None else "synthesis",
+            }
+            if final_backend is not None:
+                job = self.queue.create(timeout_s=self.cfg.job_timeout_s)
+                with log_context(job_id=job.id):
+                    self.workers.submit(
+                        self._promote_final,
+                        job.id,
+                        text=text,
+                        backend=final_backend,
+                        out_path=out_path,
+                        model_path=final_model_path,
+                        voice=final_voice,
+                        profile=normalized_profile,
+                        out_format=normalized_format,
+                        priority=PRIORITY_BACKGROUND,
+                    )
+                response["tier"] = tier
+                response["final_job_id"] = job.id
+            if encode_job is not None:
+                response["encode_job_id"] = encode_job.id
+            response["timings_ms"] = timings.as_dict()
+            return response
+
+    def build_phrasebook(
+        self,
+        phrases: List[str],
+        backend: str = "piper",
+        model_path: Optional[Path] = None,
+        voice: Optional[str] = None,
+        profile: str = "screenreader",
+    ) -> Dict[str, Any]:
+        """Pre-render ``phrases`` into the packed phrasebook for this backend/model/voice."""
+        normalized_profile = self._normalize_profile(profile)
         adapter = self.registry.get_tts(backend)
-        if out_path is None:
-            out_path = self.cfg.cache_dir / f"tts_{uuid.uuid4().hex}.{normalized_format}"
-        else:
-            out_path = out_path.with_suffix(f".{normalized_format}")
+        model = self._phrasebook_model(backend, model_path, required=True)
+        path = self.phrasebooks.path_for(backend, model, voice)
+        writer = PhrasebookWriter(path, backend=backend, model=model, voice=voice)
+        clip = path / f".clip.{uuid.uuid4().hex[:8]}.wav"
+        start = time.perf_counter()
+        try:
+            for phrase in phrases:
+                self._check_policy(text=phrase, backend=backend, voice=voice, attestation=None)
+                adapter.speak(
+                    text=phrase,
+                    out_path=clip,
+                    model_path=Path(model) if model else None,
+                    voice=voice,
+                    profile=normalized_profile,
+                    out_format=NATIVE_FORMAT,
+                )
+                writer.add(phrase, clip)
+        finally:
+            clip.unlink(missing_ok=True)
+        book = writer.commit()
+        return {
+            "path": str(path),
+            "phrases": len(book),
+            "ms": round((time.perf_counter() - start) * 1000, 1),
+        }
 
-        resolved_model = model_path
-        if backend == "piper" and model_path is None:
-            resolved_model = self._select_piper_model()
+    def _phrasebook_model(
+        self, backend: str, model_path: Optional[Path], required: bool = False
+    ) -> Optional[str]:
+        if model_path is not None:
+            return str(Path(model_path).expanduser().resolve())
+        if backend != "piper":
+            return None
+        try:
+            return str(self._select_piper_model())
+        except (MissingDependencyError, UserConfigError):
+            if required:
+                raise
+            return None
 
-        result = adapter.speak(
-            text=text,
-            out_path=out_path,
-            model_path=resolved_model,
-            voice=voice,
-            profile=normalized_profile,
-            out_format=normalized_format,
+    def _from_phrasebook(
+        self,
+        text: str,
+        backend: str,
+        model_path: Optional[Path],
+        voice: Optional[str],
+        profile: Optional[str],
+        out_path: Path,
+    ) -> Optional[tuple[TTSAudio, Path]]:
+        """Serve ``text`` from a pre-rendered phrasebook if every word of it is covered."""
+        if backend == "piper" and model_path is None and not self.phrasebooks.root.exists():
+            return None  # skip model selection when no phrasebook was ever built
+        book = self.phrasebooks.get(backend, self._phrasebook_model(backend, model_path), voice)
+        pcm = book.lookup(text) if book is not None else None
+        if pcm is None:
+            return None
+        data_size = len(pcm)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(out_path, "wb") as fh:
+            fh.write(wav_header(book.sample_rate, book.channels, 2, data_size))
+            fh.write(pcm)
+        result = TTSAudio(
+            path=out_path,
+            sample_rate=book.sample_rate,
+            duration_s=data_size / book.frame_size / book.sample_rate,
         )
-
         meta_path = out_path.with_suffix(".json")
         metadata = self._build_metadata(
             text=text,
             backend=backend,
             voice=voice,
-            profile=normalized_profile,
+            profile=profile,
             audio_path=out_path,
             meta_path=meta_path,
             render=result,
         )
-        meta_path.write_text(json.dumps(metadata, indent=2), encoding="utf-8")
+        metadata["format"] = NATIVE_FORMAT
+        metadata["source"] = "phrasebook"
+        write_text_atomic(meta_path, json.dumps(metadata, indent=2))
+        return result, meta_path
 
-        return {
-            "backend": backend,
-            "voice_id": voice,
-            "profile": normalized_profile,
-            "audio_path": str(out_path),
-            "meta_path": str(meta_path),
-            "sample_rate": result.sample_rate,
-            "duration_s": result.duration_s,
-            "warnings": result.warnings,
-        }
+    def _check_policy(
+        self, *, text: str, backend: str, voice: Optional[str], attestation: Optional[Attestation]
+    ) -> None:
+        decision = self.ethics.check_tts(
+            text=text, backend=backend, voice=voice, attestation=attestation
+        )
+        if not decision.allowed:
+            raise UserConfigError(f"Blocked by policy: {decision.reason}")
+
+    def _render(
+        self,
+        *,
+        text: str,
+        backend: str,
+        audio_path: Path,
+        meta_path: Path,
+        model_path: Optional[Path],
+        voice: Optional[str],
+        profile: Optional[str],
+        out_format: str,
+        tier: Optional[str] = None,
+        sidecar_audio_path: Optional[Path] = None,
+        cancel: Optional[CancelToken] = None,
+        priority: int = PRIORITY_BATCH,
+        notes: Optional[List[str]] = None,
+        encode_job_id: Optional[str] = None,
+    ) -> tuple[TTSAudio, Path]:
+        with span("model_select"):
+            adapter = self.registry.get_tts(backend)
+            resolved_model = model_path
+            if backend == "piper" and model_path is None:
+                resolved_model = self._select_piper_model()
+
+        fmt = get_format(out_format)
+        synth_path = audio_path
+        if fmt.needs_encoder:
+            synth_path = audio_path.with_name(f".{audio_path.stem}.{uuid.uuid4().hex[:8]}.wav")
+        extra: Dict[str, Any] = {}
+        if cancel is not None and _accepts(type(adapter), "cancel"):
+            extra["cancel"] = cancel
+        with ExitStack() as stack:
+            with span("concurrency_wait"):
+                threads = stack.enter_context(
+                    self.concurrency.slot(
+                        backend, cost=len(text), cancel=cancel, priority=priority
+                    )
+                )
+            if threads is not None and _accepts(type(adapter), "threads"):
+                extra["threads"] = threads
+            with span(f"synthesize_{backend}"):
+                result = adapter.speak(
+                    text=text,
+                    out_path=synth_path,
+                    model_path=resolved_model,
+                    voice=voice,
+                    profile=profile,
+                    out_format=NATIVE_FORMAT,
+                    **extra,
+                )
+        if cancel is not None and cancel.cancelled:
+            synth_path.unlink(missing_ok=True)
+            cancel.raise_if_cancelled()
+        encoding = None
+        if fmt.needs_encoder:
+            # Adapters only write WAV; the encoder pool streams it into the target container and
+            # removes the intermediate file.
+            encoding = self.encoder.submit(synth_path, audio_path, fmt)
+            if encode_job_id is None:
+                with span("encode"):
+                    encoding.result()
+            sample_rate = output_rate(fmt, result.sample_rate)
+            result = replace(result, path=audio_path, sample_rate=sample_rate)
+
+        with span("metadata"):
+            metadata = self._build_metadata(
+                text=text,
+                backend=backend,
+                voice=voice,
+                profile=profile,
+                audio_path=sidecar_audio_path or audio_path,
+                meta_path=(
+                    sidecar_audio_path.with_suffix(".json") if sidecar_audio_path else meta_path
+                ),
+                render=result,
+            )
+            metadata["format"] = fmt.name
+            if tier is not None:
+                metadata["tier"] = tier
+            if notes:
+                metadata["warnings"] = list(notes) + metadata["warnings"]
+                metadata["degraded"] = True
+            write_text_atomic(meta_path, json.dumps(metadata, indent=2))
+        if encoding is not None and encode_job_id is not None:
+            self.queue.set_running(encode_job_id, f"encoding {fmt.name}")
+            encoding.add_done_callback(
+                lambda f: self._encoded(encode_job_id, f, audio_path, meta_path)
+            )
+        return result, meta_path
+
+    def _encoded(self, job_id: str, encoding: Any, audio_path: Path, meta_path: Path) -> None:
+        """Finish the job of a background encode started by :meth:`_render`."""
+        exc = encoding.exception()
+        if exc is None:
+            self.queue.set_done(
+                job_id, {"audio_path": str(audio_path), "meta_path": str(meta_path)}
+            )
+            return
+        meta_path.unlink(missing_ok=True)
+        log.warning("Encoding %s failed: %s", audio_path, exc)
+        self.queue.set_error(job_id, str(exc))
+
+    def _promote_final(
+        self,
+        job_id: str,
+        *,
+        text: str,
+        backend: str,
+        out_path: Path,
+        model_path: Optional[Path],
+        voice: Optional[str],
+        profile: Optional[str],
+        out_format: str,
+    ) -> None:
+        """Render the final tier next to the preview, then swap it into place."""
+        self.queue.set_running(job_id, f"rendering final tier with {backend}")
+        cancel = self.queue.get(job_id).cancel
+        tmp_audio = out_path.with_name(f".{out_path.stem}.{job_id[:8]}{out_path.suffix}")
+        tmp_meta = tmp_audio.with_suffix(".json")
+        meta_path = out_path.with_suffix(".json")
+        try:
+            result, _ = self._render(
+                text=text,
+                backend=backend,
+                audio_path=tmp_audio,
+                meta_path=tmp_meta,
+                model_path=model_path,
+                voice=voice,
+                profile=profile,
+                out_format=out_format,
+                tier="final",
+                sidecar_audio_path=out_path,
+                cancel=cancel,
+            )
+            cancel.raise_if_cancelled()
+            os.replace(tmp_audio, out_path)
+            os.replace(tmp_meta, meta_path)
+        except CancelledError as exc:
+            tmp_audio.unlink(missing_ok=True)
+            tmp_meta.unlink(missing_ok=True)
+            self.queue.finish_interrupted(job_id, exc)
+            return
+        except Exception as exc:  # noqa: BLE001
+            tmp_audio.unlink(missing_ok=True)
+            tmp_meta.unlink(missing_ok=True)
+            log.warning("Final tier render failed for job %s: %s", job_id, exc)
+            self.queue.set_error(job_id, str(exc))
+            return
+        self.queue.set_done(
+            job_id,
+            {
+                "tier": "final",
+                "backend": backend,
+                "audio_path": str(out_path),
+                "meta_path": str(meta_path),
+                "sample_rate": result.sample_rate,
+                "duration_s": result.duration_s,
+                "warnings": result.warnings,
+            },
+        )
 
     def _select_piper_model(self) -> Path:
         models = [Path(m["path"]) for m in self.discover_models()]
@@ -23,3 +23,9 @@ class MissingDependencyError(VoxEngineError):
     """Raised when a required backend, executable, or model is missing."""
 
     exit_code = 3
+
+
+class CancelledError(VoxEngineError):
+    """Raised when work is abandoned because its cancel token fired."""
+
+    exit_code = 130
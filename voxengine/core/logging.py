@@ -1,20 +1,261 @@
-"""Logging utilities."""
+"""Logging utilities.
+
+Logging is configured once per process. Records are put on a bounded in-memory queue by the
+thread that logs them and written to stderr by a background listener, so a slow terminal or
+log collector never stalls a request. When the queue is full, records are dropped and counted
+instead of blocking.
+
+Settings:
+
+* ``VOXENGINE_LOG_LEVEL``: level name (default ``INFO``).
+* ``VOXENGINE_LOG_FORMAT``: ``text`` (default) or ``json``, one object per line. JSON lines carry
+  the ``request_id`` and ``job_id`` bound with :func:`log_context`.
+* ``VOXENGINE_LOG_RATE_LIMIT_S``: identical warnings (same logger, same formatted message) are
+  emitted at most once per this many seconds (default 10, 0 disables). The next one that gets
+  through reports how many were suppressed. Errors are never limited.
+* ``VOXENGINE_LOG_QUEUE``: maximum number of queued records (default 10000).
+"""
 
 from __future__ import annotations
+import atexit
+import contextvars
+import copy
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional, TextIO, Tuple
 
+TEXT_FORMAT = "%(levelname)s %(name)s: %(message)s"
+CONTEXT_FIELDS = ("request_id", "job_id")
 
-def configure_logging() -> None:
-    """Configure root logging once.
+_context: contextvars.ContextVar[Dict[str, str]] = contextvars.ContextVar(
+    "voxengine_log_context", default={}
+)
+_lock = threading.Lock()
+_listener: Optional["_Listener"] = None
+_handler: Optional["DroppingQueueHandler"] = None
+_configured = False
 
-    The level can be overridden with ``VOXENGINE_LOG_LEVEL``.
+
+@contextmanager
+def log_context(**fields: Optional[str]) -> Iterator[None]:
+    """Attach ``fields`` (``request_id``, ``job_id``) to records logged inside the block.
+
+    The fields follow the context into ``run_in_threadpool`` and :class:`WorkerPool` tasks.
     """
-    level = os.getenv("VOXENGINE_LOG_LEVEL", "INFO").upper()
-    logging.basicConfig(level=level, format="%(levelname)s %(name)s: %(message)s")
+    merged = dict(_context.get())
+    merged.update({k: str(v) for k, v in fields.items() if v is not None})
+    token = _context.set(merged)
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+class ContextFilter(logging.Filter):
+    """Copy the bound request and job IDs onto each record, in the thread that logs it."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        fields = _context.get()
+        for name in CONTEXT_FIELDS:
+            setattr(record, name, fields.get(name))
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """Pass one record per ``(logger, formatted message)`` every ``interval_s`` seconds.
+
+    Only records from ``level`` up to, but not including, ``max_level`` are limited, so errors
+    always get through. Messages that differ only in their arguments are different records.
+    """
+
+    def __init__(
+        self,
+        interval_s: float = 10.0,
+        level: int = logging.WARNING,
+        max_level: int = logging.ERROR,
+    ) -> None:
+        super().__init__()
+        self.interval_s = interval_s
+        self.level = level
+        self.max_level = max_level
+        self._lock = threading.Lock()
+        self._seen: Dict[Tuple[str, str], Tuple[float, int]] = {}  # -> (emitted at, suppressed)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.interval_s <= 0 or not self.level <= record.levelno < self.max_level:
+            return True
+        try:
+            message = record.getMessage()
+        except Exception:  # noqa: BLE001 - the handler reports bad format arguments itself
+            return True
+        key = (record.name, message)
+        now = time.monotonic()
+        with self._lock:
+            last, suppressed = self._seen.get(key, (None, 0))
+            if last is not None and now - last < self.interval_s:
+                self._seen[key] = (last, suppressed + 1)
+                return False
+            if len(self._seen) >= 4096:
+                self._seen.clear()
+            self._seen[key] = (now, 0)
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full."""
+
+    def __init__(self, q: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge the arguments into the message but keep the traceback separate."""
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = _PLAIN.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_PLAIN = logging.Formatter()
+
+
+class _Listener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)  # waits for room: stopping drains a full queue
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message and bound IDs."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        doc: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name in CONTEXT_FIELDS:
+            value = getattr(record, name, None)
+            if value is not None:
+                doc[name] = value
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            doc["suppressed"] = suppressed
+        if record.exc_info:
+            doc["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            doc["exc_info"] = record.exc_text
+        return json.dumps(doc, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self) -> None:
+        super().__init__(TEXT_FORMAT)
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            text += f" ({suppressed} similar suppressed)"
+        return text
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    fmt: Optional[str] = None,
+    stream: Optional[TextIO] = None,
+    rate_limit_s: Optional[float] = None,
+    force: bool = False,
+) -> None:
+    """Configure root logging once; later calls are no-ops unless ``force`` is set.
+
+    Like ``logging.basicConfig``, this leaves a root logger that already has handlers alone
+    unless ``force`` is set. Arguments override the ``VOXENGINE_LOG_*`` environment variables.
+    """
+    global _listener, _handler, _configured
+    with _lock:
+        if _configured and not force:
+            return
+        _configured = True
+        root = logging.getLogger()
+        if not force and root.handlers:
+            return
+        _remove_handler()
+        level = (level or os.getenv("VOXENGINE_LOG_LEVEL", "INFO")).upper()
+        fmt = (fmt or os.getenv("VOXENGINE_LOG_FORMAT", "text")).lower()
+        if rate_limit_s is None:
+            rate_limit_s = float(os.getenv("VOXENGINE_LOG_RATE_LIMIT_S", "10"))
+        capacity = int(os.getenv("VOXENGINE_LOG_QUEUE", "10000"))
+
+        sink = logging.StreamHandler(stream or sys.stderr)
+        sink.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+        records: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=max(1, capacity))
+        handler = DroppingQueueHandler(records)
+        handler.addFilter(ContextFilter())
+        handler.addFilter(RateLimitFilter(rate_limit_s))
+
+        root.addHandler(handler)
+        root.setLevel(level)
+        _handler = handler
+        _listener = _Listener(records, sink, respect_handler_level=True)
+        _listener.start()
+
+
+def _remove_handler() -> None:
+    global _listener, _handler
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+    if _listener is not None:
+        _listener.stop()  # drains what is already queued
+        _listener = None
+
+
+def shutdown_logging() -> None:
+    """Flush queued records, stop the listener thread and detach the queue handler."""
+    global _configured
+    with _lock:
+        _remove_handler()
+        _configured = False
+
+
+def logging_stats() -> Dict[str, Any]:
+    """Queue depth and records dropped because the sink could not keep up."""
+    handler = _handler
+    if handler is None:
+        return {"configured": False}
+    return {"configured": True, "queued": handler.queue.qsize(), "dropped": handler.dropped}
+
+
+atexit.register(shutdown_logging)
 
 
 def get_logger(name: str) -> logging.Logger:
-    """Return a logger after ensuring basic config is applied."""
-    configure_logging()
+    """Return a logger, configuring logging on first use."""
+    if not _configured:
+        configure_logging()
     return logging.getLogger(name)
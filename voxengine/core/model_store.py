@@ -0,0 +1,213 @@
+"""Content-addressed model store.
+
+Model files live once under ``models_dir/blobs/sha256/<ab>/<digest>``. The names that backends
+and ``voxengine models list`` see (``models_dir/<name>.onnx``) are aliases for those blobs.
+They are symlinks, or hardlinks where symlinks are not available. Importing the same file
+under two names therefore stores it once.
+
+A blob is brought in as cheaply as the filesystem allows: a reflink (copy-on-write clone),
+else a hardlink to the source, else a streaming copy. :meth:`ModelStore.gc` removes blobs that
+no alias points at. A hardlinked blob shares its inode with the source file, so editing the
+source in place changes the blob; :meth:`ModelStore.verify` re-hashes blobs to catch that.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from voxengine.core.concurrency import usable_cores
+from voxengine.core.errors import UserConfigError
+from voxengine.core.logging import get_logger
+
+log = get_logger("voxengine.model_store")
+
+BLOBS_DIR = "blobs"
+HASH_NAME = "sha256"
+HASH_CHUNK = 8 << 20
+# Config files Piper expects beside a model (``voice.onnx.json``); imported with it.
+COMPANION_SUFFIXES = (".json",)
+
+_FICLONE = 0x40049409  # Linux ioctl: share the source's extents with the destination
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        while chunk := fh.read(HASH_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _reflink(source: Path, dest: Path) -> bool:
+    try:
+        import fcntl
+    except ImportError:  # not on POSIX
+        return False
+    with open(source, "rb") as src, open(dest, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+            return True
+        except OSError:
+            return False
+
+
+@dataclass(frozen=True)
+class ModelEntry:
+    name: str
+    path: Path
+    digest: str
+    size: int
+    method: str  # how the blob was imported: existing, reflink, hardlink or copy
+
+
+class ModelStore:
+    """Blobs keyed by SHA-256 under ``root/blobs``, with named aliases at the top of ``root``."""
+
+    def __init__(self, root: Path, workers: Optional[int] = None) -> None:
+        self.root = Path(root)
+        self.blobs = self.root / BLOBS_DIR / HASH_NAME
+        self.workers = workers or min(8, usable_cores())
+
+    def blob_path(self, digest: str) -> Path:
+        return self.blobs / digest[:2] / digest
+
+    # -- import -------------------------------------------------------------------------------
+
+    def add(self, source: Path, name: Optional[str] = None, link: bool = True) -> ModelEntry:
+        """Import ``source`` under alias ``name`` (default: its file name), plus companions.
+
+        With ``link=False`` the blob is always an independent copy.
+        """
+        source = Path(source)
+        if not source.is_file():
+            raise UserConfigError(f"Model file not found: {source}")
+        alias = f"{name or source.stem}{source.suffix}"
+        entry = self._add_file(source, alias, hash_file(source), link)
+        for suffix in COMPANION_SUFFIXES:
+            companion = source.with_name(source.name + suffix)
+            if companion.is_file():
+                self._add_file(companion, alias + suffix, hash_file(companion), link)
+        return entry
+
+    def add_many(self, sources: Iterable[Path], link: bool = True) -> List[ModelEntry]:
+        """Import several models, hashing and copying them in parallel."""
+        sources = list(sources)
+        aliases = [f"{Path(s).stem}{Path(s).suffix}" for s in sources]
+        if len(set(aliases)) != len(aliases):
+            raise UserConfigError("Two of the given models would get the same name.")
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(lambda s: self.add(s, link=link), sources))
+
+    def _add_file(self, source: Path, alias: str, digest: str, link: bool) -> ModelEntry:
+        alias_path = self.root / alias
+        if alias_path.exists() or alias_path.is_symlink():
+            if self.digest_of(alias) == digest:
+                return ModelEntry(alias, alias_path, digest, source.stat().st_size, "existing")
+            raise UserConfigError(f"A model named '{alias}' already exists in {self.root}")
+        blob = self.blob_path(digest)
+        method = "existing" if blob.exists() else self._import_blob(source, blob, link)
+        self._link_alias(blob, alias_path)
+        log.info("Model %s -> %s (%s)", alias, digest[:12], method)
+        return ModelEntry(alias, alias_path, digest, blob.stat().st_size, method)
+
+    def _import_blob(self, source: Path, blob: Path, link: bool) -> str:
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp = blob.with_name(f".{blob.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            method = "copy"
+            if link and _reflink(source, tmp):
+                method = "reflink"
+            else:
+                tmp.unlink(missing_ok=True)
+                if link:
+                    try:
+                        os.link(source, tmp)
+                        method = "hardlink"
+                    except OSError:
+                        pass
+                if method == "copy":
+                    # copyfile streams through sendfile/copy_file_range where the OS has them.
+                    shutil.copyfile(source, tmp)
+            os.replace(tmp, blob)
+        finally:
+            tmp.unlink(missing_ok=True)
+        return method
+
+    @staticmethod
+    def _link_alias(blob: Path, alias_path: Path) -> None:
+        try:
+            alias_path.symlink_to(os.path.relpath(blob, alias_path.parent))
+        except OSError:
+            os.link(blob, alias_path)  # e.g. Windows without symlink privilege
+
+    # -- inspection ---------------------------------------------------------------------------
+
+    def aliases(self) -> Dict[str, Path]:
+        """Alias name -> path for every model entry at the top of the store."""
+        if not self.root.exists():
+            return {}
+        return {
+            p.name: p
+            for p in sorted(self.root.iterdir())
+            if p.name != BLOBS_DIR and not p.name.startswith(".") and p.is_file()
+        }
+
+    def digest_of(self, alias: str) -> Optional[str]:
+        """Digest of the blob behind ``alias``; ``None`` for files not managed by the store."""
+        path = self.root / alias
+        if path.is_symlink():
+            target = path.resolve()
+            return target.name if target.parent.parent == self.blobs.resolve() else None
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        for blob in self._blobs():
+            bst = blob.stat()
+            if (bst.st_dev, bst.st_ino) == (st.st_dev, st.st_ino):
+                return blob.name
+        return None
+
+    def verify(self) -> List[Dict[str, str]]:
+        """Re-hash every blob in parallel; returns the ones whose content no longer matches."""
+        blobs = list(self._blobs())
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            actual = list(pool.map(hash_file, blobs))
+        return [
+            {"blob": str(blob), "expected": blob.name, "actual": digest}
+            for blob, digest in zip(blobs, actual)
+            if digest != blob.name
+        ]
+
+    def gc(self, dry_run: bool = False) -> Dict[str, int]:
+        """Delete blobs no alias refers to."""
+        referenced = self._referenced()
+        removed = freed = 0
+        for blob in list(self._blobs()):
+            st = blob.stat()
+            if (st.st_dev, st.st_ino) in referenced:
+                continue
+            removed += 1
+            freed += st.st_size
+            if not dry_run:
+                blob.unlink()
+        return {"removed": removed, "freed_bytes": freed}
+
+    def _blobs(self) -> Iterable[Path]:
+        if not self.blobs.exists():
+            return []
+        return sorted(p for p in self.blobs.glob("*/*") if not p.name.startswith("."))
+
+    def _referenced(self) -> Set[Tuple[int, int]]:
+        refs: Set[Tuple[int, int]] = set()
+        for path in self.aliases().values():
+            st = path.stat()  # follows symlinks; hardlinked aliases share the blob's inode
+            refs.add((st.st_dev, st.st_ino))
+        return refs
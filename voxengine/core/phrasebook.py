@@ -0,0 +1,223 @@
+"""Pre-rendered phrasebooks for latency-critical profiles.
+
+A phrasebook holds a known vocabulary (UI role names, punctuation names, numbers, common words)
+rendered ahead of time for one backend/model/voice. All clips live in a single packed PCM file
+that is memory-mapped at request time, with a JSON offset index beside it::
+
+    <cache_dir>/phrasebooks/<key>/audio.<id>.pcm
+    <cache_dir>/phrasebooks/<key>/index.json
+
+Rebuilding writes a new audio file and then swaps the index, so readers never see an index that
+points into the wrong audio.
+
+:meth:`Phrasebook.lookup` serves an exact phrase, or a sequence of known phrases joined by short
+silences, without running the backend.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import re
+import threading
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from voxengine.adapters.audio.wavfile import read_wav_info
+from voxengine.core.cache import cache_key, write_text_atomic
+from voxengine.core.errors import UserConfigError
+
+INDEX_NAME = "index.json"
+DEFAULT_JOIN_MS = 40
+
+_TOKEN = re.compile(r"[\w']+")
+
+
+def normalize_phrase(text: str) -> str:
+    """Lookup key for a phrase: lower-case words separated by single spaces."""
+    return " ".join(_TOKEN.findall(text.lower()))
+
+
+@dataclass(frozen=True)
+class PhraseClip:
+    """Where a phrase's audio sits in the packed file, in frames."""
+
+    offset: int
+    frames: int
+
+
+class Phrasebook:
+    """Read-only, memory-mapped phrasebook."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        index = json.loads((self.path / INDEX_NAME).read_text(encoding="utf-8"))
+        self.sample_rate: int = index["sample_rate"]
+        self.channels: int = index["channels"]
+        self.join_ms: float = index.get("join_ms", DEFAULT_JOIN_MS)
+        self.clips: Dict[str, PhraseClip] = {
+            phrase: PhraseClip(*entry) for phrase, entry in index["phrases"].items()
+        }
+        self.max_words = max((len(p.split()) for p in self.clips), default=0)
+        self._fh = open(self.path / index["audio"], "rb")
+        size = os.fstat(self._fh.fileno()).st_size
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+    @property
+    def frame_size(self) -> int:
+        return self.channels * 2
+
+    def __len__(self) -> int:
+        return len(self.clips)
+
+    def lookup(self, text: str) -> Optional[bytes]:
+        """PCM for ``text`` if it is a known phrase or a sequence of them, else ``None``."""
+        key = normalize_phrase(text)
+        if not key or self._mm is None:
+            return None
+        clip = self.clips.get(key)
+        if clip is not None:
+            return self._pcm(clip)
+        parts = self._segment(key.split())
+        if parts is None:
+            return None
+        gap = b"\x00" * (int(self.sample_rate * self.join_ms / 1000) * self.frame_size)
+        return gap.join(self._pcm(c) for c in parts)
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+        self._fh.close()
+
+    def _pcm(self, clip: PhraseClip) -> bytes:
+        start = clip.offset * self.frame_size
+        return self._mm[start : start + clip.frames * self.frame_size]
+
+    def _segment(self, words: List[str]) -> Optional[List[PhraseClip]]:
+        """Cover ``words`` with known phrases, longest match first."""
+        parts: List[PhraseClip] = []
+        i = 0
+        while i < len(words):
+            for n in range(min(self.max_words, len(words) - i), 0, -1):
+                clip = self.clips.get(" ".join(words[i : i + n]))
+                if clip is not None:
+                    parts.append(clip)
+                    i += n
+                    break
+            else:
+                return None
+        return parts
+
+
+class PhrasebookWriter:
+    """Append rendered WAV clips to a new packed store, then publish it atomically."""
+
+    def __init__(self, path: Path, join_ms: float = DEFAULT_JOIN_MS, **labels: object) -> None:
+        self.path = Path(path)
+        self.join_ms = join_ms
+        self.labels = labels
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._audio_name = f"audio.{uuid.uuid4().hex[:8]}.pcm"
+        self._tmp = self.path / f".{self._audio_name}.part"
+        self._fh = open(self._tmp, "wb")
+        self._frames = 0
+        self._phrases: Dict[str, Tuple[int, int]] = {}
+        self._format: Optional[Tuple[int, int]] = None
+
+    def add(self, phrase: str, wav_path: Path) -> None:
+        key = normalize_phrase(phrase)
+        if not key or key in self._phrases:
+            return
+        info = read_wav_info(wav_path)
+        if info.sample_width != 2:
+            raise UserConfigError(f"Phrasebook clips must be 16-bit PCM: {wav_path}")
+        fmt = (info.sample_rate, info.channels)
+        if self._format is None:
+            self._format = fmt
+        elif fmt != self._format:
+            raise UserConfigError(f"Phrasebook clip format {fmt} differs from {self._format}.")
+        with open(wav_path, "rb") as src:
+            src.seek(info.data_offset)
+            data = src.read(info.frames * info.frame_size)
+        self._fh.write(data)
+        self._phrases[key] = (self._frames, info.frames)
+        self._frames += info.frames
+
+    def commit(self) -> Phrasebook:
+        self._fh.close()
+        if self._format is None:
+            self._tmp.unlink(missing_ok=True)
+            raise UserConfigError("No phrases were rendered for the phrasebook.")
+        os.replace(self._tmp, self.path / self._audio_name)
+        index = {
+            **self.labels,
+            "audio": self._audio_name,
+            "sample_rate": self._format[0],
+            "channels": self._format[1],
+            "join_ms": self.join_ms,
+            "phrases": self._phrases,
+        }
+        write_text_atomic(self.path / INDEX_NAME, json.dumps(index))
+        for old in self.path.glob("audio.*.pcm"):
+            if old.name != self._audio_name:
+                old.unlink(missing_ok=True)  # open readers keep their mapping
+        return Phrasebook(self.path)
+
+
+class PhrasebookStore:
+    """Phrasebooks under one directory, keyed by backend, model and voice."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self._open: Dict[str, Tuple[Optional[int], Optional[Phrasebook]]] = {}
+        self._lock = threading.Lock()
+
+    def path_for(self, backend: str, model: Optional[str], voice: Optional[str]) -> Path:
+        return self.root / cache_key(backend, model or "", voice or "")
+
+    def get(
+        self, backend: str, model: Optional[str], voice: Optional[str]
+    ) -> Optional[Phrasebook]:
+        """The phrasebook for this voice, or ``None`` if none was built.
+
+        Costs one ``stat`` per call; a phrasebook rebuilt by another process (for example the
+        CLI) is picked up on the next request. Replaced instances stay valid for requests still
+        reading them and are closed when garbage-collected.
+        """
+        path = self.path_for(backend, model, voice)
+        try:
+            stamp: Optional[int] = (path / INDEX_NAME).stat().st_mtime_ns
+        except FileNotFoundError:
+            stamp = None
+        with self._lock:
+            cached = self._open.get(path.name)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+            book = Phrasebook(path) if stamp is not None else None
+            self._open[path.name] = (stamp, book)
+            return book
+
+    def list(self) -> List[Dict[str, object]]:
+        if not self.root.exists():
+            return []
+        books = []
+        for index_path in sorted(self.root.glob(f"*/{INDEX_NAME}")):
+            meta = json.loads(index_path.read_text(encoding="utf-8"))
+            books.append(
+                {
+                    "path": str(index_path.parent),
+                    "backend": meta.get("backend"),
+                    "model": meta.get("model"),
+                    "voice": meta.get("voice"),
+                    "phrases": len(meta.get("phrases", {})),
+                }
+            )
+        return books
+
+
+def read_phrase_list(lines: Iterable[str]) -> List[str]:
+    """Phrases from a word list: one per line, blank lines and ``#`` comments ignored."""
+    return [s for s in (line.strip() for line in lines) if s and not s.startswith("#")]
@@ -0,0 +1,377 @@
+"""Speculative lookahead rendering for line-by-line preview playback.
+
+When an editor plays a scene through ``/v1/render/line``, each line request also queues the
+next ``lines`` lines of the scene at background priority. They are rendered into
+``<cache_dir>/lookahead`` under a key made of text, voice, profile and format. When the editor
+then asks for one of them, the finished file is moved into ``renders/<scene_id>/`` instead of
+being synthesized again. A render that is still running is joined rather than repeated.
+
+A request outside the current window (a jump to another line or scene) cancels the
+speculation that is queued or running for that project. Finished speculative files are kept
+until they are claimed, evicted from the index or collected with the rest of the cache.
+Speculative synthesis may use at most ``cpu_share`` of the machine's cores, measured over a
+sliding window that includes renders still running, and at most ``cpu_share`` × cores
+speculative renders (at least one) run at a time. Work over either limit is counted as
+``throttled`` and set aside without holding a worker thread. It goes back on the pool when a
+speculative render finishes, or when the window has drained enough.
+:meth:`LookaheadPrefetcher.snapshot` reports hit rates for tuning ``lines``.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Tuple
+
+from voxengine.adapters.audio.formats import get_format
+from voxengine.core.cache import cache_key, move_render
+from voxengine.core.cancel import CancelToken
+from voxengine.core.concurrency import usable_cores
+from voxengine.core.errors import CancelledError
+from voxengine.core.logging import get_logger
+from voxengine.core.workers import PRIORITY_BACKGROUND, WorkerPool
+
+if TYPE_CHECKING:
+    from voxengine.core.tts_service import TTSService, VoiceSpec
+
+log = get_logger("voxengine.prefetch")
+
+DEFAULT_LOOKAHEAD = 2
+DEFAULT_CPU_SHARE = 0.5
+SHARE_WINDOW_S = 10.0
+MAX_READY = 256
+
+QUEUED, RUNNING, READY, FAILED, CANCELLED = "queued", "running", "ready", "failed", "cancelled"
+
+
+@dataclass
+class _Speculation:
+    key: str
+    project: str
+    scene_id: str
+    index: int
+    path: Path
+    cancel: CancelToken = field(default_factory=CancelToken)
+    done: threading.Event = field(default_factory=threading.Event)
+    state: str = QUEUED
+    throttled: bool = False
+
+
+class LookaheadPrefetcher:
+    """Renders upcoming scene lines ahead of a preview playhead and hands them over on request.
+
+    ``lines`` is the default lookahead (``options["lookahead"]`` overrides it per request; 0
+    disables it). ``cpu_share`` caps speculative synthesis time as a fraction of all cores.
+    """
+
+    def __init__(
+        self,
+        tts: "TTSService",
+        root: Path,
+        workers: WorkerPool,
+        lines: int = DEFAULT_LOOKAHEAD,
+        cpu_share: float = DEFAULT_CPU_SHARE,
+        window_s: float = SHARE_WINDOW_S,
+    ) -> None:
+        self.tts = tts
+        self.root = Path(root)
+        self.workers = workers
+        self.lines = max(0, int(lines))
+        self.cpu_share = min(1.0, max(0.0, cpu_share))
+        self.window_s = window_s
+        self.cores = usable_cores()
+        self._lock = threading.Lock()
+        self._specs: "OrderedDict[str, _Speculation]" = OrderedDict()
+        self._busy: Deque[Tuple[float, float]] = deque()  # (start, end) of speculative renders
+        self._running: Dict[str, float] = {}  # key -> start of speculative renders in progress
+        self._waiting: List[Tuple[_Speculation, str, "VoiceSpec", dict]] = []  # throttled work
+        self._retry: Optional[threading.Timer] = None
+        self._counts: Dict[str, int] = {
+            "requests": 0,
+            "hits": 0,
+            "joined": 0,
+            "misses": 0,
+            "speculated": 0,
+            "cancelled": 0,
+            "failed": 0,
+            "throttled": 0,
+        }
+
+    # -- keys -------------------------------------------------------------------------------
+
+    def depth(self, options: dict) -> int:
+        """Lines to render ahead for a request with these options (0 when disabled)."""
+        if self.cpu_share <= 0:
+            return 0
+        return max(0, int(options.get("lookahead", self.lines)))
+
+    @staticmethod
+    def key(text: str, voice: "VoiceSpec", options: dict) -> str:
+        fmt = get_format(options.get("out_format", "wav"))
+        return cache_key(text, voice.key, options.get("profile") or "", fmt.name)
+
+    # -- playhead ---------------------------------------------------------------------------
+
+    def seek(self, project_path: str, scene_id: str, index: int, options: dict) -> None:
+        """Move the project's playhead to ``index``, cancelling speculation outside the window.
+
+        Line ``index`` itself stays alive so the request that follows can claim it.
+        """
+        window = range(index, index + self.depth(options) + 1)
+        stale: List[_Speculation] = []
+        with self._lock:
+            for spec in self._specs.values():
+                if spec.project != project_path or spec.state not in (QUEUED, RUNNING):
+                    continue
+                if spec.scene_id != scene_id or spec.index not in window:
+                    stale.append(spec)
+        for spec in stale:
+            spec.cancel.cancel(f"playhead moved to {scene_id} line {index}")
+        if stale:
+            self._wake()  # throttled ones are not on the pool to notice
+
+    def ahead(
+        self,
+        project_path: str,
+        scene_id: str,
+        upcoming: List[Tuple[int, str, "VoiceSpec"]],
+        options: dict,
+    ) -> int:
+        """Queue ``(index, text, voice)`` lines that are not already rendered or in flight."""
+        suffix = get_format(options.get("out_format", "wav")).suffix
+        queued = 0
+        for index, text, voice in upcoming:
+            key = self.key(text, voice, options)
+            with self._lock:
+                current = self._specs.get(key)
+                if current is not None and current.state in (QUEUED, RUNNING, READY):
+                    continue
+                path = self.root / f"{key}{suffix}"
+                spec = self._specs[key] = _Speculation(key, project_path, scene_id, index, path)
+            self.workers.submit(
+                self._speculate, spec, text, voice, options, priority=PRIORITY_BACKGROUND
+            )
+            queued += 1
+        self._trim()
+        return queued
+
+    # -- hand-over --------------------------------------------------------------------------
+
+    def claim(
+        self,
+        text: str,
+        voice: "VoiceSpec",
+        options: dict,
+        out_path: Path,
+        cancel: Optional[CancelToken] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Move a speculative render of this line to ``out_path``; ``None`` if there is none.
+
+        A render that is still running is waited for; one that has not started yet is dropped
+        so the caller renders the line itself at its own priority.
+        """
+        key = self.key(text, voice, options)
+        with self._lock:
+            self._counts["requests"] += 1
+            spec = self._specs.get(key)
+            if spec is not None and spec.state == QUEUED:
+                spec.state = CANCELLED
+                self._specs.pop(key, None)
+                spec = None
+        if spec is None:
+            self._count("misses")
+            return None
+        joined = not spec.done.is_set()
+        if joined:
+            while not spec.done.wait(0.05):
+                if cancel is not None:
+                    cancel.raise_if_cancelled()
+        with self._lock:
+            if self._specs.get(key) is spec:
+                del self._specs[key]
+        if spec.state != READY:
+            self._count("misses")
+            return None
+        try:
+            result = self._move(spec.path, out_path)
+        except OSError as exc:
+            log.warning("Could not take over speculative render %s: %s", spec.path, exc)
+            self._count("misses")
+            return None
+        self._count("joined" if joined else "hits")
+        return result
+
+    @staticmethod
+    def _move(src: Path, out_path: Path) -> Dict[str, Any]:
+        out_path = out_path.with_suffix(src.suffix)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        metadata = move_render(src, out_path)
+        return {
+            "audio_path": metadata["audio_path"],
+            "meta_path": metadata["meta_path"],
+            "duration_s": metadata.get("duration_s"),
+        }
+
+    # -- speculative work -------------------------------------------------------------------
+
+    def _speculate(
+        self, spec: _Speculation, text: str, voice: "VoiceSpec", options: dict
+    ) -> None:
+        try:
+            spec.cancel.raise_if_cancelled()
+            if not self._start(spec, text, voice, options):
+                return  # claimed by a request before it started, or throttled
+        except CancelledError:
+            spec.state = CANCELLED
+            self._discard(spec)
+            self._count("cancelled")
+            spec.done.set()
+            return
+        try:
+            try:
+                self.root.mkdir(parents=True, exist_ok=True)
+                self.tts.speak_line(
+                    text,
+                    spec.path,
+                    voice,
+                    profile=options.get("profile"),
+                    out_format=get_format(options.get("out_format", "wav")).name,
+                    cancel=spec.cancel,
+                )
+            finally:
+                with self._lock:
+                    self._busy.append((self._running.pop(spec.key), time.monotonic()))
+                self._wake()
+            with self._lock:
+                spec.state = READY
+        except CancelledError:
+            spec.state = CANCELLED
+            self._discard(spec)
+            self._count("cancelled")
+        except Exception as exc:  # noqa: BLE001
+            spec.state = FAILED
+            self._discard(spec)
+            self._count("failed")
+            log.warning("Lookahead render of %s line %d failed: %s", spec.scene_id, spec.index, exc)
+        finally:
+            spec.done.set()
+
+    def _start(self, spec: _Speculation, text: str, voice: "VoiceSpec", options: dict) -> bool:
+        """Mark ``spec`` running if speculation is within its limits, else set it aside.
+
+        The limits are checked and the render registered under one lock, so a burst of queued
+        speculations cannot all pass the check before any of them counts. Work set aside is
+        resubmitted by :meth:`_wake`: when a running render finishes, or, with none running,
+        once the window has drained below the share.
+        """
+        with self._lock:
+            if spec.state != QUEUED:
+                return False
+            if len(self._running) < self.max_running() and self._share() < self.cpu_share:
+                spec.state = RUNNING
+                self._running[spec.key] = time.monotonic()
+                self._counts["speculated"] += 1
+                return True
+            if not spec.throttled:
+                spec.throttled = True
+                self._counts["throttled"] += 1
+            self._waiting.append((spec, text, voice, options))
+            if not self._running and self._retry is None:
+                self._retry = threading.Timer(self._drain_s(), self._retry_now)
+                self._retry.daemon = True
+                self._retry.start()
+            return False
+
+    def _wake(self) -> None:
+        """Put throttled speculation back on the pool to check its limits again."""
+        with self._lock:
+            waiting, self._waiting = self._waiting, []
+        for spec, text, voice, options in waiting:
+            self.workers.submit(
+                self._speculate, spec, text, voice, options, priority=PRIORITY_BACKGROUND
+            )
+
+    def _retry_now(self) -> None:
+        with self._lock:
+            self._retry = None
+        self._wake()
+
+    def _drain_s(self) -> float:
+        """Seconds until finished renders alone fall under the share; callers hold _lock."""
+        limit = self.cpu_share * self.window_s * self.cores
+        now = time.monotonic()
+        lo, hi = now, now + self.window_s  # a whole window later nothing counts any more
+        for _ in range(20):
+            mid = (lo + hi) / 2
+            horizon = mid - self.window_s
+            busy = sum(max(0.0, end - max(start, horizon)) for start, end in self._busy)
+            lo, hi = (lo, mid) if busy < limit else (mid, hi)
+        return hi - now
+
+    def max_running(self) -> int:
+        """Speculative renders allowed at once: ``cpu_share`` of the cores, at least one."""
+        return max(1, int(self.cpu_share * self.cores))
+
+    def share(self) -> float:
+        """Fraction of all cores' time spent on speculative renders over the last window."""
+        with self._lock:
+            return self._share()
+
+    def _share(self) -> float:
+        # Callers hold _lock. Renders still running count from their start up to now.
+        now = time.monotonic()
+        horizon = now - self.window_s
+        while self._busy and self._busy[0][1] <= horizon:
+            self._busy.popleft()
+        busy = sum(end - max(start, horizon) for start, end in self._busy)
+        busy += sum(now - max(start, horizon) for start in self._running.values())
+        return busy / (self.window_s * self.cores)
+
+    def _discard(self, spec: _Speculation) -> None:
+        with self._lock:
+            if self._specs.get(spec.key) is spec:
+                del self._specs[spec.key]
+        self._remove(spec.path)
+
+    def _trim(self) -> None:
+        """Forget the oldest unclaimed renders beyond ``MAX_READY`` and delete their files."""
+        with self._lock:
+            ready = [s for s in self._specs.values() if s.state == READY]
+            evict = ready[: max(0, len(ready) - MAX_READY)]
+            for spec in evict:
+                del self._specs[spec.key]
+        for spec in evict:
+            self._remove(spec.path)
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        """Delete a speculative render and its sidecar; a failure here must not escape."""
+        for p in (path, path.with_suffix(".json")):
+            try:
+                p.unlink(missing_ok=True)
+            except OSError as exc:
+                log.debug("Could not remove %s: %s", p, exc)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counts[key] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        share = self.share()
+        with self._lock:
+            counts = dict(self._counts)
+            states: Dict[str, int] = {}
+            for spec in self._specs.values():
+                states[spec.state] = states.get(spec.state, 0) + 1
+        served = counts["hits"] + counts["joined"]
+        return {
+            "lines": self.lines,
+            "cpu_share": self.cpu_share,
+            "current_share": round(share, 3),
+            "counts": counts,
+            "hit_rate": round(served / counts["requests"], 3) if counts["requests"] else None,
+            "pending": states,
+        }
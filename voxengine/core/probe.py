@@ -0,0 +1,72 @@
+"""Cached capability probes refreshed off the request path."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Generic, Optional, TypeVar
+
+from voxengine.core.logging import get_logger
+
+log = get_logger("voxengine.probe")
+
+T = TypeVar("T")
+
+
+class CachedProbe(Generic[T]):
+    """Memoize an expensive probe with stale-while-revalidate semantics.
+
+    The first :meth:`get` runs the probe inline. Afterwards callers always get the cached value
+    immediately; once it is older than ``ttl_s`` a single background thread refreshes it.
+    """
+
+    def __init__(self, probe: Callable[[], T], ttl_s: float = 30.0, name: str = "probe") -> None:
+        self._probe = probe
+        self.ttl_s = float(ttl_s)
+        self.name = name
+        self._value: Optional[T] = None
+        self._stamp: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def get(self) -> T:
+        stamp = self._stamp
+        if stamp is None:
+            return self.refresh()
+        if time.monotonic() - stamp >= self.ttl_s:
+            self._refresh_in_background()
+        return self._value  # type: ignore[return-value]
+
+    def refresh(self) -> T:
+        """Run the probe now and cache its result."""
+        value = self._probe()
+        with self._lock:
+            self._value = value
+            self._stamp = time.monotonic()
+        return value
+
+    def invalidate(self) -> None:
+        """Force the next :meth:`get` to probe inline."""
+        with self._lock:
+            self._stamp = None
+
+    def age_s(self) -> Optional[float]:
+        stamp = self._stamp
+        return None if stamp is None else time.monotonic() - stamp
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run() -> None:
+            try:
+                self.refresh()
+            except Exception:  # noqa: BLE001
+                log.exception("Refreshing %s failed; keeping the cached value", self.name)
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name=f"voxengine-{self.name}", daemon=True).start()
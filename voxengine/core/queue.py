@@ -1,28 +1,133 @@
 """In-memory job queue (starter)."""
 
 from __future__ import annotations
+from bisect import bisect_left, insort
+import heapq
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+import threading
 import uuid
 import time
 
-@dataclass
+from voxengine.core.cancel import CancelToken
+from voxengine.core.errors import CancelledError
+from voxengine.core.logging import get_logger
+
+log = get_logger("voxengine.queue")
+
+TERMINAL_STATUSES = {"done", "error", "cancelled"}
+DEADLINE_REASON = "deadline exceeded"
+
+
+def project_key(project_path: str | Path) -> str:
+    """Canonical form of a project path used to group jobs."""
+    return str(Path(project_path).expanduser().resolve())
+
+
+@dataclass(slots=True)
 class Job:
     id: str
-    status: str = "queued"      # queued | running | done | error
+    status: str = "queued"      # queued | running | done | error | cancelled
     progress: float = 0.0
     detail: Optional[str] = None
     artifacts: Dict[str, Any] = field(default_factory=dict)
     created_at: float = field(default_factory=lambda: time.time())
+    project: Optional[str] = None
+    seq: int = 0
+    finished_at: Optional[float] = None
+    deadline: Optional[float] = None
+    cancel: CancelToken = field(default_factory=CancelToken, repr=False, compare=False)
+
+
+@dataclass(frozen=True)
+class JobEvent:
+    """A job state transition or progress update, numbered for resumable delivery."""
+
+    seq: int
+    job_id: str
+    # created | running | progress | cancelling | done | error | cancelled
+    type: str
+    status: str
+    progress: float
+    detail: Optional[str]
+    project: Optional[str]
+    at: float
+    artifacts: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "seq": self.seq,
+            "job_id": self.job_id,
+            "type": self.type,
+            "status": self.status,
+            "progress": self.progress,
+            "detail": self.detail,
+            "project": self.project,
+            "at": self.at,
+        }
+        if self.artifacts is not None:
+            data["artifacts"] = self.artifacts
+        return data
+
 
 class JobQueue:
-    def __init__(self) -> None:
+    """Job state store with bounded retention, secondary indexes and an event stream.
+
+    Finished jobs are evicted once there are more than ``max_finished`` of them or they are
+    older than ``finished_ttl_s``, so memory stays flat on long-running servers.
+    """
+
+    def __init__(
+        self,
+        history: int = 10000,
+        max_finished: int = 10000,
+        finished_ttl_s: Optional[float] = 24 * 3600,
+    ) -> None:
+        self.max_finished = max_finished
+        self.finished_ttl_s = finished_ttl_s
         self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._events: Deque[JobEvent] = deque(maxlen=history)
+        self._seq = 0
+        self._listeners: List[Callable[[JobEvent], None]] = []
+        self._job_seq = 0
+        self._by_seq: Dict[int, Job] = {}
+        # Sorted creation sequence numbers per ("all" | "status" | "project", value) key.
+        self._index: Dict[Tuple[str, str], List[int]] = {("all", ""): []}
+        self._finished: "OrderedDict[str, float]" = OrderedDict()
+        self._deadlines: List[Tuple[float, str]] = []
+        self._deadline_wake = threading.Condition(self._lock)
+        self._deadline_thread: Optional[threading.Thread] = None
+
+    def create(
+        self,
+        project: str | Path | None = None,
+        timeout_s: float | None = None,
+        job_id: str | None = None,
+    ) -> Job:
+        """Register a job; with ``timeout_s`` it is cancelled if still unfinished by then.
 
-    def create(self) -> Job:
-        job_id = str(uuid.uuid4())
-        job = Job(id=job_id)
-        self._jobs[job_id] = job
+        ``job_id`` keeps the ID of a job carried over from an earlier process.
+        """
+        job_id = job_id or str(uuid.uuid4())
+        job = Job(id=job_id, project=project_key(project) if project is not None else None)
+        if timeout_s is not None:
+            job.deadline = job.created_at + float(timeout_s)
+        with self._lock:
+            self._job_seq += 1
+            job.seq = self._job_seq
+            self._jobs[job_id] = job
+            self._by_seq[job.seq] = job
+            for key in self._keys(job):
+                self._index.setdefault(key, []).append(job.seq)
+            self._prune_locked(time.time())
+            if job.deadline is not None:
+                heapq.heappush(self._deadlines, (job.deadline, job_id))
+                self._ensure_deadline_thread()
+                self._deadline_wake.notify()
+        self._publish(job, "created")
         return job
 
     def get(self, job_id: str) -> Job:
@@ -30,23 +135,282 @@ class JobQueue:
 
     def set_running(self, job_id: str, detail: str | None = None) -> None:
         j = self._jobs[job_id]
-        j.status = "running"
+        if j.status in TERMINAL_STATUSES:
+            return  # cancelled while queued; the worker sees the fired token next
+        self._set_status(j, "running")
         j.detail = detail
+        self._publish(j, "running")
 
     def set_progress(self, job_id: str, progress: float, detail: str | None = None) -> None:
         j = self._jobs[job_id]
         j.progress = float(progress)
         if detail is not None:
             j.detail = detail
+        self._publish(j, "progress")
 
     def set_done(self, job_id: str, artifacts: Dict[str, Any] | None = None) -> None:
         j = self._jobs[job_id]
-        j.status = "done"
         j.progress = 1.0
         if artifacts:
             j.artifacts.update(artifacts)
+        self._set_status(j, "done")
+        self._publish(j, "done", artifacts=dict(j.artifacts))
 
-    def set_error(self, job_id: str, detail: str) -> None:
+    def set_error(
+        self, job_id: str, detail: str, artifacts: Dict[str, Any] | None = None
+    ) -> None:
         j = self._jobs[job_id]
-        j.status = "error"
         j.detail = detail
+        if artifacts:
+            j.artifacts.update(artifacts)
+        self._set_status(j, "error")
+        self._publish(j, "error", artifacts=dict(j.artifacts) if artifacts else None)
+
+    def set_cancelled(
+        self, job_id: str, detail: str | None = None, artifacts: Dict[str, Any] | None = None
+    ) -> None:
+        j = self._jobs[job_id]
+        if j.status in TERMINAL_STATUSES:
+            return
+        j.detail = detail or j.cancel.reason or "cancelled"
+        if artifacts:
+            j.artifacts.update(artifacts)
+        self._set_status(j, "cancelled")
+        self._publish(j, "cancelled", artifacts=dict(j.artifacts))
+
+    def finish_interrupted(
+        self, job_id: str, error: CancelledError, artifacts: Dict[str, Any] | None = None
+    ) -> None:
+        """Record a job stopped by its cancel token: ``error`` on a deadline, else ``cancelled``.
+
+        ``artifacts`` holds whatever was completed before the stop.
+        """
+        j = self._jobs[job_id]
+        if j.status in TERMINAL_STATUSES:
+            return
+        partial = dict(artifacts or {}, partial=True)
+        if j.cancel.reason == DEADLINE_REASON:
+            self.set_error(job_id, f"Deadline exceeded: {error}", partial)
+        else:
+            self.set_cancelled(job_id, j.cancel.reason, partial)
+
+    def cancel(self, job_id: str, reason: str = "cancelled by request") -> bool:
+        """Ask a job to stop; returns ``False`` if it had already finished.
+
+        A queued job is cancelled at once. A running job's token fires, killing in-flight
+        backend work where supported, and its worker records partial results.
+        """
+        j = self._jobs[job_id]
+        if j.status in TERMINAL_STATUSES or not j.cancel.cancel(reason):
+            return False
+        if j.status == "queued":
+            if reason == DEADLINE_REASON:
+                self.set_error(job_id, "Deadline exceeded before the job started.")
+            else:
+                self.set_cancelled(job_id, reason)
+        else:
+            j.detail = reason
+            self._publish(j, "cancelling")
+        return True
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    # -- deadlines --------------------------------------------------------------------------
+
+    def _ensure_deadline_thread(self) -> None:
+        if self._deadline_thread is None or not self._deadline_thread.is_alive():
+            self._deadline_thread = threading.Thread(
+                target=self._watch_deadlines, name="voxengine-job-deadlines", daemon=True
+            )
+            self._deadline_thread.start()
+
+    def _watch_deadlines(self) -> None:
+        """One thread for every deadline: sleep until the earliest one, then cancel that job."""
+        while True:
+            with self._lock:
+                while not self._deadlines:
+                    self._deadline_wake.wait()
+                deadline, job_id = self._deadlines[0]
+                delay = deadline - time.time()
+                if delay > 0:
+                    self._deadline_wake.wait(delay)
+                    continue
+                heapq.heappop(self._deadlines)
+                job = self._jobs.get(job_id)
+            if job is not None and job.status not in TERMINAL_STATUSES:
+                log.warning("Job %s exceeded its deadline; cancelling", job_id)
+                self.cancel(job_id, DEADLINE_REASON)
+
+    # -- listing ----------------------------------------------------------------------------
+
+    def list(
+        self,
+        status: str | None = None,
+        project: str | Path | None = None,
+        created_after: float | None = None,
+        created_before: float | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> Tuple[List[Job], Optional[str]]:
+        """Return jobs newest first plus an opaque cursor for the next page (``None`` at the end).
+
+        Filtering walks the smallest matching index, so a page costs O(log n + limit) for
+        selective filters.
+        """
+        keys = [("all", "")]
+        if status is not None:
+            keys.append(("status", status))
+        if project is not None:
+            keys.append(("project", project_key(project)))
+        key_project = keys[-1][1] if project is not None else None
+        with self._lock:
+            seqs = min((self._index.get(k, []) for k in keys), key=len)
+            end = len(seqs)
+            if cursor:
+                end = bisect_left(seqs, int(cursor))
+            page: List[Job] = []
+            i = end - 1
+            while i >= 0 and len(page) < limit:
+                job = self._by_seq[seqs[i]]
+                i -= 1
+                if created_after is not None and job.created_at < created_after:
+                    break
+                if created_before is not None and job.created_at >= created_before:
+                    continue
+                if status is not None and job.status != status:
+                    continue
+                if key_project is not None and job.project != key_project:
+                    continue
+                page.append(job)
+            more = i >= 0 and len(page) == limit
+        return page, (str(page[-1].seq) if more else None)
+
+    def prune(self) -> int:
+        """Evict expired finished jobs now; returns how many were removed."""
+        with self._lock:
+            return self._prune_locked(time.time())
+
+    def _keys(self, job: Job) -> Iterable[Tuple[str, str]]:
+        yield ("all", "")
+        yield ("status", job.status)
+        if job.project is not None:
+            yield ("project", job.project)
+
+    def _set_status(self, job: Job, status: str) -> None:
+        with self._lock:
+            old = self._index.get(("status", job.status), [])
+            i = bisect_left(old, job.seq)
+            if i < len(old) and old[i] == job.seq:
+                del old[i]
+            job.status = status
+            insort(self._index.setdefault(("status", status), []), job.seq)
+            if status in TERMINAL_STATUSES:
+                now = time.time()
+                job.finished_at = now
+                self._finished[job.id] = now
+                self._finished.move_to_end(job.id)
+                self._prune_locked(now)
+
+    def _prune_locked(self, now: float) -> int:
+        removed = 0
+        while self._finished:
+            job_id, finished_at = next(iter(self._finished.items()))
+            expired = self.finished_ttl_s is not None and now - finished_at > self.finished_ttl_s
+            if not expired and len(self._finished) <= self.max_finished:
+                break
+            del self._finished[job_id]
+            job = self._jobs.pop(job_id, None)
+            if job is None:
+                continue
+            del self._by_seq[job.seq]
+            for key in self._keys(job):
+                seqs = self._index.get(key)
+                if not seqs:
+                    continue
+                i = bisect_left(seqs, job.seq)
+                if i < len(seqs) and seqs[i] == job.seq:
+                    del seqs[i]
+                if not seqs and key[0] == "project":
+                    del self._index[key]
+            removed += 1
+        return removed
+
+    # -- event stream -----------------------------------------------------------------------
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def oldest_seq(self) -> int:
+        """Sequence number of the oldest event still buffered (``last_seq + 1`` if none)."""
+        with self._lock:
+            return self._events[0].seq if self._events else self._seq + 1
+
+    def events_since(
+        self, seq: int, job_id: str | None = None, project: str | Path | None = None
+    ) -> List[JobEvent]:
+        """Buffered events newer than ``seq``, optionally limited to one job or project."""
+        key = project_key(project) if project is not None else None
+        with self._lock:
+            if not self._events or self._events[-1].seq <= seq:
+                return []
+            start = max(0, seq - self._events[0].seq + 1)
+            events = [self._events[i] for i in range(start, len(self._events))]
+        return [
+            e
+            for e in events
+            if (job_id is None or e.job_id == job_id) and (key is None or e.project == key)
+        ]
+
+    def snapshot(
+        self, job_id: str | None = None, project: str | Path | None = None
+    ) -> List[Dict[str, Any]]:
+        """Current state of matching jobs, for clients whose resume point fell out of the buffer."""
+        key = project_key(project) if project is not None else None
+        jobs = [self._jobs[job_id]] if job_id is not None and job_id in self._jobs else []
+        if job_id is None:
+            jobs = [j for j in list(self._jobs.values()) if key is None or j.project == key]
+        return [
+            {
+                "job_id": j.id,
+                "status": j.status,
+                "progress": j.progress,
+                "detail": j.detail,
+                "project": j.project,
+                "artifacts": dict(j.artifacts),
+            }
+            for j in jobs
+        ]
+
+    def add_listener(self, listener: Callable[[JobEvent], None]) -> None:
+        """Call ``listener`` (from the publishing thread) for every new event."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[JobEvent], None]) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _publish(self, job: Job, type_: str, artifacts: Dict[str, Any] | None = None) -> None:
+        with self._lock:
+            self._seq += 1
+            event = JobEvent(
+                seq=self._seq,
+                job_id=job.id,
+                type=type_,
+                status=job.status,
+                progress=job.progress,
+                detail=job.detail,
+                project=job.project,
+                at=time.time(),
+                artifacts=artifacts,
+            )
+            self._events.append(event)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception:  # noqa: BLE001
+                log.exception("Job event listener failed")
@@ -17,7 +17,12 @@ class LLMAdapter(Protocol):
 
 
 class TTSAdapter(Protocol):
-    """Protocol for TTS adapters."""
+    """Protocol for TTS adapters.
+
+    Adapters may also accept a ``cancel`` keyword (a :class:`~voxengine.core.cancel.CancelToken`)
+    to abort in-flight synthesis, and a ``threads`` keyword capping the threads one synthesis may
+    use; the engine only passes these to adapters that declare them.
+    """
 
     def about(self) -> dict: ...
     def speak(self, text: str, out_path, model_path=None, voice=None, profile=None, out_format="wav"):
@@ -1,29 +1,578 @@
-"""Render service (starter)."""
+"""Render service."""
 
 from __future__ import annotations
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from voxengine.adapters.audio.formats import NATIVE_FORMAT, get_format
+from voxengine.core.affinity import DEFAULT_MAX_RUN, affinity_order
+from voxengine.core.assemble import CUES_NAME, MASTER_NAME, SceneAssembler
+from voxengine.core.cache import move_render
+from voxengine.core.cancel import CancelToken
+from voxengine.core.checkpoint import (
+    CheckpointState,
+    RenderCheckpoint,
+    interrupted,
+    partial_name,
+    remove_partials,
+)
+from voxengine.core.coordinator import RenderCoordinator, RenderTask
+from voxengine.core.errors import CancelledError
+from voxengine.core.logging import get_logger, log_context
+from voxengine.core.prefetch import LookaheadPrefetcher
 from voxengine.core.queue import JobQueue
-from voxengine.core.tts_service import TTSService
+from voxengine.core.timing import collect, span
+from voxengine.core.tts_service import TTSService, VoiceSpec
+from voxengine.core.workers import PRIORITY_BATCH, PRIORITY_INTERACTIVE, WorkerPool
 from voxengine.project.format import ProjectManager
+import contextvars
+import os
+import socket
 import threading
+import time
+
+log = get_logger("voxengine.render")
+
+DEFAULT_BATCH_SIZE = 8
+
 
 class RenderService:
-    def __init__(self, queue: JobQueue, tts: TTSService, projects: ProjectManager) -> None:
+    def __init__(
+        self,
+        queue: JobQueue,
+        tts: TTSService,
+        projects: ProjectManager,
+        workers: Optional[WorkerPool] = None,
+        scene_workers: Optional[WorkerPool] = None,
+        coordinator: Optional[RenderCoordinator] = None,
+        timeout_s: Optional[float] = None,
+        prefetch: Optional[LookaheadPrefetcher] = None,
+        checkpoint_dir: Optional[Path] = None,
+    ) -> None:
         self.queue = queue
         self.tts = tts
         self.projects = projects
+        self.workers = workers
+        self.scene_workers = scene_workers
+        self.coordinator = coordinator
+        self.timeout_s = timeout_s
+        self.prefetch = prefetch
+        self.checkpoint_dir = checkpoint_dir
+
+    def _create_job(self, project_path: str, options: dict, job_id: Optional[str] = None):
+        """New job whose deadline is ``options["timeout_s"]`` (default: the service timeout)."""
+        timeout_s = options.get("timeout_s", self.timeout_s)
+        return self.queue.create(
+            project=project_path, timeout_s=float(timeout_s) if timeout_s else None, job_id=job_id
+        )
+
+    def _checkpoint(
+        self, job_id: str, project_path: str, scene_id: str, voice_map: dict, options: dict
+    ) -> Optional[RenderCheckpoint]:
+        """Open (or start) the job's checkpoint journal; ``None`` without a checkpoint dir."""
+        if self.checkpoint_dir is None:
+            return None
+        job = {
+            "job_id": job_id,
+            "project_path": str(Path(project_path).resolve()),
+            "scene_id": scene_id,
+            "voice_map": voice_map,
+            "options": options,
+        }
+        return RenderCheckpoint.start(self.checkpoint_dir, job)
 
     def render_scene_async(self, project_path: str, scene_id: str, voice_map: dict, options: dict) -> str:
-        job = self.queue.create()
+        job = self._create_job(project_path, options)
+        args = (job.id, project_path, scene_id, dict(voice_map), dict(options))
+        if self.coordinator is not None and options.get("distributed", True):
+            # Remote workers do the rendering; this thread only mirrors their progress.
+            self._spawn(job.id, self._run_distributed, args, thread=True)
+        else:
+            # Journaled before it is queued, so a restart resumes it even if it never started.
+            checkpoint = self._checkpoint(*args)
+            self._spawn(job.id, self._run, args + (None, checkpoint), pool=self.scene_workers)
+        return job.id
+
+    def resume_interrupted(self) -> List[str]:
+        """Restart scene renders that a previous process left unfinished; returns their IDs.
 
-        def run():
+        Each keeps its job ID and skips the lines its checkpoint shows as intact. Jobs whose
+        journal is still locked by a live process are left to that process.
+        """
+        if self.checkpoint_dir is None:
+            return []
+        resumed = []
+        for state in interrupted(self.checkpoint_dir):
             try:
-                self.queue.set_running(job.id, f"rendering scene {scene_id}")
-                self.queue.set_progress(job.id, 0.25, "loading scene")
-                self.projects.validate(project_path)
-                self.queue.set_progress(job.id, 0.75, "placeholder render complete")
-                self.queue.set_done(job.id, {"note": "Scene rendering not implemented yet."})
-            except Exception as e:
-                self.queue.set_error(job.id, str(e))
+                self.queue.get(state.job_id)
+                continue  # already running in this process
+            except KeyError:
+                pass
+            checkpoint = RenderCheckpoint.claim(state)
+            if checkpoint is None:
+                owner = state.job.get("owner")
+                log.debug("Not resuming job %s: %s is still running it", state.job_id, owner)
+                continue
+            state = RenderCheckpoint.load(state.path) or state  # lines its owner added since
+            job = state.job
+            project_path, scene_id = job["project_path"], job["scene_id"]
+            options = dict(job.get("options") or {})
+            removed = remove_partials(Path(project_path) / "renders" / scene_id, state.job_id)
+            log.info(
+                "Resuming render of %s (job %s): %d lines checkpointed, %d partial files removed",
+                scene_id,
+                state.job_id,
+                len(state.lines),
+                removed,
+            )
+            self._create_job(project_path, options, job_id=state.job_id)
+            voice_map = dict(job.get("voice_map") or {})
+            args = (state.job_id, project_path, scene_id, voice_map, options, state, checkpoint)
+            self._spawn(state.job_id, self._run, args, pool=self.scene_workers)
+            resumed.append(state.job_id)
+        return resumed
+
+    def render_line(
+        self,
+        project_path: str,
+        scene_id: str,
+        index: int,
+        line: Dict[str, Any],
+        voice_map: dict,
+        options: dict,
+        cancel: Optional[CancelToken] = None,
+        lookahead: bool = False,
+        checkpoint: Optional[RenderCheckpoint] = None,
+        voices: Optional[Dict[Optional[str], VoiceSpec]] = None,
+    ) -> str:
+        """Render one script line into ``renders/<scene_id>/line_NNN`` and return its path.
 
-        threading.Thread(target=run, daemon=True).start()
+        The take is written under a temp name and renamed into place, so the line file is never
+        seen half-written. With ``lookahead`` a finished (or running) speculative render of the
+        line is used instead of synthesizing it again. With ``checkpoint`` the finished line is
+        recorded in the job's journal. ``voices`` is the job's memo for :meth:`voice_for`.
+        """
+        fmt = get_format(options.get("out_format", "wav"))
+        voice = self.voice_for(line, voice_map, options, voices)
+        out_path = Path(project_path) / "renders" / scene_id / f"line_{index:03d}{fmt.suffix}"
+        result = None
+        if lookahead and self.prefetch is not None:
+            with span("lookahead"):
+                result = self.prefetch.claim(line["text"], voice, options, out_path, cancel)
+        if result is None:
+            tmp = partial_name(out_path, checkpoint.job_id if checkpoint is not None else None)
+            try:
+                result = self.tts.speak_line(
+                    line["text"],
+                    tmp,
+                    voice,
+                    profile=options.get("profile"),
+                    out_format=fmt.name,
+                    cancel=cancel,
+                )
+                move_render(tmp, out_path)
+            finally:
+                tmp.unlink(missing_ok=True)
+                tmp.with_suffix(".json").unlink(missing_ok=True)
+        with span("index"):
+            row = self.projects.renders(project_path).record(
+                scene_id,
+                index,
+                out_path,
+                text=line["text"],
+                duration_s=result.get("duration_s"),
+            )
+        if checkpoint is not None:
+            checkpoint.line(index, str(out_path), row)
+        return str(out_path)
+
+    def voice_for(
+        self,
+        line: Dict[str, Any],
+        voice_map: dict,
+        options: dict,
+        voices: Optional[Dict[Optional[str], VoiceSpec]] = None,
+    ) -> VoiceSpec:
+        """The line's voice. Resolving a model rescans the models directory, so a job passes a
+        ``voices`` dict and each voice-map entry is resolved once for all of its lines.
+        """
+        spec = voice_map.get(line.get("character", ""), voice_map.get("*"))
+        if voices is None:
+            return self.tts.resolve_voice(spec, options)
+        if spec not in voices:
+            voices[spec] = self.tts.resolve_voice(spec, options)
+        return voices[spec]
+
+    def schedule(
+        self,
+        lines: List[Dict[str, Any]],
+        voice_map: dict,
+        options: dict,
+        voices: Optional[Dict[Optional[str], VoiceSpec]] = None,
+    ) -> List[tuple[int, Dict[str, Any]]]:
+        """``(index, line)`` pairs in render order.
+
+        Lines are grouped by voice so each model stays warm (see :func:`affinity_order`), unless
+        ``options["affinity"]`` is false. ``options["affinity_run"]`` caps how many lines of one
+        voice run before the next voice gets a turn.
+        """
+        numbered = list(enumerate(lines, start=1))
+        if not options.get("affinity", True):
+            return numbered
+        if voices is None:
+            voices = {}
+        keys = {
+            idx: self.voice_for(line, voice_map, options, voices).key for idx, line in numbered
+        }
+        run = int(options.get("affinity_run", DEFAULT_MAX_RUN))
+        return affinity_order(numbered, key=lambda entry: keys[entry[0]], max_run=run)
+
+    def assemble(
+        self, project_path: str, scene_id: str, lines: List[str], options: dict
+    ) -> Dict[str, Any]:
+        """Stitch rendered lines into the scene master; returns artifacts (empty if skipped).
+
+        Only WAV renders are assembled; pass ``assemble: false`` to skip it.
+        """
+        if not lines or not options.get("assemble", True):
+            return {}
+        if get_format(options.get("out_format", NATIVE_FORMAT)).name != NATIVE_FORMAT:
+            return {}
+        scene_dir = Path(project_path) / "renders" / scene_id
+        with span("assemble"):
+            cues = self._assembler(options).assemble(scene_dir, [Path(p) for p in lines])
+        return {
+            "master": str(scene_dir / MASTER_NAME),
+            "cues": str(scene_dir / CUES_NAME),
+            "duration_ms": cues["duration_ms"],
+        }
+
+    def rerender_line_async(
+        self, project_path: str, scene_id: str, index: int, voice_map: dict, options: dict
+    ) -> str:
+        """Re-render one line and splice it into the existing scene master."""
+        job = self._create_job(project_path, options)
+        args = (job.id, project_path, scene_id, index, dict(voice_map), dict(options))
+        # An editor is waiting on it: ahead of promotion and lookahead on the shared pool.
+        self._spawn(job.id, self._run_line, args, pool=self.workers, priority=PRIORITY_INTERACTIVE)
         return job.id
+
+    def _spawn(
+        self,
+        job_id: str,
+        target: Callable[..., None],
+        args: tuple,
+        thread: bool = False,
+        pool: Optional[WorkerPool] = None,
+        priority: int = PRIORITY_BATCH,
+    ) -> None:
+        """Run ``target`` on ``pool`` (or a thread) with ``job_id`` bound for logging."""
+        with log_context(job_id=job_id):
+            if pool is not None and not thread:
+                pool.submit(target, *args, priority=priority)
+            else:
+                ctx = contextvars.copy_context()
+                threading.Thread(target=ctx.run, args=(target, *args), daemon=True).start()
+
+    @staticmethod
+    def _assembler(options: dict) -> SceneAssembler:
+        rate = options.get("sample_rate")
+        return SceneAssembler(
+            gap_ms=float(options.get("gap_ms", 300)), sample_rate=int(rate) if rate else None
+        )
+
+    def _run_line(
+        self,
+        job_id: str,
+        project_path: str,
+        scene_id: str,
+        index: int,
+        voice_map: dict,
+        options: dict,
+    ) -> None:
+        with collect() as timings:
+            try:
+                self.queue.set_running(job_id, f"re-rendering line {index} of scene {scene_id}")
+                cancel = self.queue.get(job_id).cancel
+                cancel.raise_if_cancelled()
+                with span("script_load"):
+                    line = self.projects.load_line(project_path, scene_id, index)
+                lookahead = self.prefetch is not None and self.prefetch.depth(options) > 0
+                if lookahead:
+                    self.prefetch.seek(project_path, scene_id, index, options)
+                path = self.render_line(
+                    project_path,
+                    scene_id,
+                    index,
+                    line,
+                    voice_map,
+                    options,
+                    cancel=cancel,
+                    lookahead=lookahead,
+                )
+                artifacts: Dict[str, Any] = {"scene_id": scene_id, "index": index, "line": path}
+                scene_dir = Path(project_path) / "renders" / scene_id
+                if (scene_dir / CUES_NAME).exists() and Path(path).suffix == ".wav":
+                    with span("assemble"):
+                        cues = self._assembler(options).patch(scene_dir, index, Path(path))
+                    artifacts.update(
+                        master=str(scene_dir / MASTER_NAME),
+                        cues=str(scene_dir / CUES_NAME),
+                        duration_ms=cues["duration_ms"],
+                    )
+                artifacts["timings_ms"] = timings.as_dict()
+                self.queue.set_done(job_id, artifacts)
+                if lookahead:
+                    self._look_ahead(project_path, scene_id, index, voice_map, options)
+            except CancelledError as e:
+                self.queue.finish_interrupted(job_id, e, {"scene_id": scene_id, "index": index})
+            except Exception as e:
+                self.queue.set_error(job_id, str(e))
+
+    def _look_ahead(
+        self, project_path: str, scene_id: str, index: int, voice_map: dict, options: dict
+    ) -> None:
+        """Queue speculative renders of the lines after ``index``; failures only log."""
+        assert self.prefetch is not None
+        upcoming = []
+        voices: Dict[Optional[str], VoiceSpec] = {}
+        try:
+            for nxt in range(index + 1, index + self.prefetch.depth(options) + 1):
+                try:
+                    line = self.projects.load_line(project_path, scene_id, nxt)
+                except ValueError:
+                    break  # end of the scene
+                voice = self.voice_for(line, voice_map, options, voices)
+                upcoming.append((nxt, line["text"], voice))
+            self.prefetch.ahead(project_path, scene_id, upcoming, options)
+        except Exception as exc:  # noqa: BLE001
+            log.warning("Lookahead after %s line %d skipped: %s", scene_id, index, exc)
+
+    def _run(
+        self,
+        job_id: str,
+        project_path: str,
+        scene_id: str,
+        voice_map: dict,
+        options: dict,
+        resume: Optional[CheckpointState] = None,
+        checkpoint: Optional[RenderCheckpoint] = None,
+    ) -> None:
+        done: Dict[int, str] = {}
+        voices: Dict[Optional[str], VoiceSpec] = {}
+        with collect() as timings:
+            try:
+                verb = "resuming" if resume is not None else "rendering"
+                self.queue.set_running(job_id, f"{verb} scene {scene_id}")
+                cancel = self.queue.get(job_id).cancel
+                with span("script_load"):
+                    self.projects.validate(project_path)
+                    lines = self.projects.load_scene(project_path, scene_id).get("lines", [])
+                kept = 0
+                order = self.schedule(lines, voice_map, options, voices)
+                for n, (idx, line) in enumerate(order, 1):
+                    cancel.raise_if_cancelled()
+                    path = None
+                    if resume is not None:
+                        with span("checkpoint_verify"):
+                            path = resume.verified(idx, line["text"])
+                    if path is not None:
+                        kept += 1
+                    else:
+                        path = self.render_line(
+                            project_path,
+                            scene_id,
+                            idx,
+                            line,
+                            voice_map,
+                            options,
+                            cancel=cancel,
+                            checkpoint=checkpoint,
+                            voices=voices,
+                        )
+                    done[idx] = path
+                    total = len(lines)
+                    self.queue.set_progress(job_id, n / total, f"rendered line {n}/{total}")
+                rendered = [done[i] for i in sorted(done)]
+                artifacts: Dict[str, Any] = {"scene_id": scene_id, "lines": rendered}
+                if resume is not None:
+                    artifacts["resumed_lines"] = kept
+                artifacts.update(self.assemble(project_path, scene_id, rendered, options))
+                artifacts["timings_ms"] = timings.as_dict()
+                self.queue.set_done(job_id, artifacts)
+            except CancelledError as e:
+                partial = {"scene_id": scene_id, "lines": [done[i] for i in sorted(done)]}
+                self.queue.finish_interrupted(job_id, e, partial)
+            except Exception as e:
+                self.queue.set_error(job_id, str(e))
+        if checkpoint is not None:
+            checkpoint.discard()
+
+    def _run_distributed(
+        self, job_id: str, project_path: str, scene_id: str, voice_map: dict, options: dict
+    ) -> None:
+        """Split the scene into line batches on the coordinator and mirror their progress."""
+        assert self.coordinator is not None
+        cancel = self.queue.get(job_id).cancel
+        partial: Dict[str, Any] = {"scene_id": scene_id, "lines": []}
+        try:
+            self.queue.set_running(job_id, f"queueing scene {scene_id} for render workers")
+            cancel.raise_if_cancelled()
+            self.projects.validate(project_path)
+            lines = self.projects.load_scene(project_path, scene_id).get("lines", [])
+            size = max(1, int(options.get("batch_size", DEFAULT_BATCH_SIZE)))
+            # Batches hold lines of a single voice so a worker warm on that voice can claim
+            # them; voices alternate in the queue so none waits behind another's whole part.
+            affinity = options.get("affinity", True)
+            groups: Dict[str, List[Dict[str, Any]]] = {}
+            voices: Dict[Optional[str], VoiceSpec] = {}
+            for idx, line in enumerate(lines, start=1):
+                key = self.voice_for(line, voice_map, options, voices).key if affinity else ""
+                groups.setdefault(key, []).append({"index": idx, "line": line})
+            batches = [
+                {
+                    "project_path": str(Path(project_path).resolve()),
+                    "scene_id": scene_id,
+                    "voice_map": voice_map,
+                    "options": options,
+                    "voice": key or None,
+                    "lines": numbered[start : start + size],
+                }
+                for key, numbered in groups.items()
+                for start in range(0, len(numbered), size)
+            ]
+            batches = affinity_order(batches, key=lambda b: b["voice"], max_run=1)
+            self.coordinator.submit(job_id, str(project_path), scene_id, batches)
+            poll_s = float(options.get("poll_s", 0.5))
+            done = -1
+            while True:
+                status = self.coordinator.job_status(job_id)
+                if status["lines_done"] != done:
+                    done = status["lines_done"]
+                    total = max(status["total_lines"], 1)
+                    self.queue.set_progress(job_id, done / total, f"rendered {done}/{total} lines")
+                if status["finished"]:
+                    break
+                if cancel.wait(poll_s):
+                    # Pending batches are dropped; workers holding one lose their lease on the
+                    # next heartbeat and kill their in-flight synthesis.
+                    self.coordinator.cancel_job(job_id)
+                    status = self.coordinator.job_status(job_id)
+                    lines = sorted((e["index"], e["path"]) for e in status["lines"])
+                    partial = {"scene_id": scene_id, "lines": [p for _, p in lines]}
+                    raise CancelledError(cancel.reason or "cancelled")
+            if status["errors"]:
+                self.queue.set_error(job_id, "; ".join(status["errors"]))
+                return
+            rendered = [p for _, p in sorted((e["index"], e["path"]) for e in status["lines"])]
+            artifacts = {"scene_id": scene_id, "lines": rendered}
+            artifacts.update(self.assemble(project_path, scene_id, rendered, options))
+            self.queue.set_done(job_id, artifacts)
+        except CancelledError as e:
+            self.queue.finish_interrupted(job_id, e, partial)
+        except Exception as e:
+            self.queue.set_error(job_id, str(e))
+
+
+class RenderWorker:
+    """Lease line batches from a coordinator and render them with a local engine.
+
+    Started by ``voxengine worker``; several workers (threads, processes or machines) can share
+    one coordinator. Results are written straight into the project's ``renders/`` tree.
+
+    A worker keeps leasing batches of the voice it rendered last while there are any, so its
+    model stays warm. After ``max_streak`` such batches in a row it takes the oldest batch
+    instead, so other voices are not starved.
+    """
+
+    def __init__(
+        self,
+        render: RenderService,
+        coordinator: RenderCoordinator,
+        worker_id: Optional[str] = None,
+        heartbeat_s: Optional[float] = None,
+        max_streak: int = 8,
+    ) -> None:
+        self.render = render
+        self.coordinator = coordinator
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.heartbeat_s = heartbeat_s or max(coordinator.lease_s / 3, 0.05)
+        self.max_streak = max_streak
+        self.completed = 0
+        self.warm_voice: Optional[str] = None
+        self._streak = 0
+
+    def run(
+        self,
+        stop: Optional[threading.Event] = None,
+        max_idle_s: Optional[float] = None,
+        poll_s: float = 1.0,
+    ) -> int:
+        """Process batches until ``stop`` is set or nothing was available for ``max_idle_s``."""
+        stop = stop or threading.Event()
+        idle_since = time.monotonic()
+        while not stop.is_set():
+            task = self.lease()
+            if task is None:
+                if max_idle_s is not None and time.monotonic() - idle_since >= max_idle_s:
+                    break
+                stop.wait(poll_s)
+                continue
+            with log_context(job_id=task.job_id):
+                self.process(task)
+            idle_since = time.monotonic()
+        return self.completed
+
+    def lease(self) -> Optional[RenderTask]:
+        """Lease the next batch, preferring the voice this worker is warm on."""
+        prefer = self.warm_voice if self._streak < self.max_streak else None
+        task = self.coordinator.lease(self.worker_id, prefer=prefer)
+        if task is not None:
+            voice = task.payload.get("voice")
+            if voice is not None and voice == self.warm_voice:
+                self._streak += 1
+            else:
+                self.warm_voice, self._streak = voice, 1
+        return task
+
+    def process(self, task: RenderTask) -> None:
+        lost = CancelToken()
+        finished = threading.Event()
+
+        def beat() -> None:
+            while not finished.wait(self.heartbeat_s):
+                if not self.coordinator.heartbeat(task.task_id, self.worker_id):
+                    # Expired or cancelled: stop rendering, killing the backend mid-line.
+                    lost.cancel("lease lost")
+                    return
+
+        beater = threading.Thread(target=beat, name="voxengine-heartbeat", daemon=True)
+        beater.start()
+        p = task.payload
+        results: List[Dict[str, Any]] = []
+        voices: Dict[Optional[str], VoiceSpec] = {}
+        try:
+            for entry in p["lines"]:
+                lost.raise_if_cancelled()
+                path = self.render.render_line(
+                    p["project_path"],
+                    p["scene_id"],
+                    entry["index"],
+                    entry["line"],
+                    p["voice_map"],
+                    p["options"],
+                    cancel=lost,
+                    voices=voices,
+                )
+                results.append({"index": entry["index"], "path": path})
+        except CancelledError:
+            log.warning("Lost lease on task %s; abandoning batch", task.task_id)
+            return
+        except Exception as exc:  # noqa: BLE001
+            log.warning("Task %s failed on %s: %s", task.task_id, self.worker_id, exc)
+            self.coordinator.fail(task.task_id, self.worker_id, str(exc))
+            return
+        finally:
+            finished.set()
+            beater.join()
+        if self.coordinator.complete(task.task_id, self.worker_id, {"lines": results}):
+            self.completed += 1
@@ -0,0 +1,129 @@
+"""Per-stage timing spans and on-demand profiling.
+
+Code wraps each pipeline stage in :func:`span`. Spans are always folded into process-wide
+per-stage aggregates (:func:`stage_stats`); inside :func:`collect` they are also recorded for the
+current request or job, which is how ``timings_ms`` and the ``Server-Timing`` header are built.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import contextvars
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+_current: contextvars.ContextVar[Optional["Timings"]] = contextvars.ContextVar(
+    "voxengine_timings", default=None
+)
+
+
+@dataclass
+class Timings:
+    """Stage durations recorded for one request or job (repeated stages accumulate)."""
+
+    spans_ms: Dict[str, float] = field(default_factory=dict)
+    started: float = field(default_factory=time.perf_counter)
+
+    def add(self, stage: str, ms: float) -> None:
+        self.spans_ms[stage] = self.spans_ms.get(stage, 0.0) + ms
+
+    def as_dict(self) -> Dict[str, float]:
+        data = {k: round(v, 2) for k, v in self.spans_ms.items()}
+        data["total"] = round((time.perf_counter() - self.started) * 1000, 2)
+        return data
+
+    def server_timing(self) -> str:
+        """Value for an HTTP ``Server-Timing`` header."""
+        items = self.as_dict().items()
+        return ", ".join(f"{re.sub(r'[^A-Za-z0-9_-]', '_', k)};dur={ms}" for k, ms in items)
+
+
+@dataclass
+class _StageStat:
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+_stats: Dict[str, _StageStat] = {}
+_stats_lock = threading.Lock()
+
+
+@contextmanager
+def collect() -> Iterator[Timings]:
+    """Record spans in this context; nested calls share the outermost collector."""
+    existing = _current.get()
+    if existing is not None:
+        yield existing
+        return
+    timings = Timings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time the enclosed block as ``stage``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        ms = (time.perf_counter() - start) * 1000
+        timings = _current.get()
+        if timings is not None:
+            timings.add(stage, ms)
+        with _stats_lock:
+            stat = _stats.get(stage)
+            if stat is None:
+                stat = _stats[stage] = _StageStat()
+            stat.count += 1
+            stat.total_ms += ms
+            stat.max_ms = max(stat.max_ms, ms)
+
+
+def stage_stats() -> Dict[str, Dict[str, float]]:
+    """Process-wide aggregates per stage since start (or the last :func:`reset_stats`)."""
+    with _stats_lock:
+        return {
+            name: {
+                "count": s.count,
+                "total_ms": round(s.total_ms, 2),
+                "mean_ms": round(s.total_ms / s.count, 2) if s.count else 0.0,
+                "max_ms": round(s.max_ms, 2),
+            }
+            for name, s in sorted(_stats.items())
+        }
+
+
+def reset_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+@contextmanager
+def profile_to(path: Optional[Path]) -> Iterator[None]:
+    """Run the block under cProfile and dump stats to ``path`` (no-op when ``path`` is None).
+
+    Only the calling thread is profiled; work handed to worker pools shows up as waiting time.
+    The output loads with ``python -m pstats`` or tools such as snakeviz.
+    """
+    if path is None:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(path))
+
@@ -1,34 +1,120 @@
 """High-level TTS service."""
 
 from __future__ import annotations
+from dataclasses import dataclass
 from pathlib import Path
-from voxengine.core.registry import registry
+from typing import TYPE_CHECKING, Any, Dict, Optional
+from voxengine.core.cancel import CancelToken
+from voxengine.core.errors import CancelledError, UserConfigError
+from voxengine.core.logging import log_context
 from voxengine.core.queue import JobQueue
 from voxengine.project.cast import CastManager
+import contextvars
 import threading
 
+if TYPE_CHECKING:
+    from voxengine.core.engine import Engine
+
+
+@dataclass(frozen=True)
+class VoiceSpec:
+    """Backend, model and speaker a line is rendered with."""
+
+    backend: str
+    model_path: Optional[Path] = None
+    speaker: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        """Identity used to batch lines that can share a warm model."""
+        return f"{self.backend}|{self.model_path or ''}|{self.speaker or ''}"
+
+
 class TTSService:
-    def __init__(self, tts_provider: str, queue: JobQueue) -> None:
+    def __init__(self, engine: "Engine", queue: JobQueue, tts_provider: str = "piper") -> None:
+        self.engine = engine
         self.tts_provider = tts_provider
         self.queue = queue
         self.cast = CastManager()
 
+    def resolve_voice(self, spec: Optional[str], options: Optional[dict] = None) -> VoiceSpec:
+        """Parse a voice-map entry of the form ``[backend:]model[#speaker]``.
+
+        ``model`` is a model name from the models directory or a path to a model file; it may
+        be empty for backends that need none. The backend defaults to ``options["backend"]``.
+        """
+        options = options or {}
+        backend = options.get("backend", self.tts_provider)
+        model: Optional[str] = options.get("model_path")
+        speaker: Optional[str] = options.get("voice")
+        if spec:
+            head, sep, tail = spec.partition(":")
+            if sep and head in self.engine.registry.tts:
+                backend, spec = head, tail
+            model_part, sep, speaker_part = spec.partition("#")
+            model = model_part or model
+            if sep:
+                speaker = speaker_part or None
+        return VoiceSpec(backend=backend, model_path=self._resolve_model(model), speaker=speaker)
+
+    def speak_line(
+        self,
+        text: str,
+        out_path: Path,
+        voice: VoiceSpec,
+        profile: Optional[str] = None,
+        out_format: str = "wav",
+        cancel: Optional[CancelToken] = None,
+    ) -> Dict[str, Any]:
+        return self.engine.tts_speak(
+            text=text,
+            backend=voice.backend,
+            out_path=out_path,
+            model_path=voice.model_path,
+            voice=voice.speaker,
+            profile=profile,
+            out_format=out_format,
+            cancel=cancel,
+        )
+
     def speak_async(self, project_path: str, voice_id: str, text: str, style: dict, output_format: str = "wav") -> str:
-        job = self.queue.create()
-        adapter = registry.tts_adapters[self.tts_provider]
-        voice_ref = self.cast.load_voice_ref(project_path, voice_id)
+        job = self.queue.create(project=project_path, timeout_s=style.get("timeout_s"))
+        self.cast.load_voice_ref(project_path, voice_id)
 
         out_dir = Path(project_path) / "renders" / "adhoc"
         out_dir.mkdir(parents=True, exist_ok=True)
         out_path = out_dir / f"{job.id}.{output_format}"
+        voice = self.resolve_voice(style.get("voice"), style)
 
         def run():
             try:
                 self.queue.set_running(job.id, "synthesizing")
-                adapter.speak(text=text, voice_ref=voice_ref, style=style, output_path=str(out_path))
-                self.queue.set_done(job.id, {"audio_path": str(out_path)})
+                result = self.speak_line(
+                    text,
+                    out_path,
+                    voice,
+                    profile=style.get("profile"),
+                    out_format=output_format,
+                    cancel=job.cancel,
+                )
+                self.queue.set_done(job.id, {"audio_path": result["audio_path"]})
+            except CancelledError as e:
+                self.queue.finish_interrupted(job.id, e)
             except Exception as e:
                 self.queue.set_error(job.id, str(e))
 
-        threading.Thread(target=run, daemon=True).start()
+        with log_context(job_id=job.id):
+            ctx = contextvars.copy_context()
+        threading.Thread(target=ctx.run, args=(run,), daemon=True).start()
         return job.id
+
+    def _resolve_model(self, model: Optional[str]) -> Optional[Path]:
+        if not model:
+            return None
+        for known in self.engine.discover_models():
+            if known["name"] == model:
+                return Path(known["path"])
+        path = Path(model).expanduser()
+        if path.exists():
+            return path
+        raise UserConfigError(f"Unknown model '{model}'. Add it with 'voxengine models add'.")
@@ -0,0 +1,79 @@
+"""Priority-ordered background worker pool."""
+
+from __future__ import annotations
+
+import contextvars
+import itertools
+import queue
+import threading
+from typing import Any, Callable, List, Optional
+
+from voxengine.core.logging import get_logger
+
+log = get_logger("voxengine.workers")
+
+# Lower numbers run first.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+PRIORITY_BACKGROUND = 20
+
+
+class WorkerPool:
+    """Run submitted callables on a small set of daemon threads, lowest priority value first.
+
+    Threads are started lazily so an engine that never queues background work never spawns any.
+    Each task runs in a copy of the submitter's context, so request IDs bound for logging
+    follow it.
+    """
+
+    def __init__(self, max_workers: int = 2, name: str = "voxengine-worker") -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.name = name
+        self._tasks: "queue.PriorityQueue[tuple]" = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def submit(
+        self, fn: Callable[..., Any], *args: Any, priority: int = PRIORITY_BATCH, **kwargs: Any
+    ) -> None:
+        """Queue ``fn(*args, **kwargs)``; equal priorities run in submission order."""
+        ctx = contextvars.copy_context()
+        self._tasks.put((priority, next(self._seq), ctx, fn, args, kwargs))
+        self._ensure_threads()
+
+    def pending(self) -> int:
+        """Number of tasks waiting for a worker."""
+        return self._tasks.qsize()
+
+    def shutdown(self, wait: bool = True, timeout: Optional[float] = None) -> None:
+        with self._lock:
+            threads = list(self._threads)
+            self._threads.clear()
+        for _ in threads:
+            # Sentinels sort after every real task so queued work drains first.
+            self._tasks.put((float("inf"), next(self._seq), None, None, (), {}))
+        if wait:
+            for t in threads:
+                t.join(timeout)
+
+    def _ensure_threads(self) -> None:
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            if len(self._threads) >= self.max_workers:
+                return
+            t = threading.Thread(
+                target=self._run, name=f"{self.name}-{len(self._threads)}", daemon=True
+            )
+            self._threads.append(t)
+            t.start()
+
+    def _run(self) -> None:
+        while True:
+            _, _, ctx, fn, args, kwargs = self._tasks.get()
+            if fn is None:
+                return
+            try:
+                ctx.run(fn, *args, **kwargs)
+            except Exception:  # noqa: BLE001
+                log.exception("Background task failed")
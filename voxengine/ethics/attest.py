@@ -1,15 +1,41 @@
-"""Attestation helpers (placeholder)."""
+"""Local attestation file: a JSON document with an ``attested`` flag."""
+
+from __future__ import annotations
 
-from pathlib import Path
 import json
+import threading
+from pathlib import Path
+from typing import Dict
+
+from voxengine.core.cache import write_text_atomic
+from voxengine.ethics.watch import WatchedJson
+
+_files: Dict[Path, WatchedJson] = {}
+_lock = threading.Lock()
+
+
+def _watched(attestation_path: str | Path) -> WatchedJson:
+    path = Path(attestation_path).absolute()
+    with _lock:
+        watched = _files.get(path)
+        if watched is None:
+            watched = _files[path] = WatchedJson(path)
+        return watched
+
 
 def set_attested(attestation_path: str | Path, value: bool = True) -> None:
     p = Path(attestation_path)
-    doc = json.loads(p.read_text(encoding="utf-8"))
+    doc = json.loads(p.read_text(encoding="utf-8")) if p.exists() else {}
     doc["attested"] = bool(value)
-    p.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+    write_text_atomic(p, json.dumps(doc, indent=2))
+
 
 def is_attested(attestation_path: str | Path) -> bool:
-    p = Path(attestation_path)
-    doc = json.loads(p.read_text(encoding="utf-8"))
-    return bool(doc.get("attested", False))
+    """Whether the file says ``"attested": true``; parsed again only after it changes.
+
+    An unreadable file counts as not attested.
+    """
+    watched = _watched(attestation_path)
+    watched.refresh()
+    doc = watched.value
+    return watched.error is None and isinstance(doc, dict) and bool(doc.get("attested", False))
@@ -0,0 +1,78 @@
+"""Multi-phrase matching for blocked-phrase rules.
+
+:class:`PhraseMatcher` compiles a phrase list into an Aho-Corasick automaton once. A lookup is
+then a single pass over the text however many phrases there are. Matching ignores case and
+runs of whitespace, and by default only whole words match: ``"kill"`` does not match
+``"skill"``.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton over normalized phrases."""
+
+    def __init__(self, phrases: Iterable[str], whole_words: bool = True) -> None:
+        self.phrases = sorted({p for p in map(normalize, phrases) if p})
+        self.whole_words = whole_words
+        self._goto: List[Dict[str, int]] = [{}]
+        # Per state: (length, phrase) for every phrase ending there, including via fail links.
+        self._out: List[Tuple[Tuple[int, str], ...]] = [()]
+        for phrase in self.phrases:
+            state = 0
+            for ch in phrase:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = self._goto[state][ch] = len(self._goto)
+                    self._goto.append({})
+                    self._out.append(())
+                state = nxt
+            self._out[state] += ((len(phrase), phrase),)
+        self._fail = [0] * len(self._goto)
+        todo = deque(self._goto[0].values())
+        while todo:
+            state = todo.popleft()
+            for ch, nxt in self._goto[state].items():
+                todo.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    @property
+    def states(self) -> int:
+        return len(self._goto)
+
+    def find(self, text: str) -> Optional[str]:
+        """The first phrase found in ``text``, or ``None``."""
+        if not self.phrases:
+            return None
+        text = normalize(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for end, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, phrase in out[state]:
+                if not self.whole_words or _is_word(text, end + 1 - length, end + 1):
+                    return phrase
+        return None
+
+
+def _is_word(text: str, start: int, end: int) -> bool:
+    return (start == 0 or not text[start - 1].isalnum()) and (
+        end == len(text) or not text[end].isalnum()
+    )
@@ -1,8 +1,44 @@
-"""Minimal ethics policy for engine checks."""
+"""Ethics policy for engine checks.
+
+Without a policy file every request is allowed. A policy file (``VOXENGINE_POLICY``) is JSON::
+
+    {
+      "blocked_phrases": ["..."],
+      "clone_backends": ["cosyvoice"],
+      "attestation_file": "attestation.json",
+      "consent_projects": ["/studio/MyProject"]
+    }
+
+``check_tts`` runs on every synthesis, so the rules are compiled once. Blocked phrases become a
+single :class:`~voxengine.ethics.matcher.PhraseMatcher`. Voices on a clone backend need the
+local attestation file to be attested and a consent record in one of the consent projects (or
+an :class:`Attestation` with consent or for the speaker's own voice). Relative paths are
+resolved against the policy file.
+
+The policy, attestation and consent files are checked for changes at most every ``recheck_s``
+seconds and re-read only when they changed. Per-voice decisions and per-text phrase results are
+memoized until then. A file that turns unreadable only affects the rules that depend on it: an
+invalid policy file keeps the previous rules, an invalid consent record keeps the voices it last
+granted, and an unreadable attestation file denies the clone backends and nothing else.
+"""
 
 from __future__ import annotations
+
+import threading
+import time
 from dataclasses import dataclass
-from typing import Optional
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+from voxengine.core.errors import UserConfigError
+from voxengine.core.logging import get_logger
+from voxengine.ethics.matcher import PhraseMatcher
+from voxengine.ethics.watch import ConsentIndex, WatchedJson
+
+log = get_logger("voxengine.ethics")
+
+DEFAULT_RECHECK_S = 1.0
+TEXT_MEMO_SIZE = 4096
 
 
 @dataclass(frozen=True)
@@ -19,16 +55,145 @@ class PolicyDecision:
     reason: str = ""
 
 
+ALLOWED = PolicyDecision(True, "ok")
+_VoiceKey = Tuple[str, Optional[str], Optional[Attestation]]
+
+
+@dataclass(frozen=True)
+class PolicyRules:
+    blocked_phrases: Tuple[str, ...] = ()
+    clone_backends: FrozenSet[str] = frozenset()
+    attestation_file: Optional[Path] = None
+    consent_projects: Tuple[Path, ...] = ()
+
+    @staticmethod
+    def from_dict(doc: Dict[str, Any], base: Path = Path(".")) -> "PolicyRules":
+        if not isinstance(doc, dict):
+            raise UserConfigError("A policy file must contain a JSON object.")
+        attestation = doc.get("attestation_file")
+        return PolicyRules(
+            blocked_phrases=tuple(str(p) for p in doc.get("blocked_phrases", [])),
+            clone_backends=frozenset(doc.get("clone_backends", [])),
+            attestation_file=base / attestation if attestation else None,
+            consent_projects=tuple(base / p for p in doc.get("consent_projects", [])),
+        )
+
+
 class EthicsPolicy:
-    """Simple policy gate (placeholder for richer rules)."""
+    """Compiled policy gate with change-checked file state and memoized decisions."""
+
+    def __init__(
+        self,
+        rules: Optional[PolicyRules] = None,
+        path: Optional[Path] = None,
+        recheck_s: float = DEFAULT_RECHECK_S,
+    ) -> None:
+        self.path = Path(path) if path is not None else None
+        self.recheck_s = recheck_s
+        self._policy_file = WatchedJson(self.path) if self.path is not None else None
+        self._lock = threading.Lock()
+        self._next_check = 0.0
+        self._decisions: Dict[_VoiceKey, PolicyDecision] = {}
+        self._texts: Dict[str, Optional[str]] = {}  # text -> blocked phrase found in it
+        self._compile(rules or PolicyRules())
+        if self._policy_file is not None:
+            self._refresh(force=True)
+            if self._policy_file.value is None:
+                raise UserConfigError(f"Policy file not found: {self.path}")
 
     @staticmethod
     def default() -> "EthicsPolicy":
         return EthicsPolicy()
 
+    @staticmethod
+    def load(path: str | Path, recheck_s: float = DEFAULT_RECHECK_S) -> "EthicsPolicy":
+        return EthicsPolicy(path=Path(path), recheck_s=recheck_s)
+
+    def about(self) -> Dict[str, Any]:
+        rules = self.rules
+        return {
+            "policy_file": str(self.path) if self.path else None,
+            "blocked_phrases": len(self._matcher),
+            "clone_backends": sorted(rules.clone_backends),
+            "attestation_file": str(rules.attestation_file) if rules.attestation_file else None,
+            "consent_projects": [str(p) for p in rules.consent_projects],
+            "consented_voices": len(self._consent.voices),
+        }
+
     def check_tts(
         self, text: str, backend: str, voice: Optional[str], attestation: Optional[Attestation]
     ) -> PolicyDecision:
-        # v0.1: standard TTS is allowed. Voice cloning will be a separate path with attestations
-        # required.
-        return PolicyDecision(True, "ok")
+        if time.monotonic() >= self._next_check:
+            self._refresh()
+        key = (backend, voice, attestation)
+        decision = self._decisions.get(key)
+        if decision is None:
+            decision = self._decisions[key] = self._decide_voice(backend, voice, attestation)
+        if not decision.allowed:
+            return decision
+        try:
+            phrase = self._texts[text]
+        except KeyError:
+            phrase = self._matcher.find(text)
+            if len(self._texts) >= TEXT_MEMO_SIZE:
+                self._texts.clear()
+            self._texts[text] = phrase
+        if phrase is not None:
+            return PolicyDecision(False, f"text contains the blocked phrase '{phrase}'")
+        return ALLOWED
+
+    def _decide_voice(
+        self, backend: str, voice: Optional[str], attestation: Optional[Attestation]
+    ) -> PolicyDecision:
+        rules = self.rules
+        if backend not in rules.clone_backends:
+            return ALLOWED
+        if self._attestation is not None:
+            if self._attestation.error is not None:
+                return PolicyDecision(
+                    False, f"voice cloning is disabled: {self._attestation.error}"
+                )
+            attested = self._attestation.value
+            if not (isinstance(attested, dict) and attested.get("attested", False)):
+                return PolicyDecision(
+                    False, f"voice cloning requires an attestation in {rules.attestation_file}"
+                )
+        if attestation is not None and (attestation.has_consent or attestation.is_self_voice):
+            return ALLOWED
+        if voice is not None and voice in self._consent.voices:
+            return ALLOWED
+        return PolicyDecision(False, f"no consent on record for voice '{voice}' on '{backend}'")
+
+    def _compile(self, rules: PolicyRules) -> None:
+        self.rules = rules
+        self._matcher = PhraseMatcher(rules.blocked_phrases)
+        self._attestation = WatchedJson(rules.attestation_file) if rules.attestation_file else None
+        self._consent = ConsentIndex(rules.consent_projects)
+        self._decisions = {}
+        self._texts = {}
+
+    def _refresh(self, force: bool = False) -> None:
+        with self._lock:
+            if not force and time.monotonic() < self._next_check:
+                return  # another thread just did it
+            try:
+                self._refresh_files(force)
+            finally:
+                # Even when a file is bad, look again only after the interval, not per request.
+                self._next_check = time.monotonic() + self.recheck_s
+
+    def _refresh_files(self, force: bool) -> None:
+        policy = self._policy_file
+        if policy is not None and policy.refresh():
+            try:
+                if policy.error is not None:
+                    raise UserConfigError(policy.error)
+                if policy.value is not None:
+                    self._compile(PolicyRules.from_dict(policy.value, policy.path.parent))
+            except UserConfigError:
+                if force:
+                    raise
+                log.warning("Keeping the previous policy; %s is invalid", self.path)
+        changed = self._attestation is not None and self._attestation.refresh()
+        if self._consent.refresh() or changed:
+            self._decisions = {}  # voice decisions depend on both; phrase results do not
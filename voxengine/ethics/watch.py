@@ -0,0 +1,120 @@
+"""JSON files that are parsed once and re-read only when they change on disk.
+
+A file that cannot be read or parsed, for example because it is caught halfway through a
+write, does not raise: its last good content is kept and the problem is reported through
+``error``, so one bad file never takes down the checks that do not depend on it.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from voxengine.core.errors import UserConfigError
+from voxengine.core.logging import get_logger
+
+log = get_logger("voxengine.ethics")
+
+_Signature = Optional[Tuple[int, int, int]]
+
+
+def _signature(path: Path) -> _Signature:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _read_json(path: Path) -> Any:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as exc:
+        raise UserConfigError(f"Invalid JSON in {path}: {exc}") from exc
+
+
+class WatchedJson:
+    """A JSON document cached against its file's mtime, size and inode.
+
+    :meth:`refresh` costs one ``stat`` when nothing changed; :attr:`value` is ``None`` while the
+    file does not exist. While the current file is unreadable, :attr:`error` says why and
+    :attr:`value` keeps the last document that could be read.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.value: Any = None
+        self.error: Optional[str] = None
+        self.version = 0
+        self._sig: _Signature = None
+
+    def refresh(self) -> bool:
+        """Re-read the file if it changed; returns whether it did."""
+        sig = _signature(self.path)
+        if sig == self._sig:
+            return False
+        self._sig = sig
+        self.version += 1
+        if sig is None:
+            self.value, self.error = None, None
+            return True
+        try:
+            self.value, self.error = _read_json(self.path), None
+        except (OSError, UnicodeDecodeError, UserConfigError) as exc:
+            self.error = str(exc)
+            log.warning("Cannot read %s: %s", self.path, exc)
+        return True
+
+
+class ConsentIndex:
+    """Voices with a consent record in the projects' ``cast/*/consent.json`` files.
+
+    A record counts unless its ``consent`` object says ``"revoked": true``. Both the
+    ``voice_id`` and the ``actor_name`` of a record are accepted as the voice. A record that
+    cannot be read keeps the voices it granted when it last could be; one that never could
+    grants none.
+    """
+
+    def __init__(self, projects: Iterable[str | Path]) -> None:
+        self.projects = [Path(p) for p in projects]
+        self.voices: Set[str] = set()
+        self.version = 0
+        self._sig: Tuple[Tuple[str, _Signature], ...] = ()
+        self._granted: Dict[str, Set[str]] = {}  # path -> voices from its last good read
+
+    def refresh(self) -> bool:
+        paths = sorted(p for project in self.projects for p in project.glob("cast/*/consent.json"))
+        sig = tuple((str(p), _signature(p)) for p in paths)
+        if sig == self._sig:
+            return False
+        old = dict(self._sig)
+        granted: Dict[str, Set[str]] = {}
+        for path, file_sig in sig:
+            if file_sig is None:
+                continue
+            if file_sig == old.get(path) and path in self._granted:
+                granted[path] = self._granted[path]
+                continue
+            try:
+                granted[path] = _consented(_read_json(Path(path)))
+            except FileNotFoundError:
+                continue
+            except (OSError, UnicodeDecodeError, UserConfigError) as exc:
+                log.warning("Cannot read consent record %s: %s", path, exc)
+                granted[path] = self._granted.get(path, set())
+        self._granted = granted
+        self.voices = set().union(*granted.values())
+        self._sig = sig
+        self.version += 1
+        return True
+
+
+def _consented(doc: Any) -> Set[str]:
+    """Voices a consent record grants; a record that is not a JSON object is invalid."""
+    if not isinstance(doc, dict):
+        raise UserConfigError("a consent record must be a JSON object")
+    if (doc.get("consent") or {}).get("revoked"):
+        return set()
+    return {str(doc[k]) for k in ("voice_id", "actor_name") if doc.get(k)}
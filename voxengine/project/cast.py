@@ -4,6 +4,8 @@ from __future__ import annotations
 from pathlib import Path
 import json, uuid
 
+from voxengine.core.cache import write_text_atomic
+
 class CastManager:
     def register_voice(self, project_path: str, actor_name: str, reference_wav_path: str, consent: dict) -> str:
         project = Path(project_path)
@@ -17,7 +19,8 @@ class CastManager:
             "reference_wav_path": reference_wav_path,
             "consent": consent,
         }
-        (actor_dir / "consent.json").write_text(json.dumps(consent_doc, indent=2), encoding="utf-8")
+        # Readers poll this file; never let them see it half-written.
+        write_text_atomic(actor_dir / "consent.json", json.dumps(consent_doc, indent=2))
         return voice_id
 
     def load_voice_ref(self, project_path: str, voice_id: str) -> dict:
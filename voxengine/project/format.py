@@ -1,10 +1,20 @@
 """Project format utilities."""
 
+import threading
 from pathlib import Path
+from typing import Any, Dict, List
+
+from voxengine.project.renders import RenderIndex
+from voxengine.project.store import ScriptStore
 
 REQUIRED_DIRS = ["cast", "script", "renders"]
 
 class ProjectManager:
+    def __init__(self) -> None:
+        self._stores: Dict[str, ScriptStore] = {}
+        self._render_indexes: Dict[str, RenderIndex] = {}
+        self._lock = threading.Lock()
+
     def validate(self, project_path: str) -> dict:
         p = Path(project_path)
         if not p.exists():
@@ -15,3 +25,31 @@ class ProjectManager:
         if not (p / "project.json").exists():
             raise ValueError("Missing project.json")
         return {"ok": True, "project_path": str(p)}
+
+    def script(self, project_path: str) -> ScriptStore:
+        """The project's indexed script store (opened once per project)."""
+        key = str(Path(project_path).expanduser().resolve())
+        with self._lock:
+            store = self._stores.get(key)
+            if store is None:
+                store = self._stores[key] = ScriptStore(key)
+        return store
+
+    def renders(self, project_path: str) -> RenderIndex:
+        """The project's render index (opened, and built if missing, once per project)."""
+        key = str(Path(project_path).expanduser().resolve())
+        with self._lock:
+            index = self._render_indexes.get(key)
+            if index is None:
+                index = self._render_indexes[key] = RenderIndex(key)
+        return index
+
+    def load_scenes(self, project_path: str) -> List[Dict[str, Any]]:
+        return self.script(project_path).load_scenes()
+
+    def load_scene(self, project_path: str, scene_id: str) -> Dict[str, Any]:
+        return self.script(project_path).load_scene(scene_id)
+
+    def load_line(self, project_path: str, scene_id: str, index: int) -> Dict[str, Any]:
+        """Line ``index`` (1-based) of a scene, without loading the rest of the script."""
+        return self.script(project_path).load_line(scene_id, index)
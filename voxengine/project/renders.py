@@ -0,0 +1,251 @@
+"""Project render index.
+
+Answering "how long is this project?" used to mean opening every file under ``renders/``.
+:class:`RenderIndex` keeps one row per rendered line in ``renders/index.db`` (SQLite): where the
+file is, its duration and sample rate (taken from the WAV header, or the JSON sidecar for
+encoded formats), a hash of its content and a hash of the text it was rendered from. The render
+pipeline records each line as it is written; :meth:`RenderIndex.refresh` reconciles the index
+with files added, changed or removed by other means, re-reading only those whose size or mtime
+changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from voxengine.adapters.audio.wavfile import read_wav_info
+from voxengine.core.errors import UserConfigError
+from voxengine.core.logging import get_logger
+
+log = get_logger("voxengine.render_index")
+
+INDEX_NAME = "index.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lines (
+    scene_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    format TEXT NOT NULL,
+    sample_rate INTEGER,
+    channels INTEGER,
+    duration_ms INTEGER,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    text_hash TEXT,
+    PRIMARY KEY (scene_id, idx)
+);
+CREATE INDEX IF NOT EXISTS lines_duration ON lines (duration_ms);
+"""
+
+_LINE_FILE = re.compile(r"^line_(\d+)$")
+_COLUMNS = (
+    "scene_id",
+    "idx",
+    "path",
+    "format",
+    "sample_rate",
+    "channels",
+    "duration_ms",
+    "size",
+    "mtime_ns",
+    "content_hash",
+    "text_hash",
+)
+
+
+def file_hash(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        while chunk := fh.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _sidecar(path: Path) -> Dict[str, Any]:
+    try:
+        return json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _audio_facts(
+    path: Path, sidecar: Dict[str, Any]
+) -> Tuple[Optional[int], Optional[int], Optional[float]]:
+    """``(sample_rate, channels, duration_s)`` without decoding the audio."""
+    if path.suffix.lower() == ".wav":
+        try:
+            info = read_wav_info(path)
+            return info.sample_rate, info.channels, info.duration_s
+        except UserConfigError:
+            pass
+    return sidecar.get("sample_rate"), None, sidecar.get("duration_s")
+
+
+class RenderIndex:
+    """SQLite index of a project's rendered lines."""
+
+    def __init__(self, project_path: str | Path) -> None:
+        self.renders_dir = Path(project_path) / "renders"
+        self.db_path = self.renders_dir / INDEX_NAME
+        self._lock = threading.Lock()
+        self.renders_dir.mkdir(parents=True, exist_ok=True)
+        fresh = not self.db_path.exists()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+        if fresh:
+            self.refresh()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    # -- writes -------------------------------------------------------------------------------
+
+    def record(
+        self,
+        scene_id: str,
+        index: int,
+        path: str | Path,
+        text: Optional[str] = None,
+        duration_s: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Index (or re-index) line ``index`` (1-based) of a scene after it was rendered."""
+        row = self._row_for(scene_id, index, Path(path), text, duration_s)
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO lines ({', '.join(_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in _COLUMNS)})",
+                [row[c] for c in _COLUMNS],
+            )
+        return row
+
+    def refresh(self) -> Dict[str, int]:
+        """Reconcile the index with the files under ``renders/``.
+
+        Files whose size and mtime match their row are skipped, so a refresh of an unchanged
+        project costs one ``stat`` per line.
+        """
+        counts = {"indexed": 0, "unchanged": 0, "removed": 0}
+        with self._lock, self._connect() as conn:
+            known = {
+                (r["scene_id"], r["idx"]): (r["size"], r["mtime_ns"])
+                for r in conn.execute("SELECT scene_id, idx, size, mtime_ns FROM lines")
+            }
+            seen = set()
+            rows = []
+            for path in sorted(self.renders_dir.glob("*/line_*")):
+                match = _LINE_FILE.match(path.stem)
+                if match is None or path.suffix == ".json" or path.name.startswith("."):
+                    continue
+                key = (path.parent.name, int(match.group(1)))
+                seen.add(key)
+                st = path.stat()
+                if known.get(key) == (st.st_size, st.st_mtime_ns):
+                    counts["unchanged"] += 1
+                    continue
+                text = _sidecar(path).get("text")
+                rows.append(self._row_for(key[0], key[1], path, text, None))
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO lines ({', '.join(_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' for _ in _COLUMNS)})",
+                    [[row[c] for c in _COLUMNS] for row in rows],
+                )
+                gone = [key for key in known if key not in seen]
+                conn.executemany("DELETE FROM lines WHERE scene_id = ? AND idx = ?", gone)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        counts["indexed"] = len(rows)
+        counts["removed"] = len(gone)
+        if rows or gone:
+            log.info("Render index %s: %s", self.db_path, counts)
+        return counts
+
+    # -- queries ------------------------------------------------------------------------------
+
+    def total_ms(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(SUM(duration_ms), 0) FROM lines").fetchone()[0]
+
+    def scenes(self) -> List[Dict[str, Any]]:
+        """Line count and runtime per scene."""
+        with self._connect() as conn:
+            return [
+                dict(r)
+                for r in conn.execute(
+                    "SELECT scene_id, COUNT(*) AS lines, COALESCE(SUM(duration_ms), 0) AS "
+                    "duration_ms FROM lines GROUP BY scene_id ORDER BY scene_id"
+                )
+            ]
+
+    def lines(
+        self, scene_id: Optional[str] = None, min_ms: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Indexed lines in scene order, optionally of one scene or longer than ``min_ms``."""
+        where, params = [], []
+        if scene_id is not None:
+            where.append("scene_id = ?")
+            params.append(scene_id)
+        if min_ms is not None:
+            where.append("duration_ms > ?")
+            params.append(int(min_ms))
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM lines"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        with self._connect() as conn:
+            rows = conn.execute(sql + " ORDER BY scene_id, idx", params)
+            return [self._public(dict(r)) for r in rows]
+
+    # -- helpers ------------------------------------------------------------------------------
+
+    def _row_for(
+        self,
+        scene_id: str,
+        index: int,
+        path: Path,
+        text: Optional[str],
+        duration_s: Optional[float],
+    ) -> Dict[str, Any]:
+        st = path.stat()
+        sample_rate, channels, header_s = _audio_facts(path, _sidecar(path))
+        seconds = header_s if header_s is not None else duration_s
+        return {
+            "scene_id": scene_id,
+            "idx": index,
+            "path": str(path.relative_to(self.renders_dir)),
+            "format": path.suffix.lstrip(".").lower(),
+            "sample_rate": sample_rate,
+            "channels": channels,
+            "duration_ms": round(seconds * 1000) if seconds is not None else None,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "content_hash": file_hash(path),
+            "text_hash": text_hash(text) if text is not None else None,
+        }
+
+    def _public(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        row["index"] = row.pop("idx")
+        row["path"] = str(self.renders_dir / row["path"])
+        del row["mtime_ns"]
+        return row
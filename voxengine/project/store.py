@@ -0,0 +1,276 @@
+"""Indexed script store.
+
+``script/scenes.json`` stays the import/export format, but reading it means parsing every scene
+of the project. :class:`ScriptStore` imports it once into ``script/scenes.db`` (SQLite, one row
+per scene and per line) and serves scenes and lines from there, so a render of one scene only
+reads that scene. Edits go to the database row by row; :meth:`ScriptStore.export` writes them
+back to ``scenes.json``. When ``scenes.json`` is changed on disk the store re-imports it.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from voxengine.core.logging import get_logger
+
+log = get_logger("voxengine.script_store")
+
+SCRIPT_NAME = "scenes.json"
+STORE_NAME = "scenes.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scenes (
+    scene_id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lines (
+    scene_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (scene_id, idx)
+);
+"""
+
+
+def _stamp(path: Path) -> Optional[str]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+class ScriptStore:
+    """SQLite-backed, lazily loaded view of a project's script."""
+
+    def __init__(self, project_path: str | Path) -> None:
+        self.script_dir = Path(project_path) / "script"
+        self.json_path = self.script_dir / SCRIPT_NAME
+        self.db_path = self.script_dir / STORE_NAME
+        self._lock = threading.Lock()
+        self._checked: Optional[str] = None
+        if not self.json_path.exists() and not self.db_path.exists():
+            raise ValueError(f"Missing script file: {self.json_path}")
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    # -- sync with scenes.json ---------------------------------------------------------------
+
+    def sync(self) -> bool:
+        """Re-import ``scenes.json`` if it changed since the last import or export.
+
+        Costs one ``stat`` when nothing changed. Returns ``True`` if an import happened.
+        """
+        stamp = _stamp(self.json_path)
+        if stamp is None or stamp == self._checked:
+            return False
+        with self._lock:
+            with self._connect() as conn:
+                known = self._meta(conn, "source_stamp")
+                dirty = self._meta(conn, "dirty") == "1"
+            if stamp != known:
+                if dirty:
+                    log.warning(
+                        "%s changed on disk; discarding unexported script edits", self.json_path
+                    )
+                self.import_json()
+                return True
+            self._checked = stamp
+        return False
+
+    def import_json(self, path: Optional[Path] = None) -> int:
+        """Replace the store's contents with a ``scenes.json`` document; returns the scene count."""
+        src = Path(path) if path is not None else self.json_path
+        stamp = _stamp(src)
+        doc = json.loads(src.read_text(encoding="utf-8"))
+        scenes = list(doc.get("scenes", []))
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM scenes")
+            conn.execute("DELETE FROM lines")
+            for pos, scene in enumerate(scenes):
+                self._insert_scene(conn, pos, scene)
+            if src == self.json_path:
+                self._set_meta(conn, "source_stamp", stamp or "")
+                self._set_meta(conn, "dirty", "0")
+            else:
+                self._set_meta(conn, "dirty", "1")
+        self._checked = stamp if src == self.json_path else None
+        return len(scenes)
+
+    def export(self, path: Optional[Path] = None) -> Path:
+        """Write the store back to ``scenes.json`` (atomically), one scene at a time."""
+        dest = Path(path) if path is not None else self.json_path
+        tmp = dest.with_name(f".{dest.name}.part")
+        with self._lock:
+            with self._connect() as conn, open(tmp, "w", encoding="utf-8") as fh:
+                fh.write('{\n  "scenes": [')
+                rows = conn.execute("SELECT scene_id FROM scenes ORDER BY position").fetchall()
+                for n, (scene_id,) in enumerate(rows):
+                    scene = self._read_scene(conn, scene_id)
+                    fh.write(("," if n else "") + "\n    " + json.dumps(scene, ensure_ascii=False))
+                fh.write("\n  ]\n}\n")
+            os.replace(tmp, dest)
+            if dest == self.json_path:
+                stamp = _stamp(dest)
+                with self._transaction() as conn:
+                    self._set_meta(conn, "source_stamp", stamp or "")
+                    self._set_meta(conn, "dirty", "0")
+                self._checked = stamp
+        return dest
+
+    # -- reads --------------------------------------------------------------------------------
+
+    def scene_ids(self) -> List[str]:
+        self.sync()
+        with self._connect() as conn:
+            return [r[0] for r in conn.execute("SELECT scene_id FROM scenes ORDER BY position")]
+
+    def load_scenes(self) -> List[Dict[str, Any]]:
+        self.sync()
+        with self._connect() as conn:
+            ids = [r[0] for r in conn.execute("SELECT scene_id FROM scenes ORDER BY position")]
+            return [self._read_scene(conn, scene_id) for scene_id in ids]
+
+    def load_scene(self, scene_id: str) -> Dict[str, Any]:
+        self.sync()
+        with self._connect() as conn:
+            return self._read_scene(conn, scene_id)
+
+    def line_count(self, scene_id: str) -> int:
+        self.sync()
+        with self._connect() as conn:
+            self._scene_row(conn, scene_id)
+            return conn.execute(
+                "SELECT COUNT(*) FROM lines WHERE scene_id = ?", (scene_id,)
+            ).fetchone()[0]
+
+    def load_line(self, scene_id: str, index: int) -> Dict[str, Any]:
+        """Return line ``index`` (1-based) of a scene."""
+        self.sync()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT data FROM lines WHERE scene_id = ? AND idx = ?", (scene_id, index - 1)
+            ).fetchone()
+            if row is None:
+                self._scene_row(conn, scene_id)
+                raise ValueError(f"Scene {scene_id} has no line {index}.")
+        return json.loads(row[0])
+
+    # -- writes -------------------------------------------------------------------------------
+
+    def put_scene(self, scene: Dict[str, Any]) -> None:
+        """Insert or replace a whole scene, keeping its position if it already exists."""
+        self.sync()
+        scene_id = scene.get("id")
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT position FROM scenes WHERE scene_id = ?", (scene_id,)
+            ).fetchone()
+            if row is None:
+                pos = conn.execute(
+                    "SELECT COALESCE(MAX(position) + 1, 0) FROM scenes"
+                ).fetchone()[0]
+            else:
+                pos = row[0]
+                conn.execute("DELETE FROM scenes WHERE scene_id = ?", (scene_id,))
+                conn.execute("DELETE FROM lines WHERE scene_id = ?", (scene_id,))
+            self._insert_scene(conn, pos, scene)
+            self._set_meta(conn, "dirty", "1")
+
+    def update_line(self, scene_id: str, index: int, line: Dict[str, Any]) -> None:
+        """Replace line ``index`` (1-based) of a scene; only that row is rewritten."""
+        self.sync()
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "UPDATE lines SET data = ? WHERE scene_id = ? AND idx = ?",
+                (json.dumps(line, ensure_ascii=False), scene_id, index - 1),
+            )
+            if cur.rowcount != 1:
+                self._scene_row(conn, scene_id)
+                raise ValueError(f"Scene {scene_id} has no line {index}.")
+            self._set_meta(conn, "dirty", "1")
+
+    def delete_scene(self, scene_id: str) -> None:
+        self.sync()
+        with self._transaction() as conn:
+            self._scene_row(conn, scene_id)
+            conn.execute("DELETE FROM scenes WHERE scene_id = ?", (scene_id,))
+            conn.execute("DELETE FROM lines WHERE scene_id = ?", (scene_id,))
+            self._set_meta(conn, "dirty", "1")
+
+    # -- helpers ------------------------------------------------------------------------------
+
+    @staticmethod
+    def _insert_scene(conn: sqlite3.Connection, pos: int, scene: Dict[str, Any]) -> None:
+        if not scene.get("id"):
+            raise ValueError("Scene is missing an 'id'.")
+        header = {k: v for k, v in scene.items() if k != "lines"}
+        conn.execute(
+            "INSERT INTO scenes (scene_id, position, data) VALUES (?, ?, ?)",
+            (scene["id"], pos, json.dumps(header, ensure_ascii=False)),
+        )
+        conn.executemany(
+            "INSERT INTO lines (scene_id, idx, data) VALUES (?, ?, ?)",
+            [
+                (scene["id"], i, json.dumps(line, ensure_ascii=False))
+                for i, line in enumerate(scene.get("lines", []))
+            ],
+        )
+
+    @staticmethod
+    def _scene_row(conn: sqlite3.Connection, scene_id: str) -> Tuple[int, str]:
+        row = conn.execute(
+            "SELECT position, data FROM scenes WHERE scene_id = ?", (scene_id,)
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"Scene not found: {scene_id}")
+        return row
+
+    def _read_scene(self, conn: sqlite3.Connection, scene_id: str) -> Dict[str, Any]:
+        scene = json.loads(self._scene_row(conn, scene_id)[1])
+        scene["lines"] = [
+            json.loads(r[0])
+            for r in conn.execute(
+                "SELECT data FROM lines WHERE scene_id = ? ORDER BY idx", (scene_id,)
+            )
+        ]
+        return scene
+
+    @staticmethod
+    def _meta(conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))